@@ -0,0 +1,95 @@
+"""
+Headless timing of the decode -> graph -> VLAN split -> layout -> scene
+pipeline on synthetic topologies.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_render [--sizes 100,1000,10000]
+
+Results are appended to benchmarks/results/render.jsonl together with
+the git revision and compared with the previous run.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import networkx as nx
+from networkx.readwrite import json_graph
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.results import ROOT, record
+from benchmarks.synthetic import generate_topology
+
+DEFAULT_SIZES = (100, 1000, 5000, 10000, 50000)
+
+
+def timed(stage, timings, func, *args, **kwargs):
+    # The windows print progress; keep it out of the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[stage] = time.perf_counter() - start
+    return result
+
+
+def layout_vlans(subgraphs):
+    from compact_graph import as_networkx
+    return {vlan: nx.spring_layout(as_networkx(g), seed=42) for vlan, g in subgraphs.items()}
+
+
+def bench_size(num_nodes, max_scene_nodes):
+    from compact_graph import load_graph, split_by_vlan
+    from graph_window import GraphWindow, VLANTabWindow
+
+    raw = json.dumps(generate_topology(num_nodes))
+    timings = {"payload_bytes": len(raw)}
+
+    payload = timed("json_decode", timings, json.loads, raw)
+    timed("node_link_graph", timings, json_graph.node_link_graph, payload["access_graph"])
+    access = timed("load_graph", timings, load_graph, payload["access_graph"])
+    top = load_graph(payload["top_graph"])
+    subgraphs = timed("vlan_split", timings, split_by_vlan, access)
+    timed("layout", timings, layout_vlans, subgraphs)
+
+    if num_nodes <= max_scene_nodes:
+        window = timed("graph_window_build", timings, GraphWindow, top, "Top Graph", graph_type="top")
+        window.deleteLater()
+        tabs = timed("vlan_tabs_build", timings, VLANTabWindow, subgraphs)
+        tabs.deleteLater()
+    QApplication.processEvents()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render and layout benchmark.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated access-graph node counts")
+    parser.add_argument("--max-scene-nodes", type=int, default=50000,
+                        help="skip the scene build stages above this size")
+    parser.add_argument("--no-record", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    # Widgets load their icons relative to the repository root.
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    metrics = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        timings = bench_size(size, args.max_scene_nodes)
+        metrics[f"n={size}"] = timings
+        stages = ", ".join(f"{k} {v:.3f}s" for k, v in timings.items() if k != "payload_bytes")
+        print(f"n={size:<6} {timings['payload_bytes'] / 1e6:6.2f} MB  {stages}")
+        sys.stdout.flush()
+
+    if not args.no_record:
+        record("render", metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Time from process start until the login dialog is on screen.
+
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_startup [--runs N]
+
+Each run starts a fresh interpreter that builds the dialog exactly like
+main.main() does and reports once the first events have been processed.
+The run also records whether networkx was already imported at that
+point, which should stay False.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.results import ROOT, record
+
+CHILD = """
+import sys, time
+t0 = time.perf_counter()
+import main
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+app.setStyleSheet(main.load_stylesheet("style.qss"))
+window = main.LoginWindow()
+window.show()
+app.processEvents()
+print("SHOWN", time.perf_counter() - t0, "networkx" in sys.modules, flush=True)
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    for line in proc.stdout:
+        if line.startswith("SHOWN"):
+            wall = time.perf_counter() - start
+            _, in_process, networkx_loaded = line.split()
+            proc.wait()
+            return wall, float(in_process), networkx_loaded == "True"
+    proc.wait()
+    raise RuntimeError("Child process exited before showing the login dialog.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-record", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    walls, imports, eager = [], [], False
+    for _ in range(args.runs):
+        wall, in_process, networkx_loaded = run_once()
+        walls.append(wall)
+        imports.append(in_process)
+        eager = eager or networkx_loaded
+
+    metrics = {
+        "login_dialog": {
+            "wall_min": min(walls),
+            "wall_median": statistics.median(walls),
+            "in_process_median": statistics.median(imports),
+            "networkx_preloaded": eager,
+        }
+    }
+    print(f"time-to-login-dialog: min {min(walls):.3f}s, median {statistics.median(walls):.3f}s "
+          f"(in-process {statistics.median(imports):.3f}s), networkx loaded: {eager}")
+    if not args.no_record:
+        record("startup", metrics)
+
+
+if __name__ == "__main__":
+    main()
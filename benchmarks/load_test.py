@@ -0,0 +1,123 @@
+"""
+Load harness for the dispatcher protocol.
+
+Runs many concurrent clients, each with its own WebSocketDispatcher, that
+log in and then issue requests back to back. Reports requests/sec,
+p50/p99 latency and the peak RSS of this process.
+
+Run from the repository root, against a running server:
+    python -m benchmarks.load_test --clients 50 --requests 20
+or with an in-process mock server:
+    python -m benchmarks.load_test --spawn-server --latency-ms 10 --nodes 2000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import resource
+import statistics
+import time
+
+import websockets
+
+from benchmarks.results import record
+from dispatcher import WebSocketDispatcher
+
+CREATE_REQUEST = {
+    "action": "create_graph", "topology_name": "load-test", "num_routers": 2, "num_mls": 2,
+    "num_switches": 4, "num_computers": 15, "vlan_count": -1, "mode": 1, "ip_base": "192.168.0.0",
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_client(client_id, args, latencies, errors):
+    websocket = await websockets.connect(args.url, ping_interval=None, max_size=None)
+    dispatcher = WebSocketDispatcher(websocket)
+    try:
+        login = {"action": "login", "username": f"load_{client_id}", "password": "load"}
+        await dispatcher.send_and_wait(login, timeout=args.timeout)
+        for i in range(args.requests):
+            if args.action == "mixed":
+                request = CREATE_REQUEST if i % 2 == 0 else {"action": "get_history"}
+            elif args.action == "get_history":
+                request = {"action": "get_history"}
+            else:
+                request = CREATE_REQUEST
+            start = time.perf_counter()
+            try:
+                response = await dispatcher.send_and_wait(request, timeout=args.timeout)
+            except Exception:
+                errors.append(client_id)
+                continue
+            latencies.append(time.perf_counter() - start)
+            if "error" in response:
+                errors.append(client_id)
+    finally:
+        await dispatcher.close()
+        await websocket.close()
+
+
+async def run(args):
+    server = None
+    if args.spawn_server:
+        from benchmarks.mock_server import serve
+        server = await serve("localhost", args.port, latency_ms=args.latency_ms, nodes=args.nodes)
+        args.url = f"ws://localhost:{args.port}"
+
+    latencies, errors = [], []
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    # The dispatcher logs every receiver start/stop; keep the report readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(run_client(i, args, latencies, errors) for i in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    if not latencies:
+        raise SystemExit(f"No successful requests ({len(errors)} errors).")
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "peak_rss_mb": rss_after / 1024,
+        "rss_growth_mb": (rss_after - rss_before) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispatcher load test.")
+    parser.add_argument("--url", default="ws://localhost:6789")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client after login")
+    parser.add_argument("--action", choices=("create_graph", "get_history", "mixed"), default="create_graph")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--spawn-server", action="store_true", help="start a mock server in this process")
+    parser.add_argument("--port", type=int, default=6790, help="port for --spawn-server")
+    parser.add_argument("--latency-ms", type=float, default=0, help="mock server reply delay")
+    parser.add_argument("--nodes", type=int, default=None, help="mock server create_graph size")
+    parser.add_argument("--no-record", action="store_true", help="do not store the results")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args))
+    print(f"{stats['requests']} requests ({stats['errors']} errors) in {stats['elapsed']:.2f}s: "
+          f"{stats['requests_per_sec']:.1f} req/s, p50 {stats['p50'] * 1000:.1f} ms, "
+          f"p99 {stats['p99'] * 1000:.1f} ms, peak RSS {stats['peak_rss_mb']:.1f} MB")
+    if not args.no_record:
+        case = f"{args.action} c={args.clients} n={args.nodes or 'req'}"
+        record("load", {case: stats})
+
+
+if __name__ == "__main__":
+    main()
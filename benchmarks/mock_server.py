@@ -0,0 +1,152 @@
+"""
+Stand-in for the topology server, speaking the same JSON actions as the
+real backend: login, signup, create_graph and get_history, plus
+subscribe_history/unsubscribe_history for topology_added push events.
+
+Run from the repository root:
+    python -m benchmarks.mock_server [--port 6789] [--latency-ms 20] [--nodes 5000]
+
+create_graph responses come from benchmarks.synthetic and are sized
+from the request (computers + switches) unless --nodes is given.
+Replies echo the request's "request_id" unless --no-request-ids is given.
+Users and history are kept in memory only.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+
+import websockets
+
+from benchmarks.synthetic import generate_topology
+
+
+class MockServer:
+    def __init__(self, latency_ms=0, nodes=None, history_size=0, history_nodes=200, echo_request_ids=True):
+        self.latency = latency_ms / 1000.0
+        self.nodes = nodes
+        self.echo_request_ids = echo_request_ids
+        self.users = {}
+        self.history = {}  # username -> list of topology dicts
+        self.history_subscribers = {}  # username -> set of connections
+        self._ids = itertools.count(1)
+        self._seed = [self._stored(generate_topology(history_nodes, seed=i)) for i in range(history_size)]
+        self._topology_cache = {}
+
+    def _stored(self, topology):
+        return {"id": next(self._ids), **topology}
+
+    def _topology(self, request):
+        num_nodes = self.nodes or int(request.get("num_computers", 15)) + int(request.get("num_switches", 4))
+        vlan_count = int(request.get("vlan_count", -1))
+        key = (num_nodes, request.get("num_routers", 2), request.get("num_mls", 2), vlan_count)
+        if key not in self._topology_cache:
+            self._topology_cache[key] = generate_topology(
+                num_nodes,
+                num_routers=int(request.get("num_routers", 2)),
+                num_mls=int(request.get("num_mls", 2)),
+                vlan_count=None if vlan_count == -1 else vlan_count,
+            )
+        return self._topology_cache[key]
+
+    def handle_request(self, request, session):
+        action = request.get("action")
+        if action == "signup":
+            username = request.get("username")
+            if username in self.users:
+                return {"error": "Username already exists."}
+            self.users[username] = request.get("password")
+            return {"message": "Sign up successful."}
+        if action == "login":
+            username = request.get("username")
+            if username in self.users and self.users[username] != request.get("password"):
+                return {"error": "Invalid username or password."}
+            # Unknown users are let in so load tests need no signup step.
+            session["username"] = username
+            self.history.setdefault(username, list(self._seed))
+            return {"message": "Login successful."}
+        if "username" not in session:
+            return {"error": "Not logged in."}
+        if action == "create_graph":
+            topology = self._stored(self._topology(request))
+            self.history[session["username"]].append(topology)
+            return topology
+        if action == "get_history":
+            return {"graphs": self.history[session["username"]]}
+        if action == "subscribe_history":
+            self.history_subscribers.setdefault(session["username"], set()).add(session["websocket"])
+            return {"event": "history_subscribed"}
+        if action == "unsubscribe_history":
+            self.history_subscribers.get(session["username"], set()).discard(session["websocket"])
+            return {"event": "history_unsubscribed"}
+        return {"error": f"Unknown action: {action}"}
+
+    async def push(self, username, event):
+        message = json.dumps(event)
+        for websocket in list(self.history_subscribers.get(username, ())):
+            try:
+                await websocket.send(message)
+            except websockets.ConnectionClosed:
+                self.history_subscribers[username].discard(websocket)
+
+    async def handler(self, websocket):
+        session = {"websocket": websocket}
+        try:
+            async for message in websocket:
+                try:
+                    request = json.loads(message)
+                except ValueError:
+                    await websocket.send(json.dumps({"error": "Invalid JSON."}))
+                    continue
+                response = self.handle_request(request, session)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                reply = response
+                if self.echo_request_ids and "request_id" in request and "event" not in response:
+                    reply = {**response, "request_id": request["request_id"]}
+                await websocket.send(json.dumps(reply))
+                if request.get("action") == "create_graph" and "id" in response:
+                    await self.push(session["username"], {"event": "topology_added", "topology": response})
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for connections in self.history_subscribers.values():
+                connections.discard(websocket)
+
+
+async def serve(host="localhost", port=6789, **options):
+    """Start a MockServer and return the websockets server object."""
+    server = MockServer(**options)
+    return await websockets.serve(server.handler, host, port, max_size=None)
+
+
+async def run_forever(args):
+    server = await serve(
+        args.host, args.port,
+        latency_ms=args.latency_ms, nodes=args.nodes,
+        history_size=args.history_size, history_nodes=args.history_nodes,
+        echo_request_ids=not args.no_request_ids,
+    )
+    print(f"Mock server listening on ws://{args.host}:{args.port}")
+    async with server:
+        await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock topology server.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6789)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added before every reply")
+    parser.add_argument("--nodes", type=int, default=None, help="fixed access-graph size for create_graph")
+    parser.add_argument("--history-size", type=int, default=0, help="topologies every user starts with")
+    parser.add_argument("--history-nodes", type=int, default=200, help="size of each seeded topology")
+    parser.add_argument("--no-request-ids", action="store_true", help="reply without echoing request_id")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
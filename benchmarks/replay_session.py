@@ -0,0 +1,78 @@
+"""
+Replay a session recorded with NETDESIGNER_RECORD=<file> and time the
+client-side work done on each reply, without a server or a GUI.
+
+Run from the repository root:
+    python -m benchmarks.replay_session session.jsonl.gz [--speed 0] [--profile out.prof]
+
+Every recorded request is re-sent through a WebSocketDispatcher backed by
+ReplayWebSocket. Graph payloads in the replies (create_graph responses
+and get_history entries) are then loaded and split by VLAN the same way
+on_generate_clicked and the history window do. --speed 0 skips the
+recorded server delays.
+
+To replay through the full GUI instead, run main.py with
+NETDESIGNER_REPLAY=<file> (and optionally NETDESIGNER_REPLAY_SPEED).
+"""
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import io
+import json
+import time
+
+from compact_graph import load_graph, split_by_vlan
+from dispatcher import WebSocketDispatcher
+from session_recorder import ReplayWebSocket
+
+
+def process_reply(reply):
+    topologies = reply.get("graphs", [reply]) if isinstance(reply, dict) else []
+    count = 0
+    for topology in topologies:
+        if "access_graph" in topology:
+            split_by_vlan(load_graph(topology["access_graph"]))
+            count += 1
+        if "top_graph" in topology:
+            load_graph(topology["top_graph"])
+    return count
+
+
+async def replay(path, speed):
+    websocket = ReplayWebSocket(path, speed=speed)
+    dispatcher = WebSocketDispatcher(websocket)
+    rows = []
+    for record in list(websocket.sent):
+        request = json.loads(record["frame"])
+        start = time.perf_counter()
+        reply = await dispatcher.send_and_wait(request, timeout=None)
+        received = time.perf_counter()
+        count = process_reply(reply)
+        rows.append((request.get("action"), received - start, time.perf_counter() - received, count))
+    await dispatcher.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session.")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=0, help="1 = original timing, 0 = no delays")
+    parser.add_argument("--profile", help="write cProfile stats to this file")
+    args = parser.parse_args()
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = asyncio.run(replay(args.path, args.speed or None))
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    for action, wait, work, count in rows:
+        print(f"{action:<14} reply after {wait * 1000:8.1f} ms, processing {work * 1000:8.1f} ms ({count} topologies)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import json
+import os
+import platform
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def load_runs(name):
+    path = os.path.join(RESULTS_DIR, f"{name}.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record(name, metrics):
+    """
+    Append one run of benchmark `name` to benchmarks/results/<name>.jsonl,
+    tagged with the git revision, and print how it compares to the last run.
+    `metrics` maps a case label to a dict of timings in seconds.
+    """
+    previous = load_runs(name)
+    run = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "metrics": metrics,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, f"{name}.jsonl"), "a") as f:
+        f.write(json.dumps(run) + "\n")
+    if previous:
+        compare(previous[-1], run)
+    return run
+
+
+def compare(old, new):
+    print(f"\nCompared with {old['revision']} ({old['timestamp']}):")
+    for case, timings in new["metrics"].items():
+        old_timings = old["metrics"].get(case, {})
+        for key, value in timings.items():
+            before = old_timings.get(key)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or not before:
+                continue
+            change = (value - before) / before * 100
+            print(f"  {case:>12} {key:<24} {before:10.4f} -> {value:10.4f}  ({change:+.1f}%)")
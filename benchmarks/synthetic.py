@@ -0,0 +1,96 @@
+"""
+Synthetic topologies shaped like the server's `create_graph` response.
+
+The access graph holds Switch_/Computer_ nodes tagged with a `vlan`,
+the top graph holds Switch_ (Access), MultiLayerSwitch_ (Distribution)
+and Router_ (Core) nodes tagged with a `layer`, and every device gets a
+configuration entry with an address inside its VLAN's subnet.
+"""
+import ipaddress
+import math
+import random
+
+import networkx as nx
+from networkx.readwrite import json_graph
+
+COMPUTERS_PER_SWITCH = 7
+
+
+def generate_topology(num_nodes, num_routers=2, num_mls=2, vlan_count=None, ip_base="10.0.0.0", seed=0):
+    """
+    Build a create_graph-style response with roughly `num_nodes` access
+    devices (computers plus the switches needed to hold them).
+    """
+    rng = random.Random(seed)
+    num_switches = max(1, math.ceil(num_nodes / (COMPUTERS_PER_SWITCH + 1)))
+    num_computers = max(1, num_nodes - num_switches)
+    if vlan_count is None:
+        vlan_count = max(1, min(num_switches, num_switches // 4, 250))
+    base = int(ipaddress.IPv4Address(ip_base))
+
+    access = nx.Graph()
+    switches = [f"Switch_{i + 1}" for i in range(num_switches)]
+    switch_vlan = {}
+    for i, switch in enumerate(switches):
+        vlan = i % vlan_count + 1
+        switch_vlan[switch] = vlan
+        access.add_node(switch, vlan=vlan)
+    # Chain the switches of each VLAN together.
+    by_vlan = {}
+    for switch in switches:
+        by_vlan.setdefault(switch_vlan[switch], []).append(switch)
+    for members in by_vlan.values():
+        for u, v in zip(members, members[1:]):
+            access.add_edge(u, v)
+
+    computers = []
+    for i in range(num_computers):
+        computer = f"Computer_{i + 1}"
+        switch = switches[min(i // COMPUTERS_PER_SWITCH, num_switches - 1)]
+        access.add_node(computer, vlan=switch_vlan[switch])
+        access.add_edge(computer, switch)
+        computers.append(computer)
+
+    top = nx.Graph()
+    routers = [f"Router_{i + 1}" for i in range(num_routers)]
+    mls = [f"MultiLayerSwitch_{i + 1}" for i in range(num_mls)]
+    top.add_nodes_from(routers, layer="Core")
+    top.add_nodes_from(mls, layer="Distribution")
+    top.add_nodes_from(switches, layer="Access")
+    for r in routers:
+        for m in mls:
+            top.add_edge(r, m)
+    for switch in switches:
+        top.add_edge(switch, rng.choice(mls))
+
+    # One /16 per VLAN under ip_base: <base>.<vlan>.x.y
+    access_configuration = []
+    host_counter = {}
+    for name in switches + computers:
+        vlan = access.nodes[name]["vlan"]
+        host_counter[vlan] = host_counter.get(vlan, 1) + 1
+        network = base + (vlan << 16)
+        access_configuration.append({
+            "name": name,
+            "ip_address": str(ipaddress.IPv4Address(network + host_counter[vlan])),
+            "subnet_mask": "255.255.0.0",
+            "default_gateway": str(ipaddress.IPv4Address(network + 1)),
+            "vlan": vlan,
+        })
+    top_layer_configurations = []
+    # Routers and multilayer switches share the last /16 of the base block.
+    transit = base + (255 << 16)
+    for i, name in enumerate(routers + mls):
+        top_layer_configurations.append({
+            "name": name,
+            "ip_address": str(ipaddress.IPv4Address(transit + i + 1)),
+            "subnet_mask": "255.255.0.0",
+            "connections_count": top.degree(name),
+        })
+
+    return {
+        "access_graph": json_graph.node_link_data(access),
+        "top_graph": json_graph.node_link_data(top),
+        "access_configuration": access_configuration,
+        "top_layer_configurations": top_layer_configurations,
+    }
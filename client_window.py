@@ -1,7 +1,4 @@
-import ipaddress
 import json
-import networkx as nx
-from networkx.readwrite import json_graph
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
@@ -11,20 +8,24 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont
 from qasync import asyncSlot
 
-from graph_window import GraphWindow, VLANTabWindow
 from network_client import send_configuration
-from home_window import HomeWindow
-from config_window import ConfigWindow
+from topology_params import COUNT_FIELDS, DEFAULTS, validate_parameters
 
 
 class ClientWindow(QWidget):
-    def __init__(self, dispatcher, parent=None):
+    def __init__(self, dispatcher, navigator, parent=None):
         super().__init__(parent)
         self.dispatcher = dispatcher
+        self.navigator = navigator
+        self.vlan_tabs_window = None
+        self.graph_window = None
+        self.config_window = None
+        self.sweep_window = None
         self.access_graph = None
         self.top_graph = None
         self.access_configuration = []
         self.top_layer_configurations = []
+        self.ip_base = None
         self.initUI()
 
     def initUI(self):
@@ -89,6 +90,10 @@ class ClientWindow(QWidget):
         self.generateButton.setFont(QFont("Segoe UI", 15, QFont.Bold))
         self.generateButton.setMinimumHeight(50)
         btn_layout.addWidget(self.generateButton)
+        self.sweepButton = QPushButton("Parameter Sweep")
+        self.sweepButton.setFont(QFont("Segoe UI", 15))
+        self.sweepButton.setMinimumHeight(50)
+        btn_layout.addWidget(self.sweepButton)
         btn_layout.addStretch()
         main_layout.addLayout(btn_layout)
 
@@ -131,78 +136,55 @@ class ClientWindow(QWidget):
         # — Finalize
         self.setLayout(main_layout)
         self.generateButton.clicked.connect(self.on_generate_clicked)
+        self.sweepButton.clicked.connect(self.on_sweep_clicked)
         self.viewGraphButton.clicked.connect(self.on_view_graph_clicked)
         self.showConfigButton.clicked.connect(self.on_show_config_clicked)
         self.showMaximized()
 
     def on_return_home_clicked(self):
-        self.home_window = HomeWindow(self.dispatcher)
-        self.home_window.show()
-        self.close()
+        self.navigator.open("home")
+
+    def open_windows(self):
+        # Graph, config and sweep windows this window keeps alive; they count against the navigator's pool.
+        return sum(w is not None for w in (self.vlan_tabs_window, self.graph_window, self.config_window, self.sweep_window))
+
+    def teardown(self):
+        # Called by the navigator before this window is freed.
+        for window in (self.vlan_tabs_window, self.graph_window, self.config_window, self.sweep_window):
+            if window is not None:
+                window.close()
+                window.deleteLater()
+        self.vlan_tabs_window = self.graph_window = self.config_window = self.sweep_window = None
 
     def validate_inputs(self):
         try:
-            name = self.input_fields[0].text().strip() or "Untitled Topology"
+            params = {"topology_name": self.input_fields[0].text().strip() or DEFAULTS["topology_name"]}
 
-            # numeric fields: routers, multilayer switches, switches, computers
-            defaults = [2, 2, 4, 15]
-            nums = []
-            for i, default in enumerate(defaults, start=1):
+            # numeric fields: routers, multilayer switches, switches, computers, VLAN count, mode
+            for i, field in enumerate(COUNT_FIELDS + ("vlan_count", "mode"), start=1):
                 txt = self.input_fields[i].text().strip()
-                val = int(txt) if txt else default
-                if val < 1:
-                    return False, "Device counts must be ≥ 1."
-                nums.append(val)
-
-            num_routers, num_mls, num_switches, num_computers = nums
-
-            # --- New check: switches vs computers ---
-            # need at least 1 switch per 7 computers
-            if num_computers > num_switches * 7:
-                return False, (
-                    f"With {num_computers} computers, you need at least "
-                    f"{(num_computers + 6)//7} switches (1 per 7 computers)."
-                )
-
-            # VLAN count
-            vlan_txt = self.input_fields[5].text().strip()
-            vlan_count = int(vlan_txt) if vlan_txt else -1
-            if vlan_count == 0 or vlan_count < -1:
-                return False, "VLAN Count must be > 0 or -1."
-
-            # --- New check: switches vs VLANs ---
-            # if VLAN count is not auto (-1), max VLANs == num_switches
-            if vlan_count != -1 and vlan_count > num_switches:
-                return False, (
-                    f"With {num_switches} switches, maximum VLANs is {num_switches}."
-                )
-
-            # mode
-            mode_txt = self.input_fields[6].text().strip()
-            mode = int(mode_txt) if mode_txt else 1
-            if mode not in (0, 1):
-                return False, "Mode must be 0 or 1."
-
-            # IP Base
-            ipb = self.input_fields[7].text().strip() or "192.168.0.0"
-            try:
-                ipaddress.IPv4Address(ipb)
-            except ValueError:
-                return False, "Invalid IP Base format."
-
-            return True, {
-                "topology_name": name,
-                "num_routers": num_routers,
-                "num_mls": num_mls,
-                "num_switches": num_switches,
-                "num_computers": num_computers,
-                "vlan_count": vlan_count,
-                "mode": mode,
-                "ip_base": ipb
-            }
+                params[field] = int(txt) if txt else DEFAULTS[field]
+
+            params["ip_base"] = self.input_fields[7].text().strip() or DEFAULTS["ip_base"]
         except ValueError:
             return False, "Please enter valid integers for counts, mode, and VLAN."
-
+        # The same rules are applied to every combination of a parameter sweep.
+        return validate_parameters(params)
+
+    def on_sweep_clicked(self):
+        from sweep_window import SweepWindow
+
+        # Name and IP base come from the form; the counts are swept.
+        base = {
+            "topology_name": self.input_fields[0].text().strip() or DEFAULTS["topology_name"],
+            "ip_base": self.input_fields[7].text().strip() or DEFAULTS["ip_base"],
+        }
+        if self.sweep_window is None:
+            self.sweep_window = SweepWindow(self.dispatcher, base)
+        else:
+            self.sweep_window.base = base
+        self.sweep_window.show()
+        self.sweep_window.raise_()
 
     @asyncSlot()
     async def on_generate_clicked(self):
@@ -210,6 +192,8 @@ class ClientWindow(QWidget):
         if not valid:
             return self.outputText.append(f"Error: {result}")
 
+        from compact_graph import load_graph
+
         request_data = {**result, "action": "create_graph"}
         self.outputText.append("Sending configuration to server...")
         try:
@@ -217,10 +201,11 @@ class ClientWindow(QWidget):
             if "error" in response:
                 return self.outputText.append("Error from server: " + response["error"])
 
-            self.access_graph = json_graph.node_link_graph(response['access_graph'])
-            self.top_graph = json_graph.node_link_graph(response['top_graph'])
+            self.access_graph = load_graph(response['access_graph'])
+            self.top_graph = load_graph(response['top_graph'])
             self.access_configuration = response.get('access_configuration', [])
             self.top_layer_configurations = response.get('top_layer_configurations', [])
+            self.ip_base = request_data["ip_base"]
 
             # Summary
             self.outputText.append(
@@ -247,15 +232,14 @@ class ClientWindow(QWidget):
     def on_view_graph_clicked(self):
         if not self.access_graph or not self.top_graph:
             return self.outputText.append("No graph data available.")
+        from graph_window import GraphWindow, VLANTabWindow
+        from compact_graph import split_by_vlan
+
         if self.graphSelector.currentText() == "Access Graph":
-            vlan_to_nodes = {}
-            for node, data in self.access_graph.nodes(data=True):
-                vlan_to_nodes.setdefault(data.get('vlan', 'Default'), []).append(node)
-            if not vlan_to_nodes:
+            subgraphs = split_by_vlan(self.access_graph)
+            if not subgraphs:
                 return self.outputText.append("No VLAN data in Access Graph.")
-            subgraphs = {v: self.access_graph.subgraph(nodes).copy()
-                         for v, nodes in vlan_to_nodes.items()}
-            self.vlan_tabs_window = VLANTabWindow(subgraphs)
+            self.vlan_tabs_window = VLANTabWindow(subgraphs, access_graph=self.access_graph)
             self.vlan_tabs_window.show()
         else:
             self.graph_window = GraphWindow(self.top_graph, "Top Graph", graph_type="top")
@@ -264,8 +248,11 @@ class ClientWindow(QWidget):
     def on_show_config_clicked(self):
         if not self.access_configuration or not self.top_layer_configurations:
             return self.outputText.append("No configuration data. Generate first.")
+        from config_window import ConfigWindow
+
         self.config_window = ConfigWindow(
             self.access_configuration,
-            self.top_layer_configurations
+            self.top_layer_configurations,
+            ip_base=self.ip_base
         )
         self.config_window.show()
@@ -0,0 +1,258 @@
+import weakref
+
+import networkx as nx
+from networkx.readwrite import json_graph
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; large graphs fall back to networkx
+    np = None
+
+
+# Payloads with at least this many nodes are loaded into a CompactGraph.
+COMPACT_NODE_THRESHOLD = 5000
+
+
+class _NoVlan:
+    """split_by_vlan() key of the nodes without a VLAN; shown as "Default" but never equal to a VLAN named so."""
+
+    def __repr__(self):
+        return "Default"
+
+    def __reduce__(self):
+        return "NO_VLAN"
+
+
+NO_VLAN = _NoVlan()
+
+
+def _intern(values):
+    """Map a sequence of hashable values (None = missing) to int codes."""
+    table = {}
+    lookup = []
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = -1
+            continue
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(lookup)
+            lookup.append(value)
+        codes[i] = code
+    return codes, lookup
+
+
+def _build_csr(num_nodes, src, dst):
+    """Return (indptr, indices) for the given directed edge arrays."""
+    order = np.lexsort((dst, src))
+    indices = dst[order].astype(np.int32, copy=False)
+    counts = np.bincount(src, minlength=num_nodes)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+
+class CompactGraph:
+    """
+    A read-only, undirected graph stored in flat arrays.
+
+    Node ids are interned to ints, adjacency is kept in CSR form
+    (indptr/indices) and the 'layer' and 'vlan' node attributes are
+    stored as int code columns. Only the subset of the networkx API
+    that the windows use is provided; call to_networkx() for the rest.
+    """
+
+    def __init__(self, names, layer_codes, layer_values, vlan_codes, vlan_values, indptr, indices):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.layer_codes = layer_codes
+        self.layer_values = layer_values
+        self.vlan_codes = vlan_codes
+        self.vlan_values = vlan_values
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_node_link(cls, data):
+        nodes = data.get("nodes", [])
+        links = data.get("links")
+        if links is None:
+            links = data.get("edges", [])
+
+        names = [n["id"] for n in nodes]
+        index = {name: i for i, name in enumerate(names)}
+        layer_codes, layer_values = _intern([n.get("layer") for n in nodes])
+        vlan_codes, vlan_values = _intern([n.get("vlan") for n in nodes])
+
+        src = np.fromiter((index[l["source"]] for l in links), dtype=np.int32, count=len(links))
+        dst = np.fromiter((index[l["target"]] for l in links), dtype=np.int32, count=len(links))
+        # Store both directions so neighbours can be read from one row.
+        indptr, indices = _build_csr(len(names), np.concatenate([src, dst]), np.concatenate([dst, src]))
+        return cls(names, layer_codes, layer_values, vlan_codes, vlan_values, indptr, indices)
+
+    # --- networkx-compatible subset -------------------------------------
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def number_of_nodes(self):
+        return len(self.names)
+
+    def number_of_edges(self):
+        rows = self._edge_rows()
+        return int(np.count_nonzero(rows < self.indices)) + len(self._self_loops(rows))
+
+    def nodes(self, data=False, default=None):
+        if data is False:
+            return list(self.names)
+        if data is True:
+            return [(name, self._attrs(i)) for i, name in enumerate(self.names)]
+        column = self._column(data)
+        if column is None:
+            return [(name, default) for name in self.names]
+        codes, values = column
+        return [(name, values[c] if c >= 0 else default) for name, c in zip(self.names, codes.tolist())]
+
+    def edges(self):
+        rows = self._edge_rows()
+        mask = rows < self.indices
+        names = self.names
+        edges = [(names[u], names[v]) for u, v in zip(rows[mask].tolist(), self.indices[mask].tolist())]
+        edges.extend((names[u], names[u]) for u in self._self_loops(rows).tolist())
+        return edges
+
+    def neighbors(self, node):
+        i = self.index[node]
+        return [self.names[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]].tolist()]
+
+    def degree(self, node):
+        i = self.index[node]
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def subgraph(self, nodes):
+        idx = np.fromiter((self.index[n] for n in nodes if n in self.index), dtype=np.int64)
+        return self._induced(np.unique(idx))
+
+    def copy(self):
+        # Instances are immutable, so sharing is safe.
+        return self
+
+    # --- array operations -----------------------------------------------
+
+    def split_by_vlan(self, default=NO_VLAN):
+        """Return {vlan: CompactGraph} in one pass over the node and edge arrays."""
+        codes = self.vlan_codes
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        unique_codes, starts = np.unique(sorted_codes, return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        # Position of every node inside its own VLAN group.
+        local = np.empty(len(order), dtype=np.int32)
+        local[order] = np.arange(len(order)) - np.repeat(starts, ends - starts)
+
+        rows = self._edge_rows()
+        keep = codes[rows] == codes[self.indices]
+        src, dst = rows[keep], self.indices[keep]
+        edge_order = np.argsort(codes[src], kind="stable")
+        src, dst = src[edge_order], dst[edge_order]
+        edge_codes = codes[src]
+
+        result = {}
+        for code, start, end in zip(unique_codes.tolist(), starts.tolist(), ends.tolist()):
+            members = order[start:end]
+            lo, hi = np.searchsorted(edge_codes, [code, code + 1])
+            indptr, indices = _build_csr(len(members), local[src[lo:hi]], local[dst[lo:hi]])
+            vlan = self.vlan_values[code] if code >= 0 else default
+            result[vlan] = CompactGraph(
+                [self.names[i] for i in members.tolist()],
+                self.layer_codes[members], self.layer_values,
+                self.vlan_codes[members], self.vlan_values,
+                indptr, indices
+            )
+        return result
+
+    def to_networkx(self):
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges())
+        return graph
+
+    def _attrs(self, i):
+        attrs = {}
+        if self.layer_codes[i] >= 0:
+            attrs["layer"] = self.layer_values[self.layer_codes[i]]
+        if self.vlan_codes[i] >= 0:
+            attrs["vlan"] = self.vlan_values[self.vlan_codes[i]]
+        return attrs
+
+    def _column(self, name):
+        if name == "layer":
+            return self.layer_codes, self.layer_values
+        if name == "vlan":
+            return self.vlan_codes, self.vlan_values
+        return None
+
+    def _edge_rows(self):
+        return np.repeat(np.arange(len(self.names), dtype=np.int32), np.diff(self.indptr))
+
+    def _self_loops(self, rows):
+        # Both directions of a self-loop land on the diagonal; count the node once.
+        return np.unique(rows[rows == self.indices])
+
+    def _induced(self, idx):
+        mapping = np.full(len(self.names), -1, dtype=np.int32)
+        mapping[idx] = np.arange(len(idx), dtype=np.int32)
+        rows = self._edge_rows()
+        keep = (mapping[rows] >= 0) & (mapping[self.indices] >= 0)
+        indptr, indices = _build_csr(len(idx), mapping[rows[keep]], mapping[self.indices[keep]])
+        return CompactGraph(
+            [self.names[i] for i in idx.tolist()],
+            self.layer_codes[idx], self.layer_values,
+            self.vlan_codes[idx], self.vlan_values,
+            indptr, indices
+        )
+
+
+def load_graph(data, threshold=COMPACT_NODE_THRESHOLD):
+    """Build a graph from a node-link payload, using CompactGraph for large ones."""
+    if np is not None and len(data.get("nodes", [])) >= threshold:
+        return CompactGraph.from_node_link(data)
+    return json_graph.node_link_graph(data)
+
+
+# Received graphs are never mutated, so their VLAN split can be reused by every view.
+_split_cache = weakref.WeakKeyDictionary()
+
+
+def split_by_vlan(graph, default=NO_VLAN):
+    """
+    Group the nodes of an access graph by their 'vlan' attribute into
+    subgraphs. Nodes without a VLAN go under `default`.
+    """
+    cached = _split_cache.get(graph)
+    if cached is not None:
+        return cached
+    if isinstance(graph, CompactGraph):
+        result = graph.split_by_vlan(default)
+    else:
+        vlan_to_nodes = {}
+        for node, vlan in graph.nodes(data="vlan"):
+            vlan_to_nodes.setdefault(default if vlan is None else vlan, []).append(node)
+        result = {vlan: graph.subgraph(nodes).copy() for vlan, nodes in vlan_to_nodes.items()}
+    _split_cache[graph] = result
+    return result
+
+
+def as_networkx(graph):
+    """Return a networkx view of graph, converting a CompactGraph if needed."""
+    if isinstance(graph, CompactGraph):
+        return graph.to_networkx()
+    return graph
@@ -0,0 +1,233 @@
+import socket
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ValidationIssue:
+    def __init__(self, kind, devices, message):
+        self.kind = kind
+        self.devices = devices
+        self.message = message
+
+    def __repr__(self):
+        return f"ValidationIssue({self.kind!r}, {self.message!r})"
+
+
+class ValidationReport:
+    def __init__(self, issues, device_count, elapsed):
+        self.issues = issues
+        self.device_count = device_count
+        self.elapsed = elapsed
+
+    def counts(self):
+        result = {}
+        for issue in self.issues:
+            result[issue.kind] = result.get(issue.kind, 0) + 1
+        return result
+
+    @property
+    def ok(self):
+        return not self.issues
+
+
+def _addresses(entries):
+    """Flatten config entries (and any 'interfaces' lists) into (name, ip, mask, vlan) records."""
+    records = []
+    for entry in entries:
+        name = entry.get("name", "?")
+        if entry.get("ip_address") is not None:
+            records.append((name, entry.get("ip_address"), entry.get("subnet_mask"), entry.get("vlan")))
+        for iface in entry.get("interfaces") or []:
+            if isinstance(iface, dict) and iface.get("ip_address") is not None:
+                label = f"{name}/{iface.get('name', '?')}"
+                records.append((label, iface.get("ip_address"), iface.get("subnet_mask"), iface.get("vlan", entry.get("vlan"))))
+    return records
+
+
+def _parse_ipv4(values):
+    """Dotted quads to a uint32 array plus a validity mask."""
+    packed = bytearray(4 * len(values))
+    valid = np.ones(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        try:
+            packed[4 * i:4 * i + 4] = socket.inet_pton(socket.AF_INET, str(value).strip())
+        except (OSError, ValueError):
+            valid[i] = False
+    return np.frombuffer(bytes(packed), dtype=">u4").astype(np.uint32), valid
+
+
+def _parse_masks(values):
+    """Subnet masks given as dotted quads, prefix lengths or '/nn' strings."""
+    prefixes = np.full(len(values), -1, dtype=np.int64)
+    dotted_rows, dotted = [], []
+    for i, value in enumerate(values):
+        text = str(value).strip().lstrip("/") if value is not None else ""
+        if text.isdigit() and int(text) <= 32:
+            prefixes[i] = int(text)
+        elif text:
+            dotted_rows.append(i)
+            dotted.append(text)
+    masks = np.zeros(len(values), dtype=np.uint32)
+    valid = prefixes >= 0
+    has_prefix = np.flatnonzero(valid)
+    masks[has_prefix] = (np.uint64(0xFFFFFFFF) << (32 - prefixes[has_prefix]).astype(np.uint64)).astype(np.uint32)
+    if dotted:
+        parsed, ok = _parse_ipv4(dotted)
+        inverted = ~parsed
+        # A mask must be contiguous ones followed by zeros.
+        ok &= (inverted & (inverted + np.uint32(1))) == 0
+        rows = np.array(dotted_rows)
+        masks[rows] = parsed
+        valid[rows] = ok
+    return masks, valid
+
+
+# Subnet number bits under a bare ip_base: the server numbers subnets in the
+# octet after the base (e.g. 192.168.<vlan>.0/24, 10.<vlan>.0.0/16).
+SUBNET_BITS = 8
+
+
+def _common_prefix(masks):
+    """Prefix length of the most common subnet mask, or None without any."""
+    if not len(masks):
+        return None
+    values, counts = np.unique(masks, return_counts=True)
+    return bin(int(values[np.argmax(counts)])).count("1")
+
+
+def _base_range(ip_base, base_prefix, subnet_prefix=None):
+    """
+    (first, last, prefix) of the ip_base block, or None when its size is
+    not known. Without "/nn" or base_prefix, the block is taken to hold
+    2 ** SUBNET_BITS subnets of `subnet_prefix` (the devices' usual mask).
+    """
+    text = str(ip_base)
+    if "/" in text:
+        text, prefix = text.split("/", 1)
+        base_prefix = int(prefix)
+    if base_prefix is None:
+        if subnet_prefix is None:
+            return None
+        base_prefix = max(0, subnet_prefix - SUBNET_BITS)
+    base = int.from_bytes(socket.inet_pton(socket.AF_INET, text.strip()), "big")
+    size = 1 << (32 - base_prefix)
+    start = base & ~(size - 1) & 0xFFFFFFFF
+    return start, start + size - 1, base_prefix
+
+
+def _group_issue(kind, names, rows, message):
+    return ValidationIssue(kind, [names[i] for i in rows], message)
+
+
+def validate_configuration(access_configuration, top_layer_configurations, ip_base=None, base_prefix=None):
+    """
+    Check every device address in one set of vectorised passes: malformed
+    addresses/masks, duplicate IPs, hosts on a network or broadcast
+    address, overlapping subnets, hosts outside ip_base and VLANs that do
+    not map one-to-one onto subnets. A bare ip_base is sized from the
+    devices' subnet masks (see _base_range).
+    Returns a ValidationReport.
+    """
+    if np is None:
+        raise RuntimeError("Configuration validation requires numpy.")
+    start = time.perf_counter()
+    records = _addresses(list(access_configuration or []) + list(top_layer_configurations or []))
+    issues = []
+    if not records:
+        return ValidationReport(issues, 0, time.perf_counter() - start)
+
+    names = [r[0] for r in records]
+    ips, ip_ok = _parse_ipv4([r[1] for r in records])
+    masks, mask_ok = _parse_masks([r[2] for r in records])
+
+    for i in np.flatnonzero(~ip_ok).tolist():
+        issues.append(ValidationIssue("invalid_address", [names[i]], f"{names[i]}: invalid IP address {records[i][1]!r}"))
+    for i in np.flatnonzero(ip_ok & ~mask_ok).tolist():
+        issues.append(ValidationIssue("invalid_mask", [names[i]], f"{names[i]}: invalid subnet mask {records[i][2]!r}"))
+
+    # Duplicate IPs.
+    rows = np.flatnonzero(ip_ok)
+    order = rows[np.argsort(ips[rows], kind="stable")]
+    sorted_ips = ips[order]
+    if len(order) > 1:
+        boundaries = np.flatnonzero(np.diff(sorted_ips)) + 1
+        for group in np.split(order, boundaries):
+            if len(group) > 1:
+                ip = socket.inet_ntoa(int(ips[group[0]]).to_bytes(4, "big"))
+                issues.append(_group_issue("duplicate_ip", names, group.tolist(),
+                                           f"{ip} is used by {len(group)} devices: "
+                                           + ", ".join(names[i] for i in group[:5].tolist())
+                                           + (" ..." if len(group) > 5 else "")))
+
+    # Network / broadcast addresses used as host addresses (/31 and /32 excepted).
+    ok = np.flatnonzero(ip_ok & mask_ok)
+    networks = ips & masks
+    broadcasts = networks | ~masks
+    host_mask = ~masks[ok]
+    bad = ok[(host_mask > 1) & ((ips[ok] == networks[ok]) | (ips[ok] == broadcasts[ok]))]
+    for i in bad.tolist():
+        kind = "network" if ips[i] == networks[i] else "broadcast"
+        issues.append(ValidationIssue("reserved_address", [names[i]], f"{names[i]}: {records[i][1]} is the {kind} address of its subnet"))
+
+    # Overlapping subnets: distinct (network, mask) pairs whose ranges intersect.
+    if len(ok):
+        pairs = np.unique(np.stack([networks[ok], masks[ok]], axis=1), axis=0)
+        starts = pairs[:, 0].astype(np.int64)
+        ends = (pairs[:, 0] | ~pairs[:, 1]).astype(np.int64)
+        order_s = np.lexsort((-ends, starts))
+        starts, ends, pairs = starts[order_s], ends[order_s], pairs[order_s]
+        running_end = np.maximum.accumulate(ends)
+        overlapping = np.flatnonzero(starts[1:] <= running_end[:-1]) + 1
+        if len(overlapping):
+            owner = np.maximum.accumulate(np.where(ends == running_end, np.arange(len(ends)), 0))
+            for j in overlapping.tolist():
+                k = int(owner[j - 1])
+                a = _format_subnet(pairs[j])
+                b = _format_subnet(pairs[k])
+                members = ok[(networks[ok] == pairs[j][0]) & (masks[ok] == pairs[j][1])]
+                issues.append(_group_issue("subnet_overlap", names, members.tolist(), f"Subnet {a} overlaps {b}"))
+
+    # Hosts outside the ip_base block ("10.0.0.0/8", base_prefix, or sized from the masks).
+    base_range = _base_range(ip_base, base_prefix, _common_prefix(masks[ok])) if ip_base else None
+    if base_range is not None:
+        low, high, prefix = base_range
+        outside = rows[(ips[rows] < low) | (ips[rows] > high)]
+        for i in outside.tolist():
+            issues.append(ValidationIssue("out_of_range", [names[i]],
+                                          f"{names[i]}: {records[i][1]} is outside {_format_subnet((low, (0xFFFFFFFF << (32 - prefix)) & 0xFFFFFFFF))}"))
+
+    # VLAN <-> subnet must be one-to-one.
+    vlan_rows = np.array([i for i in ok.tolist() if records[i][3] is not None], dtype=np.int64)
+    if len(vlan_rows):
+        vlan_values = sorted({str(records[i][3]) for i in vlan_rows.tolist()})
+        vlan_codes = {v: c for c, v in enumerate(vlan_values)}
+        vlans = np.array([vlan_codes[str(records[i][3])] for i in vlan_rows.tolist()], dtype=np.int64)
+        # uint64 keys: with int64, networks from 128.0.0.0 up would come out negative.
+        subnet_keys = (networks[vlan_rows].astype(np.uint64) << np.uint64(32)) | masks[vlan_rows].astype(np.uint64)
+        subnet_values, subnet_codes = np.unique(subnet_keys, return_inverse=True)
+        pairs = np.unique(np.stack([vlans, subnet_codes.astype(np.int64)], axis=1), axis=0)
+        per_vlan = np.bincount(pairs[:, 0], minlength=len(vlan_values))
+        for code in np.flatnonzero(per_vlan > 1).tolist():
+            members = vlan_rows[vlans == code]
+            subnets = sorted({_format_subnet((networks[i], masks[i])) for i in members.tolist()})
+            issues.append(_group_issue("vlan_subnet_mismatch", names, members.tolist(),
+                                       f"VLAN {vlan_values[code]} spans {len(subnets)} subnets: " + ", ".join(subnets[:4])))
+        subnet_ids, subnet_counts = np.unique(pairs[:, 1], return_counts=True)
+        for code in subnet_ids[subnet_counts > 1].tolist():
+            members = vlan_rows[subnet_codes == code]
+            shared = sorted({str(records[i][3]) for i in members.tolist()})
+            key = int(subnet_values[code])
+            issues.append(_group_issue("vlan_subnet_mismatch", names, members.tolist(),
+                                       f"Subnet {_format_subnet((key >> 32, key & 0xFFFFFFFF))} is shared by VLANs " + ", ".join(shared)))
+
+    return ValidationReport(issues, len(records), time.perf_counter() - start)
+
+
+def _format_subnet(pair):
+    network, mask = int(pair[0]) & 0xFFFFFFFF, int(pair[1]) & 0xFFFFFFFF
+    prefix = bin(mask).count("1")
+    return f"{socket.inet_ntoa(network.to_bytes(4, 'big'))}/{prefix}"
@@ -1,16 +1,25 @@
 from PyQt5.QtWidgets import (
-    QWidget, QListWidget, QPushButton, QTextEdit,
-    QHBoxLayout, QVBoxLayout, QApplication
+    QWidget, QListWidget, QListWidgetItem, QPushButton, QTextEdit,
+    QHBoxLayout, QVBoxLayout, QApplication, QLabel
 )
+from PyQt5.QtCore import Qt, QTimer
+from qasync import asyncSlot
 import sys
 import json
 
 
+# Longer issue and change lists are truncated in the UI; the summary still counts everything.
+MAX_LISTED_ISSUES = 1000
+
+
 class ConfigWindow(QWidget):
-    def __init__(self, access_configuration, top_layer_configurations):
+    def __init__(self, access_configuration, top_layer_configurations, ip_base=None):
         super().__init__()
         self.setWindowTitle("Device Configuration")
         self.resize(800, 600)
+        self.access_configuration = access_configuration
+        self.top_layer_configurations = top_layer_configurations
+        self.ip_base = ip_base
 
         # Combine configurations into a dictionary keyed by device name
         self.device_configs = {
@@ -19,6 +28,8 @@ class ConfigWindow(QWidget):
         }
 
         self.init_ui()
+        # Validate once the window is on screen.
+        QTimer.singleShot(0, self.run_validation)
 
     def init_ui(self):
         # Main horizontal layout
@@ -38,9 +49,27 @@ class ConfigWindow(QWidget):
         self.config_display = QTextEdit()
         self.config_display.setReadOnly(True)
         right_layout.addWidget(self.config_display)
+        self.issues_label = QLabel("Validation:")
+        right_layout.addWidget(self.issues_label)
+        self.issue_list = QListWidget()
+        self.issue_list.setMaximumHeight(180)
+        self.issue_list.itemClicked.connect(self.on_issue_clicked)
+        right_layout.addWidget(self.issue_list)
+        # Filled by show_changes() when this window is opened from a topology comparison.
+        self.changes_label = QLabel("")
+        self.changes_label.hide()
+        right_layout.addWidget(self.changes_label)
+        self.change_list = QListWidget()
+        self.change_list.setMaximumHeight(180)
+        self.change_list.itemClicked.connect(self.on_change_clicked)
+        self.change_list.hide()
+        right_layout.addWidget(self.change_list)
         self.send_config_btn = QPushButton("Send Configuration")
         self.send_config_btn.clicked.connect(self.send_config)
         right_layout.addWidget(self.send_config_btn)
+        self.export_btn = QPushButton("Export All Configurations")
+        self.export_btn.clicked.connect(self.export_configs)
+        right_layout.addWidget(self.export_btn)
 
         # Assemble layouts
         main_layout.addLayout(left_layout)
@@ -56,6 +85,71 @@ class ConfigWindow(QWidget):
         conf = self.device_configs.get(name, {})
         self.config_display.setText(json.dumps(conf, indent=4))
 
+    def select_device(self, name):
+        matches = self.device_list.findItems(name, Qt.MatchExactly)
+        if matches:
+            self.device_list.setCurrentItem(matches[0])
+            self.device_list.scrollToItem(matches[0])
+            self.show_config()
+
+    def run_validation(self):
+        from config_validation import validate_configuration
+
+        self.issue_list.clear()
+        try:
+            report = validate_configuration(
+                self.access_configuration, self.top_layer_configurations, ip_base=self.ip_base
+            )
+        except Exception as e:
+            self.issues_label.setText(f"Validation unavailable: {e}")
+            return
+        summary = ", ".join(f"{kind}: {count}" for kind, count in sorted(report.counts().items()))
+        self.issues_label.setText(
+            f"Validation: {report.device_count} addresses checked in {report.elapsed * 1000:.0f} ms"
+            + (f" - {summary}" if summary else " - no issues found")
+        )
+        for issue in report.issues[:MAX_LISTED_ISSUES]:
+            item = QListWidgetItem(issue.message)
+            item.setData(Qt.UserRole, issue.devices)
+            self.issue_list.addItem(item)
+        if len(report.issues) > MAX_LISTED_ISSUES:
+            self.issue_list.addItem(f"... and {len(report.issues) - MAX_LISTED_ISSUES} more")
+
+    def on_issue_clicked(self, item):
+        devices = item.data(Qt.UserRole)
+        if devices:
+            # Device names from 'interfaces' entries look like "Router_1/Gi0/1".
+            self.select_device(devices[0].split("/")[0])
+
+    def show_changes(self, config_changes, title="Changes"):
+        """List topology_diff.ConfigChange entries; clicking one shows that device's config."""
+        self.change_list.clear()
+        for change in config_changes[:MAX_LISTED_ISSUES]:
+            item = QListWidgetItem(change.describe())
+            item.setData(Qt.UserRole, change.device)
+            self.change_list.addItem(item)
+        if len(config_changes) > MAX_LISTED_ISSUES:
+            self.change_list.addItem(f"... and {len(config_changes) - MAX_LISTED_ISSUES} more")
+        self.changes_label.setText(f"{title}: {len(config_changes)} devices")
+        self.changes_label.show()
+        self.change_list.show()
+
+    def on_change_clicked(self, item):
+        device = item.data(Qt.UserRole)
+        if device:
+            self.select_device(device)
+
+    @asyncSlot()
+    async def export_configs(self):
+        from export_dialog import run_export
+
+        topology = {
+            "id": "current",
+            "access_configuration": self.access_configuration,
+            "top_layer_configurations": self.top_layer_configurations,
+        }
+        await run_export(self, [topology], include_graphs=False)
+
     def send_config(self):
         # Placeholder for sending configuration
         # to do: implement sending logic
@@ -1,54 +1,299 @@
 import asyncio
+import inspect
+import itertools
 import json
+from collections import OrderedDict
+
+# Server push topics for changes to the user's saved topologies.
+HISTORY_EVENTS = ("topology_added", "topology_updated", "topology_deleted")
+
+# Put on the queue by the receiver when the connection goes away.
+_CONNECTION_LOST = object()
 
 
 class WebSocketDispatcher:
-    def __init__(self, websocket):
+    """
+    Owns the receiving side of the websocket. A receiver task decodes
+    incoming frames into a bounded queue; a router task hands each reply
+    to the send_and_wait() call it answers or, for server pushes (messages
+    with an "event" key) and messages nobody is waiting for, to the
+    handlers subscribed to that topic. When the queue is full the receiver
+    stops reading, so a slow consumer pushes back on the socket instead of
+    growing memory.
+
+    Every send_and_wait() request carries a "request_id". Replies that echo
+    it are matched to their request, and late ones are discarded. Replies
+    without one go to the oldest pending request, which relies on the
+    server answering in order. Once the server has been seen echoing ids,
+    an id-less reply can only be a late answer to a request that timed
+    out, so one is discarded per such request instead of being handed to
+    the next caller. A server that never echoes ids may simply not answer
+    some requests, so nothing is discarded for it.
+    """
+
+    def __init__(self, websocket, recorder=None, max_queue=64):
         self.websocket = websocket
-        self.queue = asyncio.Queue()
-        # Start the central receiver task.
+        # Optional SessionRecorder that captures every frame for later replay.
+        self.recorder = recorder
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        # request_id -> future of the send_and_wait() call, oldest first.
+        self._waiters = OrderedDict()
+        self._request_ids = itertools.count(1)
+        # Set once a reply echoes its request_id.
+        self.echoes_request_ids = False
+        # Id-less replies still owed to requests that gave up waiting for
+        # them; only counted for servers that echo ids.
+        self._stale_replies = 0
+        # Ack event topic -> request_id of the request the server answers with that event.
+        self._event_waiters = {}
+        self._subscribers = {}
+        self.stats = {
+            "received": 0,
+            "replies": 0,
+            "routed": 0,
+            "dropped": 0,
+            "stale": 0,
+            "backpressure_waits": 0,
+        }
+        self.connection_lost = False
+        # Start the central receiver and router tasks.
         self._receiver_task = asyncio.create_task(self._receiver())
+        self._router_task = asyncio.create_task(self._router())
 
     async def _receiver(self):
         try:
             while True:
                 message = await self.websocket.recv()
+                if self.recorder:
+                    self.recorder.record("recv", message)
+                self.stats["received"] += 1
                 try:
                     data = json.loads(message)
                 except Exception as e:
                     print("Error decoding JSON:", e)
+                    self.stats["dropped"] += 1
                     continue
+                if self.queue.full():
+                    self.stats["backpressure_waits"] += 1
                 await self.queue.put(data)
         except asyncio.CancelledError:
             # Gracefully exit on cancellation.
             print("Receiver task cancelled.")
         except Exception as e:
             print("Dispatcher receiver encountered exception:", e)
+            await self.queue.put(_CONNECTION_LOST)
         finally:
             print("Receiver task exiting.")
 
-    async def send_and_wait(self, request, timeout=5):
+    async def _router(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                if data is _CONNECTION_LOST:
+                    self._fail_waiters(ConnectionError("Connection closed."))
+                    continue
+                topic = data.get("event") if isinstance(data, dict) else None
+                if topic in self._event_waiters:
+                    waiter = self._waiters.pop(self._event_waiters.pop(topic), None)
+                    if waiter is not None and not waiter.done():
+                        waiter.set_result(data)
+                        self.stats["replies"] += 1
+                    if topic not in self._subscribers:
+                        continue
+                if topic is None:
+                    # Callers get the reply as the server would send it without ids.
+                    request_id = data.pop("request_id", None) if isinstance(data, dict) else None
+                    if request_id is not None:
+                        self.echoes_request_ids = True
+                    elif self._stale_replies:
+                        # The late reply of a request that timed out; the next caller's comes after it.
+                        self._discard_stale()
+                        continue
+                    waiter = self._take_waiter(request_id, data)
+                    if waiter is not None:
+                        waiter.set_result(data)
+                        self.stats["replies"] += 1
+                        continue
+                    if request_id is not None:
+                        self._discard_stale()
+                        continue
+                    topic = "unsolicited"
+                await self._route(topic, data)
+        except asyncio.CancelledError:
+            pass
+
+    def _take_waiter(self, request_id, data):
+        if request_id is not None:
+            waiter = self._waiters.pop(request_id, None)
+            return waiter if waiter is not None and not waiter.done() else None
+        # A request acknowledged by an event only ever gets an error as a
+        # plain reply, so other replies skip it (a server that ignores such
+        # a request would otherwise hand it the next caller's reply).
+        acked = () if isinstance(data, dict) and "error" in data else set(self._event_waiters.values())
+        for waiting_id, waiter in list(self._waiters.items()):
+            if waiter.done():
+                del self._waiters[waiting_id]
+            elif waiting_id not in acked:
+                del self._waiters[waiting_id]
+                return waiter
+        return None
+
+    def _discard_stale(self):
+        self._stale_replies = max(0, self._stale_replies - 1)
+        self.stats["stale"] += 1
+
+    async def _route(self, topic, data):
+        handlers = self._subscribers.get(topic) or self._subscribers.get("*")
+        if not handlers:
+            print(f"Dispatcher dropped '{topic}' message with no subscriber.")
+            self.stats["dropped"] += 1
+            return
+        self.stats["routed"] += 1
+        for handler in list(handlers):
+            try:
+                result = handler(topic, data)
+                # Awaiting async handlers is what applies backpressure to the receiver.
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"Subscriber for '{topic}' raised:", e)
+
+    def _fail_waiters(self, error):
+        self.connection_lost = True
+        while self._waiters:
+            _, waiter = self._waiters.popitem(last=False)
+            if not waiter.done():
+                waiter.set_exception(error)
+
+    def subscribe(self, topic, handler):
+        """
+        Call handler(topic, message) for every routed message of `topic`.
+        Server pushes are routed by their "event" value; messages that
+        arrive while no request is pending use the topic "unsolicited".
+        "*" receives any topic without its own subscriber.
+
+        Handlers run on the router task, one message at a time. A handler
+        that returns an awaitable is awaited before the next message is
+        routed, so slow async work pushes back on the socket. A plain
+        function that only schedules work (e.g. with asyncio.ensure_future)
+        returns at once and gets no backpressure; return the coroutine
+        instead if the work can fall behind.
+        """
+        self._subscribers.setdefault(topic, []).append(handler)
+
+    def unsubscribe(self, topic, handler):
+        handlers = self._subscribers.get(topic, [])
+        if handler in handlers:
+            handlers.remove(handler)
+        if not handlers:
+            self._subscribers.pop(topic, None)
+
+    async def subscribe_history(self, handler, timeout=5):
+        """
+        Ask the server to push topology_added/updated/deleted events for
+        this user and route them to handler(topic, event). The handler is
+        subscribed before the request goes out, so no push is missed.
+        Returns True once the server acknowledges with "history_subscribed".
+        A server without push support answers with an error instead; the
+        handler is then removed again and False is returned.
+        """
+        first = not any(topic in self._subscribers for topic in HISTORY_EVENTS)
+        for topic in HISTORY_EVENTS:
+            self.subscribe(topic, handler)
+        if not first:
+            return True
+        try:
+            reply = await self.send_and_wait({"action": "subscribe_history"}, timeout, ack_event="history_subscribed")
+        except BaseException:
+            # Including cancellation: the handler must not outlive a failed subscription.
+            self._unsubscribe_history_handler(handler)
+            raise
+        if reply.get("event") != "history_subscribed":
+            print("History subscription refused:", reply.get("error", reply))
+            self._unsubscribe_history_handler(handler)
+            return False
+        return True
+
+    async def unsubscribe_history(self, handler, timeout=5):
+        """Stop routing history events to handler; the last one out tells the server to stop pushing."""
+        self._unsubscribe_history_handler(handler)
+        if any(topic in self._subscribers for topic in HISTORY_EVENTS) or self.connection_lost:
+            return
+        try:
+            reply = await self.send_and_wait({"action": "unsubscribe_history"}, timeout, ack_event="history_unsubscribed")
+        except Exception as e:
+            # Usually called fire-and-forget while a window closes; nothing to hand the error to.
+            print("History unsubscription failed:", e)
+            return
+        if reply.get("event") != "history_unsubscribed":
+            print("History unsubscription failed:", reply.get("error", reply))
+
+    def _unsubscribe_history_handler(self, handler):
+        for topic in HISTORY_EVENTS:
+            self.unsubscribe(topic, handler)
+
+    def counters(self):
+        return {**self.stats, "queued": self.queue.qsize(), "pending_requests": len(self._waiters)}
+
+    async def send_and_wait(self, request, timeout=5, ack_event=None):
+        """
+        Send `request` and return its reply. With `ack_event`, a push of
+        that event topic also counts as the reply (for actions the server
+        acknowledges with an event rather than a reply); error replies are
+        still returned as usual.
+        """
+        if self.connection_lost:
+            raise ConnectionError("Connection closed.")
+        request_id = next(self._request_ids)
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters[request_id] = waiter
+        if ack_event is not None:
+            self._event_waiters[ack_event] = request_id
+        sent = False
         try:
             # Send the request.
-            await self.websocket.send(json.dumps(request))
-            # Wait for the next response from the queue.
-            response = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+            await self._send_frame(json.dumps({**request, "request_id": request_id}))
+            sent = True
+            # Wait for the router to hand us our reply.
+            response = await asyncio.wait_for(waiter, timeout=timeout)
             return response
         except Exception as e:
             print("send_and_wait error:", e)
             raise
+        finally:
+            if ack_event is not None and self._event_waiters.get(ack_event) == request_id:
+                del self._event_waiters[ack_event]
+            # On timeout/cancellation, drop our slot. A server that echoes ids
+            # still owes a reply, which must not go to the next caller; one
+            # that does not may never answer, and counting its missing
+            # replies would swallow every later one. (An ack event that
+            # turns up late is routed as an event instead.)
+            abandoned = self._waiters.pop(request_id, None) is not None
+            if abandoned and sent and ack_event is None and self.echoes_request_ids:
+                self._stale_replies += 1
 
     async def send(self, request):
         try:
-            await self.websocket.send(json.dumps(request))
+            await self._send_frame(json.dumps(request))
         except Exception as e:
             print("Send error:", e)
             raise
 
+    async def _send_frame(self, frame):
+        if self.recorder:
+            self.recorder.record("send", frame)
+        await self.websocket.send(frame)
+
     async def close(self):
-        if self._receiver_task:
-            self._receiver_task.cancel()
-            try:
-                await self._receiver_task
-            except Exception as e:
-                print("Receiver task cancelled with exception:", e)
+        if self.recorder:
+            self.recorder.close()
+        for task in (self._receiver_task, self._router_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                except Exception as e:
+                    print("Receiver task cancelled with exception:", e)
+        self._fail_waiters(ConnectionError("Dispatcher closed."))
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from exporter import ExportCancelled, export_topologies, export_work
+
+ZIP_FILTER = "Zip archive (*.zip)"
+FOLDER_FILTER = "Folder (*)"
+# Progress updates are forwarded to the UI thread at most this often.
+PROGRESS_INTERVAL = 0.05
+
+
+def ask_destination(parent, suggested_name="network_export"):
+    """Ask for a .zip file or a folder to create; returns the path or None."""
+    path, chosen = QFileDialog.getSaveFileName(
+        parent, "Export Configurations", suggested_name, f"{ZIP_FILTER};;{FOLDER_FILTER}"
+    )
+    if not path:
+        return None
+    if chosen == ZIP_FILTER and not path.lower().endswith(".zip"):
+        path += ".zip"
+    return path
+
+
+async def run_export(parent, topologies, include_graphs=True, destination=None):
+    """
+    Export `topologies` on a worker thread while a cancellable progress
+    dialog tracks it. Returns the number of files written, or None if the
+    export was cancelled, failed or no destination was chosen.
+    """
+    destination = destination or ask_destination(parent)
+    if not destination:
+        return None
+    total = export_work(topologies, include_graphs)
+    dialog = QProgressDialog("Exporting...", "Cancel", 0, max(total, 1), parent)
+    dialog.setWindowTitle("Export")
+    dialog.setWindowModality(Qt.WindowModal)
+    dialog.setMinimumDuration(300)
+    cancel_event = threading.Event()
+    dialog.canceled.connect(cancel_event.set)
+
+    loop = asyncio.get_event_loop()
+    last_update = [0.0]
+
+    def progress(done, total):
+        # Called on the worker thread: throttle, then hop to the UI thread.
+        now = time.monotonic()
+        if now - last_update[0] >= PROGRESS_INTERVAL or done == total:
+            last_update[0] = now
+            loop.call_soon_threadsafe(dialog.setValue, done)
+
+    start = time.perf_counter()
+    try:
+        files = await loop.run_in_executor(
+            None, export_topologies, topologies, destination, include_graphs, progress, cancel_event.is_set
+        )
+    except ExportCancelled:
+        print("[Export] Cancelled.")
+        return None
+    except Exception as e:
+        print("[Export] Failed:", e)
+        QMessageBox.critical(parent, "Export Error", f"Export failed: {e}")
+        return None
+    finally:
+        dialog.canceled.disconnect(cancel_event.set)
+        dialog.close()
+    print(f"[Export] Wrote {files} files to {destination} in {time.perf_counter() - start:.2f}s")
+    QMessageBox.information(parent, "Export", f"Exported {files} files to {destination}.")
+    return files
@@ -0,0 +1,282 @@
+import io
+import json
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+CONFIG_KEYS = ("access_configuration", "top_layer_configurations")
+GRAPH_KEYS = ("access_graph", "top_graph")
+GRAPH_FORMATS = ("graphml", "json")
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def _safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", "" if name is None else str(name)).strip("_") or "unnamed"
+
+
+def _unique_name(name, used):
+    """
+    `name`, or `name_2`, `name_3`... if an earlier entry already took it.
+    Compared case-insensitively, since Windows and macOS file names are.
+    """
+    candidate, counter = name, 1
+    while candidate.lower() in used:
+        counter += 1
+        candidate = f"{name}_{counter}"
+    used.add(candidate.lower())
+    return candidate
+
+
+class DirectoryWriter:
+    def __init__(self, path):
+        self.root = path
+        self._created = set()
+        # Folders this export made and files it wrote, so discard() removes exactly those.
+        self._new_folders = []
+        self._files = []
+        self._makedirs(path)
+
+    def _makedirs(self, folder):
+        missing = []
+        while folder and not os.path.isdir(folder):
+            missing.append(folder)
+            folder = os.path.dirname(folder)
+        if missing:
+            os.makedirs(missing[0], exist_ok=True)
+            self._new_folders.extend(missing)
+
+    def open(self, name):
+        path = os.path.join(self.root, *name.split("/"))
+        folder = os.path.dirname(path)
+        if folder not in self._created:
+            self._makedirs(folder)
+            self._created.add(folder)
+        self._files.append(path)
+        return open(path, "w", encoding="utf-8", newline="\n")
+
+    def close(self):
+        pass
+
+    def discard(self):
+        """Remove what this export wrote; anything already in the destination is left alone."""
+        for path in self._files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        # Deepest first, and only while empty.
+        for folder in sorted(self._new_folders, key=len, reverse=True):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                pass
+
+
+class ZipWriter:
+    """Writes each entry straight into the archive, so no entry is ever held in memory whole."""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def open(self, name):
+        return io.TextIOWrapper(self.archive.open(name, "w", force_zip64=True), encoding="utf-8", newline="\n")
+
+    def close(self):
+        self.archive.close()
+
+    def discard(self):
+        """Close and delete the unfinished archive."""
+        try:
+            self.archive.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def open_writer(destination):
+    """A ZipWriter for paths ending in .zip, otherwise a DirectoryWriter."""
+    if destination.lower().endswith(".zip"):
+        return ZipWriter(destination)
+    return DirectoryWriter(destination)
+
+
+def _links(data):
+    links = data.get("links")
+    return data.get("edges", []) if links is None else links
+
+
+def _graphml_type(values):
+    kinds = {type(v) for v in values}
+    if kinds == {bool}:
+        return "boolean"
+    if kinds == {int}:
+        return "long"
+    if kinds <= {int, float}:
+        return "double"
+    return "string"
+
+
+def _graphml_keys(items, skip, domain, keys):
+    """Add a GraphML key for every attribute found in `items` to `keys`, as (domain, name) -> (id, type)."""
+    values = {}
+    for item in items:
+        for name, value in item.items():
+            if name not in skip and value is not None:
+                values.setdefault(name, set()).add(value if not isinstance(value, (dict, list)) else str(value))
+    for name, vals in values.items():
+        keys[(domain, name)] = (f"d{len(keys)}", _graphml_type(vals))
+
+
+def _graphml_data(keys, domain, item, indent):
+    for name, value in item.items():
+        key = keys.get((domain, name))
+        if key is None or value is None:
+            continue
+        key_id, kind = key
+        text = str(value).lower() if kind == "boolean" else str(value)
+        yield f'{indent}<data key="{key_id}">{escape(text)}</data>'
+
+
+def graphml_lines(data):
+    """
+    Yield a node-link payload as GraphML, one line at a time.
+    (nx.generate_graphml builds the whole document before yielding.)
+    Node, link and graph-level attributes are all kept. GraphML has no
+    null type, so unset attributes are left out.
+    """
+    nodes = data.get("nodes", [])
+    links = _links(data)
+    graph_attrs = data.get("graph") or {}
+    keys = {}
+    _graphml_keys([graph_attrs], (), "graph", keys)
+    _graphml_keys(nodes, ("id",), "node", keys)
+    _graphml_keys(links, ("source", "target"), "edge", keys)
+
+    yield '<?xml version="1.0" encoding="utf-8"?>'
+    yield ('<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+           'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+           'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+           'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">')
+    for (domain, name), (key_id, kind) in keys.items():
+        yield f'  <key id="{key_id}" for="{domain}" attr.name={quoteattr(str(name))} attr.type="{kind}" />'
+    yield f'  <graph edgedefault="{"directed" if data.get("directed") else "undirected"}">'
+    yield from _graphml_data(keys, "graph", graph_attrs, "    ")
+    for node in nodes:
+        lines = list(_graphml_data(keys, "node", node, "      "))
+        if not lines:
+            yield f'    <node id={quoteattr(str(node["id"]))} />'
+            continue
+        yield f'    <node id={quoteattr(str(node["id"]))}>'
+        yield from lines
+        yield '    </node>'
+    for link in links:
+        endpoints = f'source={quoteattr(str(link["source"]))} target={quoteattr(str(link["target"]))}'
+        lines = list(_graphml_data(keys, "edge", link, "      "))
+        if not lines:
+            yield f'    <edge {endpoints} />'
+            continue
+        yield f'    <edge {endpoints}>'
+        yield from lines
+        yield '    </edge>'
+    yield '  </graph>'
+    yield '</graphml>'
+
+
+def node_link_chunks(data, batch=1000):
+    """
+    Yield a node-link payload as JSON in pieces. Nodes and links are
+    encoded in batches with json.dumps (the C encoder), which is much
+    faster than JSONEncoder.iterencode for large graphs.
+    """
+    yield "{"
+    for key, value in data.items():
+        if key in ("nodes", "links", "edges"):
+            continue
+        yield f"{json.dumps(key)}: {json.dumps(value, default=str)}, "
+    keys = [key for key in ("nodes", "links", "edges") if key in data] or ["nodes"]
+    for i, key in enumerate(keys):
+        items = data.get(key) or []
+        yield f"{json.dumps(key)}: ["
+        for start in range(0, len(items), batch):
+            chunk = ", ".join(json.dumps(item, default=str) for item in items[start:start + batch])
+            yield chunk if start == 0 else ", " + chunk
+        yield "]" if i == len(keys) - 1 else "], "
+    yield "}"
+
+
+def _write_chunks(writer, name, chunks):
+    with writer.open(name) as stream:
+        for chunk in chunks:
+            stream.write(chunk)
+
+
+def export_work(topologies, include_graphs=True):
+    """Number of progress steps export_topologies() reports for these topologies."""
+    graphs = len(GRAPH_KEYS) * len(GRAPH_FORMATS) if include_graphs else 0
+    return sum(
+        graphs + sum(len(topology.get(key) or []) for key in CONFIG_KEYS)
+        for topology in topologies
+    )
+
+
+def export_topologies(topologies, destination, include_graphs=True, progress=None, cancelled=None):
+    """
+    Write every device config of each topology to
+    topology_<id>/configs/<device>.json under `destination` (a directory,
+    or a zip archive if it ends in .zip). With include_graphs, both graphs
+    are also written as GraphML and node-link JSON. Everything is streamed
+    entry by entry. Devices (or topologies) whose names come out the same
+    once made file-safe get a numeric suffix instead of overwriting each
+    other. progress(done, total) is called after each step and
+    `cancelled()` is polled between steps; both may be called from a
+    worker thread. Returns the number of files written. On cancellation or
+    error, everything written so far is removed again.
+    """
+    total = export_work(topologies, include_graphs)
+    done = files = 0
+    encoder = json.JSONEncoder(indent=4, default=str)
+    writer = open_writer(destination)
+    folders = set()
+    try:
+        for topology in topologies:
+            folder = _unique_name(f"topology_{_safe_name(topology.get('id', 'current'))}", folders)
+            devices = set()
+            for key in CONFIG_KEYS:
+                for entry in topology.get(key) or []:
+                    if cancelled is not None and cancelled():
+                        raise ExportCancelled()
+                    name = f"{folder}/configs/{_unique_name(_safe_name(entry.get('name')), devices)}.json"
+                    # Config entries are small; only the graphs need chunked encoding.
+                    _write_chunks(writer, name, (encoder.encode(entry),))
+                    done += 1
+                    files += 1
+                    if progress is not None:
+                        progress(done, total)
+            if not include_graphs:
+                continue
+            for key in GRAPH_KEYS:
+                data = topology.get(key) or {}
+                if cancelled is not None and cancelled():
+                    raise ExportCancelled()
+                # Both generators yield the file a piece at a time.
+                _write_chunks(writer, f"{folder}/graphs/{key}.graphml", (line + "\n" for line in graphml_lines(data)))
+                _write_chunks(writer, f"{folder}/graphs/{key}.json", node_link_chunks(data))
+                done += len(GRAPH_FORMATS)
+                files += len(GRAPH_FORMATS)
+                if progress is not None:
+                    progress(done, total)
+    except BaseException:
+        writer.discard()
+        raise
+    writer.close()
+    return files
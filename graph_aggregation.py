@@ -0,0 +1,123 @@
+import math
+import threading
+import weakref
+
+import networkx as nx
+
+# Graphs with more nodes than this are shown aggregated by default.
+AGGREGATE_NODE_THRESHOLD = 200
+
+_cache = weakref.WeakKeyDictionary()
+# Windows aggregate in worker threads, several at a time.
+_cache_lock = threading.Lock()
+
+
+class NodeGroup:
+    """
+    A super-node standing for several devices. `members` are the graph
+    nodes it covers; `children` are nested groups shown when it is
+    expanded (a VLAN expands into its switch groups). A group without
+    children expands straight into its members.
+    """
+
+    def __init__(self, key, label, members, children=None):
+        self.key = key
+        self.label = label
+        self.members = members
+        self.children = children or []
+
+    @property
+    def size(self):
+        return len(self.members)
+
+
+class Aggregation:
+    """The groups of one graph, the edges between them and their overview layout."""
+
+    def __init__(self, groups, edges):
+        self.groups = groups
+        self.edges = edges
+        self._positions = None
+
+    def positions(self):
+        """Spring layout of the group graph, scaled to scene coordinates; computed once."""
+        if self._positions is None:
+            group_graph = nx.Graph()
+            group_graph.add_nodes_from(self.groups)
+            group_graph.add_edges_from(self.edges)
+            scale = max(400, 120 * math.sqrt(len(self.groups)))
+            pos = nx.spring_layout(group_graph, seed=42) if len(self.groups) > 1 else {k: (0, 0) for k in self.groups}
+            self._positions = {k: (x * scale + scale, y * scale + scale) for k, (x, y) in pos.items()}
+        return self._positions
+
+
+def _is_switch(node):
+    ln = str(node).lower()
+    return ln.startswith('switch_') or ln.startswith('multilayerswitch')
+
+
+def _switch_groups(graph, nodes=None):
+    """Collapse every switch with the leaf computers hanging off it."""
+    nodes = list(graph.nodes()) if nodes is None else nodes
+    in_scope = set(nodes)
+    owner = {}
+    groups = []
+    for node in nodes:
+        if not _is_switch(node):
+            continue
+        attached = [n for n in graph.neighbors(node)
+                    if n in in_scope and n not in owner and not _is_switch(n) and graph.degree(n) == 1]
+        members = [node] + attached
+        for n in members:
+            owner[n] = node
+        label = f"{node} +{len(attached)}" if attached else str(node)
+        groups.append(NodeGroup(node, label, members))
+    # Whatever is left (routers, multi-homed computers) stays a group of one.
+    for node in nodes:
+        if node not in owner:
+            owner[node] = node
+            groups.append(NodeGroup(node, str(node), [node]))
+    return groups, owner
+
+
+def _group_edges(graph, owner):
+    edges = set()
+    for u, v in graph.edges():
+        gu, gv = owner.get(u), owner.get(v)
+        if gu is not None and gv is not None and gu != gv:
+            edges.add((gu, gv) if str(gu) <= str(gv) else (gv, gu))
+    return edges
+
+
+def aggregate(graph, by="switches"):
+    """
+    Return the cached Aggregation of graph. by="switches" collapses each
+    access switch with its attached computers; by="vlans" collapses each
+    VLAN into one group that expands into its switch groups. Touches no
+    Qt objects, so it can run off the GUI thread.
+    """
+    with _cache_lock:
+        per_graph = _cache.setdefault(graph, {})
+        if by in per_graph:
+            return per_graph[by]
+
+    if by == "vlans":
+        vlan_nodes = {}
+        for node, vlan in graph.nodes(data='vlan', default='Default'):
+            vlan_nodes.setdefault(vlan, []).append(node)
+        groups = {}
+        owner = {}
+        for vlan, nodes in vlan_nodes.items():
+            key = f"VLAN {vlan}"
+            children, _ = _switch_groups(graph, nodes)
+            groups[key] = NodeGroup(key, f"VLAN {vlan}\n{len(nodes)} devices", nodes, children)
+            for n in nodes:
+                owner[n] = key
+    else:
+        switch_groups, owner = _switch_groups(graph)
+        groups = {g.key: g for g in switch_groups}
+
+    result = Aggregation(groups, _group_edges(graph, owner))
+    with _cache_lock:
+        # Another thread may have got there first; keep one Aggregation per graph.
+        return per_graph.setdefault(by, result)
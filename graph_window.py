@@ -1,12 +1,211 @@
+import asyncio
 import sys
 import networkx as nx
 import math
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QTabWidget, QGraphicsView, QGraphicsScene,
-    QGraphicsEllipseItem, QPushButton, QLabel, QGraphicsPixmapItem
+    QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QGraphicsView, QGraphicsScene,
+    QGraphicsEllipseItem, QPushButton, QLabel, QGraphicsPixmapItem, QMessageBox
 )
 from PyQt5.QtCore import Qt, QRectF
-from PyQt5.QtGui import QPen, QBrush, QFont, QPixmap
+from PyQt5.QtGui import QPen, QBrush, QFont, QPixmap, QColor
+
+from compact_graph import as_networkx
+from graph_aggregation import AGGREGATE_NODE_THRESHOLD, aggregate
+from scene_builder import OffThread, ProgressiveSceneBuilder
+from tile_cache import LiveScene, TiledGraphicsView, MinimapWidget
+
+# Graphs with more nodes than this get tiled rendering and a minimap by default.
+TILED_NODE_THRESHOLD = 500
+
+
+DEVICE_IMAGES = (
+    ('computer_', 'assets/pc_image.png'),
+    ('router_', 'assets/router_image.png'),
+    ('multilayerswitch', 'assets/layer_3_switch_image.png'),
+    ('switch_', 'assets/switch_image.png'),
+)
+_pixmap_cache = {}
+
+
+def device_pixmap(node_name):
+    """Return the 55x55 icon for a device name, or None for unknown devices."""
+    ln = str(node_name).lower()
+    for prefix, target in DEVICE_IMAGES:
+        if ln.startswith(prefix):
+            pix = _pixmap_cache.get(target)
+            if pix is None:
+                # load and scale to 55×55 once per image
+                pix = QPixmap(target).scaled(55, 55, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                _pixmap_cache[target] = pix
+            return pix
+    return None
+
+
+def add_device_item(scene, node, x, y, radius):
+    """Add a device icon (or a plain circle) and its name label centred at (x, y)."""
+    pix = device_pixmap(node)
+    if pix:
+        item = QGraphicsPixmapItem(pix)
+        item.setOffset(x - pix.width()/2, y - pix.height()/2)
+    else:
+        item = QGraphicsEllipseItem(QRectF(x - radius, y - radius, 2 * radius, 2 * radius))
+        item.setBrush(QBrush(Qt.cyan))
+    scene.addItem(item)
+
+    text = scene.addText(str(node))
+    text.setDefaultTextColor(Qt.white)
+    text.setPos(x - 15, y - 30)
+    return [item, text]
+
+
+def scene_changed(scene):
+    """Tell tiled views of `scene` that their cached tiles are stale."""
+    if isinstance(scene, LiveScene):
+        scene.edited.emit()
+
+
+class GroupNodeItem(QGraphicsEllipseItem):
+    """
+    A collapsed NodeGroup drawn as a circle sized by its member count.
+    Double-clicking expands it in place: its children (or members) are
+    placed on a ring around it without moving anything else, and a second
+    double-click collapses them again.
+    """
+
+    def __init__(self, group, x, y):
+        radius = 14 + min(30, 4 * math.log2(max(group.size, 1)))
+        super().__init__(QRectF(x - radius, y - radius, 2 * radius, 2 * radius))
+        self.group = group
+        self.center = (x, y)
+        self.expanded_items = []
+        self.setBrush(QBrush(QColor("#2e86de")))
+        self.setPen(QPen(Qt.white, 2))
+        self.setToolTip(f"{group.label} ({group.size} devices), double-click to expand")
+        self.setZValue(1)
+
+    def add_to(self, scene):
+        scene.addItem(self)
+        label = scene.addText(self.group.label)
+        label.setDefaultTextColor(Qt.white)
+        label.setPos(self.center[0] - 20, self.center[1] + self.rect().height() / 2)
+        self.label = label
+        return self
+
+    def remove_from(self, scene):
+        self.collapse()
+        scene.removeItem(self.label)
+        scene.removeItem(self)
+
+    def mouseDoubleClickEvent(self, event):
+        if self.expanded_items:
+            self.collapse()
+        else:
+            self.expand()
+        event.accept()
+
+    def expand(self):
+        scene = self.scene()
+        entries = self.group.children or self.group.members
+        cx, cy = self.center
+        # Keep neighbouring entries about 80px apart along the ring.
+        ring = max(90, len(entries) * 80 / (2 * math.pi))
+        pen = QPen(QColor("#888888"), 1)
+        for i, entry in enumerate(entries):
+            angle = 2 * math.pi * i / len(entries)
+            x, y = cx + ring * math.cos(angle), cy + ring * math.sin(angle)
+            spoke = scene.addLine(cx, cy, x, y, pen)
+            spoke.setZValue(-1)
+            self.expanded_items.append(spoke)
+            if self.group.children:
+                self.expanded_items.append(GroupNodeItem(entry, x, y).add_to(scene))
+            else:
+                self.expanded_items.extend(add_device_item(scene, entry, x, y, 10))
+        scene_changed(scene)
+
+    def collapse(self):
+        if not self.expanded_items:
+            return
+        scene = self.scene()
+        for item in self.expanded_items:
+            if isinstance(item, GroupNodeItem):
+                item.remove_from(scene)
+            else:
+                scene.removeItem(item)
+        self.expanded_items = []
+        scene_changed(scene)
+
+
+def aggregated_steps(scene, aggregation):
+    """Scene-building steps for an Aggregation: super-edges first, then one item per group."""
+    positions = aggregation.positions()
+    pen = QPen(Qt.white, 2)
+    for a, b in aggregation.edges:
+        x1, y1 = positions[a]; x2, y2 = positions[b]
+        scene.addLine(x1, y1, x2, y2, pen)
+        yield
+    for key, group in aggregation.groups.items():
+        x, y = positions[key]
+        if group.size == 1 and not group.children:
+            add_device_item(scene, group.members[0], x, y, 10)
+        else:
+            GroupNodeItem(group, x, y).add_to(scene)
+        yield
+
+
+def layout_aggregation(graph, by):
+    """aggregate() with the overview layout already computed, for running off the GUI thread."""
+    aggregation = aggregate(graph, by=by)
+    aggregation.positions()
+    return aggregation
+
+
+def aggregate_steps(scene, graph, by, on_ready=None):
+    """Aggregate and lay out `graph` in a worker thread, call on_ready(aggregation), then draw it."""
+    aggregation = yield OffThread(layout_aggregation, graph, by)
+    if on_ready is not None:
+        on_ready(aggregation)
+    yield from aggregated_steps(scene, aggregation)
+
+
+def mark_node(scene, items, pos, color, tooltip):
+    """Ring the device drawn at `pos` above everything else and append the ring to `items`."""
+    if pos is None:
+        return
+    ring = scene.addEllipse(pos[0] - 24, pos[1] - 24, 48, 48, QPen(color, 3))
+    ring.setToolTip(tooltip)
+    ring.setZValue(2)
+    items.append(ring)
+
+
+def mark_edge(scene, items, p1, p2, pen, tooltip):
+    if p1 is None or p2 is None or p1 == p2:
+        return
+    line = scene.addLine(p1[0], p1[1], p2[0], p2[1], pen)
+    line.setToolTip(tooltip)
+    line.setZValue(2)
+    items.append(line)
+
+
+def group_lookup(aggregation):
+    """{device: group key} for an Aggregation, so overlays can mark the group a device is collapsed into."""
+    return {m: key for key, group in aggregation.groups.items() for m in group.members}
+
+
+def spring_positions(graph):
+    """Spring layout of `graph` in scene coordinates. Touches no Qt objects, so it can run off the GUI thread."""
+    nx_graph = as_networkx(graph)
+    try:
+        pos = nx.spring_layout(nx_graph, seed=42)
+    except Exception:
+        pos = nx.circular_layout(nx_graph)
+    return {n: (x * 400 + 400, y * 400 + 300) for n, (x, y) in pos.items()}
+
+
+def resolve_aggregate(graph, aggregate_mode):
+    """None means aggregate by switch once the graph is larger than AGGREGATE_NODE_THRESHOLD."""
+    if aggregate_mode is None:
+        return "switches" if len(graph) > AGGREGATE_NODE_THRESHOLD else False
+    return aggregate_mode
 
 
 class GraphWindow(QWidget):
@@ -15,10 +214,25 @@ class GraphWindow(QWidget):
     Can render either a layered (topology) view or a spring-layout view.
     """
 
-    def __init__(self, graph, title="Graph Visualization", graph_type="top", parent=None):
+    def __init__(self, graph, title="Graph Visualization", graph_type="top", parent=None, aggregate=None,
+                 tiled=None):
         super().__init__(parent)
         self.graph = graph
         self.graph_type = graph_type  # "top" for layered, anything else for standard layout
+        # Standard layout only: False, "switches", "vlans" or None for automatic.
+        self.aggregate = aggregate
+        # Render the finished scene into cached tiles; None decides by graph size.
+        self.tiled = tiled if tiled is not None else len(graph) > TILED_NODE_THRESHOLD
+        self.minimap = None
+        self.builder = None
+        self.node_positions = {}
+        self.aggregation = None
+        self._group_of = None
+        self.overlay_items = []
+        self.diff_items = []
+        self.focus_items = []
+        self._deferred_overlays = []
+        self.redundancy_task = None
         print("[GraphWindow] Initializing with graph_type:", self.graph_type)
         sys.stdout.flush()
         self.setWindowTitle(title)
@@ -36,8 +250,12 @@ class GraphWindow(QWidget):
         self.graph_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
 
         # Graphics view and scene for the graph
-        self.scene = QGraphicsScene()
-        self.view = QGraphicsView(self.scene)
+        self.scene = LiveScene()
+        if self.tiled:
+            self.view = TiledGraphicsView(self.scene)
+            self.minimap = MinimapWidget(self.view)
+        else:
+            self.view = QGraphicsView(self.scene)
 
         # Back button to close the graph window
         self.back_button = QPushButton("Back to Home")
@@ -45,8 +263,23 @@ class GraphWindow(QWidget):
         self.back_button.setMinimumHeight(40)
         self.back_button.clicked.connect(self.close)
 
+        # Redundancy overlay: articulation points and bridges, analysed off the UI thread
+        self.redundancy_button = QPushButton("Show Redundancy")
+        self.redundancy_button.setCheckable(True)
+        self.redundancy_button.toggled.connect(self.on_redundancy_toggled)
+        self.redundancy_label = QLabel("")
+        self.redundancy_label.setWordWrap(True)
+
         layout.addWidget(self.graph_label)
-        layout.addWidget(self.view)
+        if self.minimap is not None:
+            view_layout = QHBoxLayout()
+            view_layout.addWidget(self.view, stretch=1)
+            view_layout.addWidget(self.minimap, alignment=Qt.AlignTop)
+            layout.addLayout(view_layout)
+        else:
+            layout.addWidget(self.view)
+        layout.addWidget(self.redundancy_label)
+        layout.addWidget(self.redundancy_button)
         layout.addWidget(self.back_button)
         self.setLayout(layout)
         print("[GraphWindow] UI initialized")
@@ -63,23 +296,146 @@ class GraphWindow(QWidget):
             self.draw_standard_topology()
 
     def _get_device_pixmap(self, node_name):
-        ln = node_name.lower()
-        target = None
-        if ln.startswith('computer_'):
-            target = 'assets/pc_image.png'
-        elif ln.startswith('router_'):
-            target = 'assets/router_image.png'
-        elif ln.startswith('multilayerswitch'):
-            target = 'assets/layer_3_switch_image.png'
-        elif ln.startswith('switch_'):
-            target = 'assets/switch_image.png'
-
-        if target:
-            # load and scale to 55×55
-            return QPixmap(target).scaled(55, 55, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        return None
+        return device_pixmap(node_name)
+
+    def _start_drawing(self, steps):
+        self.builder = ProgressiveSceneBuilder(steps, on_finished=self.on_scene_built,
+                                               on_error=self.on_drawing_failed).start()
+
+    def on_drawing_failed(self, error):
+        QMessageBox.critical(self, "Drawing Error", f"Failed to draw the graph: {error}")
+
+    def on_scene_built(self):
+        overlays, self._deferred_overlays = self._deferred_overlays, []
+        for apply in overlays:
+            apply()
+        # The scene is static from here on, so it can be cached as tiles.
+        if self.tiled:
+            self.view.build_tiles()
+
+    def cancel_drawing(self):
+        if self.builder is not None:
+            self.builder.cancel()
+        if self.redundancy_task is not None:
+            self.redundancy_task.cancel()
+            self.redundancy_task = None
+        if self.tiled:
+            self.view.tile_cache.invalidate()
+
+    def closeEvent(self, event):
+        self.cancel_drawing()
+        super().closeEvent(event)
+
+    def on_redundancy_toggled(self, checked):
+        if checked:
+            self.redundancy_task = asyncio.ensure_future(self.show_redundancy())
+        else:
+            if self.redundancy_task is not None:
+                self.redundancy_task.cancel()
+                self.redundancy_task = None
+            self.clear_redundancy()
+
+    async def show_redundancy(self):
+        from redundancy import analyze
+
+        self.redundancy_label.setText("Analysing redundancy...")
+        try:
+            report = await analyze(self.graph)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.redundancy_label.setText(f"Redundancy analysis failed: {e}")
+            return
+        self.redundancy_task = None
+        self.draw_redundancy(report)
+
+    def draw_redundancy(self, report):
+        if not self._when_built(lambda: self.draw_redundancy(report)):
+            return
+        self.clear_redundancy()
+        self.redundancy_label.setText(report.summary())
+        red = QColor("#e74c3c")
+        for u, v in report.bridges:
+            self._mark_edge(self.overlay_items, u, v, QPen(red, 5), f"Bridge: {u} - {v}")
+        for node in report.articulation_points:
+            self._mark_node(self.overlay_items, node, red, f"Single point of failure: {node}")
+        self._overlay_changed()
+
+    def clear_redundancy(self):
+        self._remove_items(self.overlay_items)
+        self.redundancy_label.setText("")
+        self._overlay_changed()
+
+    def show_diff(self, graph_diff):
+        """Highlight a topology_diff.GraphDiff: green added, red removed, orange changed."""
+        if not self._when_built(lambda: self.show_diff(graph_diff)):
+            return
+        self._remove_items(self.diff_items)
+        green, red, orange = QColor("#27ae60"), QColor("#e74c3c"), QColor("#f39c12")
+        for u, v in graph_diff.added_edges:
+            self._mark_edge(self.diff_items, u, v, QPen(green, 4), f"Added link: {u} - {v}")
+        for u, v in graph_diff.removed_edges:
+            self._mark_edge(self.diff_items, u, v, QPen(red, 4, Qt.DashLine), f"Removed link: {u} - {v}")
+        for node in graph_diff.added_nodes:
+            self._mark_node(self.diff_items, node, green, f"Added: {node}")
+        for node in graph_diff.removed_nodes:
+            self._mark_node(self.diff_items, node, red, f"Removed: {node}")
+        for node, fields in graph_diff.changed_nodes.items():
+            changes = ", ".join(f"{k}: {old!r} -> {new!r}" for k, (old, new) in fields.items())
+            self._mark_node(self.diff_items, node, orange, f"Changed {node}: {changes}")
+        self._overlay_changed()
+
+    def focus_node(self, node):
+        """Centre the view on a device and ring it, e.g. after a history search."""
+        if not self._when_built(lambda: self.focus_node(node)):
+            return
+        self._remove_items(self.focus_items)
+        pos = self._overlay_position(node)
+        if pos is None:
+            return
+        self._mark_node(self.focus_items, node, QColor("#f1c40f"), node)
+        self.view.centerOn(pos[0], pos[1])
+        self._overlay_changed()
+
+    def _when_built(self, apply):
+        """Overlays need node_positions; defer `apply` until the scene is built. True if it can run now."""
+        if self.builder is None or self.builder.finished:
+            return True
+        self._deferred_overlays.append(apply)
+        return False
+
+    def _mark_node(self, items, node, color, tooltip):
+        mark_node(self.scene, items, self._overlay_position(node), color, tooltip)
+
+    def _mark_edge(self, items, u, v, pen, tooltip):
+        mark_edge(self.scene, items, self._overlay_position(u), self._overlay_position(v), pen, tooltip)
+
+    def _remove_items(self, items):
+        for item in items:
+            self.scene.removeItem(item)
+        items.clear()
+
+    def _overlay_changed(self):
+        if self.tiled:
+            self.view.invalidate_tiles()
+
+    def _overlay_position(self, node):
+        pos = self.node_positions.get(node)
+        if pos is None and self.aggregation is not None:
+            # Aggregated view: mark the group the device is collapsed into.
+            if self._group_of is None:
+                self._group_of = group_lookup(self.aggregation)
+            pos = self.node_positions.get(self._group_of.get(node))
+        return pos
+
+    def _use_aggregation(self, aggregation):
+        self.aggregation = aggregation
+        self.node_positions = aggregation.positions()
 
     def draw_layered_topology(self):
+        self._start_drawing(self._layered_topology_steps())
+
+    def _layered_topology_steps(self):
         print("[draw_layered_topology] Start")
         sys.stdout.flush()
         if not self.graph or len(self.graph.nodes()) == 0:
@@ -93,7 +449,7 @@ class GraphWindow(QWidget):
             'Core': 0.3
         }
         # where each node belongs
-        node_layers = {n: self.graph.nodes[n].get('layer', 'Access') for n in self.graph.nodes()}
+        node_layers = dict(self.graph.nodes(data='layer', default='Access'))
         spacing = 150
         pos = {}
 
@@ -104,8 +460,7 @@ class GraphWindow(QWidget):
             sys.stdout.flush()
             for i, n in enumerate(nodes):
                 pos[n] = (i * spacing + 50, y * 500)
-                print(f"[draw_layered_topology] Node '{n}' position set to {pos[n]}")
-                sys.stdout.flush()
+        self.node_positions = pos
 
         pen = QPen(Qt.white, 2)
 
@@ -120,6 +475,7 @@ class GraphWindow(QWidget):
                     if u in pos and v in pos:
                         x1, y1 = pos[u]; x2, y2 = pos[v]
                         self.scene.addLine(x1, y1, x2, y2, pen)
+                        yield
 
         # === NEW: also fully mesh the *upper* layers among themselves ===
         # for 3-tier that's Distribution & Core,
@@ -133,26 +489,18 @@ class GraphWindow(QWidget):
                     if u in pos and v in pos:
                         x1, y1 = pos[u]; x2, y2 = pos[v]
                         self.scene.addLine(x1, y1, x2, y2, pen)
+                        yield
 
         # draw nodes
         for node, (x, y) in pos.items():
-            print(f"[draw_layered_topology] Drawing node '{node}' at ({x}, {y})")
-            sys.stdout.flush()
-            pix = self._get_device_pixmap(node)
-            if pix:
-                item = QGraphicsPixmapItem(pix)
-                item.setOffset(x - pix.width()/2, y - pix.height()/2)
-                self.scene.addItem(item)
-            else:
-                ellipse = QGraphicsEllipseItem(QRectF(x - 15, y - 15, 30, 30))
-                ellipse.setBrush(QBrush(Qt.cyan))
-                self.scene.addItem(ellipse)
-
-            text = self.scene.addText(node)
-            text.setDefaultTextColor(Qt.white)
-            text.setPos(x - 15, y - 30)
+            add_device_item(self.scene, node, x, y, 15)
+            yield
+        print("[draw_layered_topology] Done")
 
     def draw_standard_topology(self):
+        self._start_drawing(self._standard_topology_steps())
+
+    def _standard_topology_steps(self):
         print("[draw_standard_topology] Start")
         sys.stdout.flush()
         if not self.graph or len(self.graph.nodes()) == 0:
@@ -160,32 +508,82 @@ class GraphWindow(QWidget):
             sys.stdout.flush()
             return
 
-        pos = nx.spring_layout(self.graph, seed=42)
-        node_positions = {n: (x * 400 + 400, y * 400 + 300) for n, (x, y) in pos.items()}
+        mode = resolve_aggregate(self.graph, self.aggregate)
+        if mode:
+            print(f"[draw_standard_topology] Aggregating by {mode}")
+            yield from aggregate_steps(self.scene, self.graph, mode, self._use_aggregation)
+            return
+
+        node_positions = yield OffThread(spring_positions, self.graph)
+        self.node_positions = node_positions
         pen = QPen(Qt.white, 2)
 
         # edges
         for u, v in self.graph.edges():
             x1, y1 = node_positions[u]; x2, y2 = node_positions[v]
             self.scene.addLine(x1, y1, x2, y2, pen)
+            yield
 
         # nodes
         for node, (x, y) in node_positions.items():
-            print(f"[draw_standard_topology] Drawing node '{node}' at ({x}, {y})")
-            sys.stdout.flush()
-            pix = self._get_device_pixmap(node)
-            if pix:
-                item = QGraphicsPixmapItem(pix)
-                item.setOffset(x - pix.width()/2, y - pix.height()/2)
-                self.scene.addItem(item)
-            else:
-                ellipse = QGraphicsEllipseItem(QRectF(x - 10, y - 10, 20, 20))
-                ellipse.setBrush(QBrush(Qt.cyan))
-                self.scene.addItem(ellipse)
+            add_device_item(self.scene, node, x, y, 10)
+            yield
+        print("[draw_standard_topology] Done")
+
+
+class GraphDiffTabs(QTabWidget):
+    """
+    One tab per graph of a topology comparison, each a GraphWindow with
+    its GraphDiff highlighted. A tab's graph is only built and drawn the
+    first time the tab is shown.
+    """
 
-            text = self.scene.addText(node)
-            text.setDefaultTextColor(Qt.white)
-            text.setPos(x - 15, y - 30)
+    def __init__(self, entries, parent=None):
+        # entries: (tab label, callable returning the graph, graph_type, GraphDiff)
+        super().__init__(parent)
+        self.graph_windows = []
+        self._pending = {}
+        for label, make_graph, graph_type, graph_diff in entries:
+            page = QWidget()
+            page.setLayout(QVBoxLayout())
+            index = self.addTab(page, f"{label} ({graph_diff.summary()})")
+            self._pending[index] = (label, make_graph, graph_type, graph_diff)
+        self.setStyleSheet("QTabBar::tab { color: black; }")
+        self.currentChanged.connect(self.draw_tab)
+        self.draw_tab(self.currentIndex())
+
+    def draw_tab(self, index):
+        entry = self._pending.pop(index, None)
+        if entry is None:
+            return
+        label, make_graph, graph_type, graph_diff = entry
+        graph_widget = GraphWindow(make_graph(), title=label, graph_type=graph_type)
+        graph_widget.show_diff(graph_diff)
+        self.widget(index).layout().addWidget(graph_widget)
+        self.graph_windows.append(graph_widget)
+
+    def cancel_drawing(self):
+        for graph_widget in self.graph_windows:
+            graph_widget.cancel_drawing()
+
+
+class VLANTab:
+    """One VLAN tab: its scene, where its devices are drawn and its redundancy overlay."""
+
+    def __init__(self, vlan, scene, index):
+        self.vlan = vlan
+        self.scene = scene
+        self.index = index
+        self.node_positions = {}
+        self.group_of = {}
+        self.builder = None
+        self.overlay_items = []
+
+    def position(self, node):
+        pos = self.node_positions.get(node)
+        if pos is None:
+            pos = self.node_positions.get(self.group_of.get(node))
+        return pos
 
 
 class VLANTabWindow(QWidget):
@@ -194,9 +592,18 @@ class VLANTabWindow(QWidget):
     Each tab shows a QGraphicsView rendering the VLAN's subgraph.
     """
 
-    def __init__(self, vlan_subgraphs, parent=None):
+    def __init__(self, vlan_subgraphs, parent=None, aggregate=None, access_graph=None):
         super().__init__(parent)
         self.vlan_subgraphs = vlan_subgraphs
+        # False, "switches" or None to aggregate large VLANs automatically.
+        self.aggregate = aggregate
+        # When given and large, an extra "Overview" tab shows one super-node per VLAN.
+        # It is also the graph the redundancy overlay is computed from.
+        self.access_graph = access_graph
+        self.builders = []
+        self.tabs = []
+        self.redundancy_task = None
+        self.redundancy_report = None
         print("[VLANTabWindow] Initializing with", len(self.vlan_subgraphs), "subgraphs")
         self.setWindowTitle("Access Graph VLANs")
         self.resize(900, 700)
@@ -208,34 +615,148 @@ class VLANTabWindow(QWidget):
         self.tabWidget = QTabWidget()
         layout.addWidget(self.tabWidget)
 
+        if self.access_graph is not None and resolve_aggregate(self.access_graph, self.aggregate):
+            scene = QGraphicsScene()
+            self.add_builder(aggregate_steps(scene, self.access_graph, "vlans"))
+            self.tabWidget.addTab(QGraphicsView(scene), "Overview")
+
         for vlan, subgraph in self.vlan_subgraphs.items():
             print(f"[VLANTabWindow] Creating tab for VLAN '{vlan}' with {len(subgraph.nodes())} nodes")
             tab = QWidget()
             tab_layout = QVBoxLayout()
             scene = QGraphicsScene()
             view = QGraphicsView(scene)
-            self.draw_graph(scene, subgraph)
             tab_layout.addWidget(view)
             tab.setLayout(tab_layout)
-            self.tabWidget.addTab(tab, f"VLAN: {vlan}")
+            vlan_tab = VLANTab(vlan, scene, self.tabWidget.addTab(tab, f"VLAN: {vlan}"))
+            self.tabs.append(vlan_tab)
+            self.draw_graph(scene, subgraph, vlan_tab)
+
+        # Per-VLAN single points of failure, computed on the whole access graph.
+        self.redundancy_button = QPushButton("Show Redundancy")
+        self.redundancy_button.setCheckable(True)
+        self.redundancy_button.setEnabled(self.access_graph is not None)
+        self.redundancy_button.toggled.connect(self.on_redundancy_toggled)
+        self.redundancy_label = QLabel("")
+        self.redundancy_label.setWordWrap(True)
+        layout.addWidget(self.redundancy_label)
+        layout.addWidget(self.redundancy_button)
 
         self.setLayout(layout)
         self.tabWidget.setStyleSheet("QTabBar::tab { color: black; }")
         print("[VLANTabWindow] UI initialized")
 
-    def draw_graph(self, scene, graph):
+    def draw_graph(self, scene, graph, tab=None):
+        mode = resolve_aggregate(graph, self.aggregate)
+        if mode:
+            on_ready = None if tab is None else lambda aggregation: self.use_tab_aggregation(tab, aggregation)
+            steps = aggregate_steps(scene, graph, mode, on_ready)
+        else:
+            steps = self._graph_steps(scene, graph, tab.node_positions if tab is not None else {})
+        on_finished = None if tab is None else lambda: self.on_tab_built(tab)
+        builder = self.add_builder(steps, on_finished)
+        if tab is not None:
+            tab.builder = builder
+        return builder
+
+    def use_tab_aggregation(self, tab, aggregation):
+        tab.node_positions = aggregation.positions()
+        tab.group_of = group_lookup(aggregation)
+
+    def add_builder(self, steps, on_finished=None):
+        builder = ProgressiveSceneBuilder(steps, on_finished=on_finished, on_error=self.on_drawing_failed)
+        self.builders.append(builder)
+        return builder.start()
+
+    def on_drawing_failed(self, error):
+        QMessageBox.critical(self, "Drawing Error", f"Failed to draw the VLAN graphs: {error}")
+
+    def on_tab_built(self, tab):
+        if self.redundancy_report is not None:
+            self.draw_tab_redundancy(tab, self.redundancy_report)
+
+    def cancel_drawing(self):
+        for builder in self.builders:
+            builder.cancel()
+        self.builders = []
+        if self.redundancy_task is not None:
+            self.redundancy_task.cancel()
+            self.redundancy_task = None
+
+    def closeEvent(self, event):
+        self.cancel_drawing()
+        super().closeEvent(event)
+
+    def on_redundancy_toggled(self, checked):
+        if checked:
+            self.redundancy_task = asyncio.ensure_future(self.show_redundancy())
+        else:
+            if self.redundancy_task is not None:
+                self.redundancy_task.cancel()
+                self.redundancy_task = None
+            self.clear_redundancy()
+
+    async def show_redundancy(self):
+        from redundancy import analyze
+
+        self.redundancy_label.setText("Analysing redundancy...")
+        try:
+            report = await analyze(self.access_graph)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.redundancy_label.setText(f"Redundancy analysis failed: {e}")
+            return
+        self.redundancy_task = None
+        self.draw_redundancy(report)
+
+    def draw_redundancy(self, report):
+        """Ring each tab's VLAN SPOFs and draw the bridges inside it; tabs still drawing get it when done."""
+        self.clear_redundancy()
+        self.redundancy_report = report
+        self.redundancy_label.setText(report.summary())
+        for tab in self.tabs:
+            if tab.builder is None or tab.builder.finished:
+                self.draw_tab_redundancy(tab, report)
+
+    def draw_tab_redundancy(self, tab, report):
+        red = QColor("#e74c3c")
+        for u, v in report.bridges:
+            # Bridges leaving the VLAN have an end without a position here and are skipped.
+            mark_edge(tab.scene, tab.overlay_items, tab.position(u), tab.position(v),
+                      QPen(red, 5), f"Bridge: {u} - {v}")
+        spofs = report.vlan_spofs.get(tab.vlan, [])
+        # In aggregated tabs several SPOFs share their group's position; ring it once.
+        marked = set()
+        for node in spofs:
+            pos = tab.position(node)
+            if pos in marked:
+                continue
+            marked.add(pos)
+            mark_node(tab.scene, tab.overlay_items, pos, red, f"Single point of failure for VLAN {tab.vlan}: {node}")
+        if spofs:
+            self.tabWidget.setTabText(tab.index, f"VLAN: {tab.vlan} ({len(spofs)} SPOFs)")
+
+    def clear_redundancy(self):
+        self.redundancy_report = None
+        for tab in self.tabs:
+            for item in tab.overlay_items:
+                tab.scene.removeItem(item)
+            tab.overlay_items = []
+            self.tabWidget.setTabText(tab.index, f"VLAN: {tab.vlan}")
+        self.redundancy_label.setText("")
+
+    def _graph_steps(self, scene, graph, node_positions):
         print("[VLANTabWindow.draw_graph] Start for graph with", len(graph.nodes()), "nodes")
         if not graph or len(graph.nodes()) == 0:
             return
 
-        try:
-            pos = nx.spring_layout(graph, seed=42)
-        except:
-            pos = nx.circular_layout(graph)
+        pos = yield OffThread(spring_positions, graph)
         if not pos:
             return
 
-        node_positions = {n: (x * 400 + 400, y * 400 + 300) for n, (x, y) in pos.items()}
+        # Filled in place so the tab's overlays can find the devices.
+        node_positions.update(pos)
         pen = QPen(Qt.white, 2)
 
         # edges
@@ -243,20 +764,9 @@ class VLANTabWindow(QWidget):
             if u in node_positions and v in node_positions:
                 x1, y1 = node_positions[u]; x2, y2 = node_positions[v]
                 scene.addLine(x1, y1, x2, y2, pen)
+                yield
 
         # nodes
         for node, (x, y) in node_positions.items():
-            print(f"[VLANTabWindow.draw_graph] Drawing node '{node}' at ({x}, {y})")
-            pix = GraphWindow._get_device_pixmap(GraphWindow, node)
-            if pix:
-                item = QGraphicsPixmapItem(pix)
-                item.setOffset(x - pix.width()/2, y - pix.height()/2)
-                scene.addItem(item)
-            else:
-                ellipse = QGraphicsEllipseItem(QRectF(x - 10, y - 10, 20, 20))
-                ellipse.setBrush(QBrush(Qt.cyan))
-                scene.addItem(ellipse)
-
-            text = scene.addText(node)
-            text.setDefaultTextColor(Qt.white)
-            text.setPos(x - 15, y - 30)
+            add_device_item(scene, node, x, y, 10)
+            yield
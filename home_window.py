@@ -6,9 +6,10 @@ from PyQt5.QtCore import Qt
 
 
 class HomeWindow(QWidget):
-    def __init__(self, dispatcher, parent=None):
+    def __init__(self, dispatcher, navigator, parent=None):
         super().__init__(parent)
         self.dispatcher = dispatcher
+        self.navigator = navigator
         self.setWindowTitle("Home")
         self.resize(500, 300)
         self.initUI()
@@ -37,13 +38,7 @@ class HomeWindow(QWidget):
         self.setLayout(layout)
 
     def open_create_topology(self):
-        from client_window import ClientWindow
-        self.client_window = ClientWindow(self.dispatcher)
-        self.client_window.show()
-        self.hide()
+        self.navigator.open("client")
 
     def open_show_topologies(self):
-        from topology_history_window import TopologyHistoryWindow
-        self.history_window = TopologyHistoryWindow(self.dispatcher)
-        self.history_window.show()
-        self.hide()
+        self.navigator.open("history")
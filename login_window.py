@@ -1,6 +1,5 @@
 import asyncio
-import json
-import websockets
+import os
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QMessageBox
@@ -8,9 +7,27 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont
 from qasync import asyncSlot
 
-from home_window import HomeWindow
-from client_window import ClientWindow
 from dispatcher import WebSocketDispatcher
+from navigator import WindowNavigator
+
+# Override to point the client at another server, e.g. benchmarks/mock_server.py.
+SERVER_URL = os.environ.get("NETDESIGNER_SERVER_URL", "ws://localhost:6789")
+# Set to a file path to record the session, or to replay a recorded one instead of connecting.
+RECORD_PATH = os.environ.get("NETDESIGNER_RECORD")
+REPLAY_PATH = os.environ.get("NETDESIGNER_REPLAY")
+
+
+def replay_speed(value):
+    """Parse NETDESIGNER_REPLAY_SPEED: 0 replays without delays, a bad value falls back to 1."""
+    try:
+        speed = float(value or 0)
+    except ValueError:
+        print(f"[LoginWindow] Ignoring invalid NETDESIGNER_REPLAY_SPEED {value!r}; using 1.")
+        return 1.0
+    return speed if speed > 0 else None
+
+
+REPLAY_SPEED = replay_speed(os.environ.get("NETDESIGNER_REPLAY_SPEED", "1"))
 
 
 class LoginWindow(QDialog):
@@ -20,6 +37,7 @@ class LoginWindow(QDialog):
         self.resize(400, 200)
         self.websocket = None
         self.dispatcher = None
+        self.navigator = None
         self.initUI()
 
     def initUI(self):
@@ -56,6 +74,38 @@ class LoginWindow(QDialog):
         self.login_button.clicked.connect(self.on_login_clicked)
         self.signup_button.clicked.connect(self.on_signup_clicked)
 
+    def close_windows(self):
+        """Tear down the windows opened after login; connected to the application's aboutToQuit."""
+        if self.navigator is not None:
+            self.navigator.close_all()
+
+    async def open_connection(self):
+        if REPLAY_PATH:
+            from session_recorder import ReplayWebSocket
+            return ReplayWebSocket(REPLAY_PATH, speed=REPLAY_SPEED)
+        import websockets
+        return await websockets.connect(SERVER_URL, ping_interval=None, max_size=None)
+
+    async def ensure_connection(self):
+        """Connect and start the dispatcher, reusing the open connection (e.g. after signing up)."""
+        if self.dispatcher is not None and not self.dispatcher.connection_lost:
+            return self.dispatcher
+        self.websocket = await self.open_connection()
+        recorder = None
+        if RECORD_PATH:
+            from session_recorder import SessionRecorder
+            recorder = SessionRecorder(RECORD_PATH)
+        self.dispatcher = WebSocketDispatcher(self.websocket, recorder)
+        return self.dispatcher
+
+    async def close_connection(self):
+        dispatcher, websocket = self.dispatcher, self.websocket
+        self.dispatcher = self.websocket = None
+        if dispatcher is not None:
+            await dispatcher.close()
+        if websocket is not None:
+            await websocket.close()
+
     @asyncSlot()
     async def on_login_clicked(self):
         username = self.username_input.text().strip()
@@ -65,9 +115,7 @@ class LoginWindow(QDialog):
             return
 
         try:
-            self.websocket = await websockets.connect("ws://localhost:6789", ping_interval=None)
-            # Create the dispatcher right after connection.
-            self.dispatcher = WebSocketDispatcher(self.websocket)
+            await self.ensure_connection()
             auth_data = {
                 "action": "login",
                 "username": username,
@@ -77,7 +125,7 @@ class LoginWindow(QDialog):
             response_data = await asyncio.wait_for(self.dispatcher.send_and_wait(auth_data), timeout=2)
             if "error" in response_data:
                 QMessageBox.critical(self, "Login Failed", response_data["error"])
-                await self.websocket.close()
+                await self.close_connection()
                 return
         except asyncio.TimeoutError:
             # No immediate error; assume login OK.
@@ -86,10 +134,10 @@ class LoginWindow(QDialog):
             QMessageBox.critical(self, "Connection Error", f"Error: {e}")
             return
 
-        # On successful login, open the home window passing the dispatcher.
+        # On successful login, hand the dispatcher to the navigator and open home.
         self.accept()
-        self.home_window = HomeWindow(self.dispatcher)
-        self.home_window.show()
+        self.navigator = WindowNavigator(self.dispatcher)
+        self.navigator.open("home")
         self.close()
 
     @asyncSlot()
@@ -101,18 +149,19 @@ class LoginWindow(QDialog):
             return
 
         try:
-            async with websockets.connect("ws://localhost:6789", ping_interval=None) as websocket:
-                auth_data = {
-                    "action": "signup",
-                    "username": username,
-                    "password": password
-                }
-                await websocket.send(json.dumps(auth_data))
-                response = await websocket.recv()
-                response_data = json.loads(response)
-                if "error" in response_data:
-                    QMessageBox.critical(self, "Sign Up Failed", response_data["error"])
-                else:
-                    QMessageBox.information(self, "Sign Up Success", response_data["message"])
+            # Sign up over the connection login will use, so a recorded
+            # session covers both and replays them in order.
+            dispatcher = await self.ensure_connection()
+            auth_data = {
+                "action": "signup",
+                "username": username,
+                "password": password
+            }
+            response_data = await dispatcher.send_and_wait(auth_data)
+            if "error" in response_data:
+                QMessageBox.critical(self, "Sign Up Failed", response_data["error"])
+            else:
+                QMessageBox.information(self, "Sign Up Success", response_data["message"])
         except Exception as e:
             QMessageBox.critical(self, "Connection Error", f"Error: {e}")
+            await self.close_connection()
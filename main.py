@@ -1,8 +1,10 @@
 import sys
 import asyncio
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from qasync import QEventLoop
 from login_window import LoginWindow
+from preload import warm_imports
 
 
 def load_stylesheet(file_path):
@@ -10,6 +12,13 @@ def load_stylesheet(file_path):
         return f.read()
 
 
+def shutdown_workers():
+    # Only modules that were used have worker pools to stop; don't import the others now.
+    redundancy = sys.modules.get("redundancy")
+    if redundancy is not None:
+        redundancy.shutdown()
+
+
 def main():
     app = QApplication(sys.argv)
 
@@ -21,6 +30,10 @@ def main():
 
     login_window = LoginWindow()
     login_window.show()
+    app.aboutToQuit.connect(login_window.close_windows)
+    app.aboutToQuit.connect(shutdown_workers)
+    # Load the heavy modules in the background while the user types.
+    QTimer.singleShot(0, warm_imports)
 
     with loop:
         loop.run_forever()
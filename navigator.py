@@ -0,0 +1,84 @@
+import importlib
+from collections import OrderedDict
+
+
+# key -> (module, class); modules are imported on first use.
+WINDOW_CLASSES = {
+    "home": ("home_window", "HomeWindow"),
+    "client": ("client_window", "ClientWindow"),
+    "history": ("topology_history_window", "TopologyHistoryWindow"),
+}
+
+
+def _open_windows(window):
+    open_windows = getattr(window, "open_windows", None)
+    return open_windows() if open_windows else 0
+
+
+class WindowNavigator:
+    """
+    Switches between the top-level windows while keeping a small pool of
+    them alive, so going back to a window restores it exactly as it was
+    left (form fields, loaded history, open graphs). Graph and config
+    windows a pooled window keeps open (its open_windows() count) take up
+    pool slots too. When the pool is over max_windows the least recently
+    used windows are torn down and freed, except the current one and any
+    that still have windows open, so the user never loses a graph.
+    """
+
+    def __init__(self, dispatcher, max_windows=3):
+        self.dispatcher = dispatcher
+        self.max_windows = max_windows
+        self.windows = OrderedDict()
+        self.current = None
+
+    def open(self, key):
+        window = self.windows.get(key)
+        if window is None:
+            print(f"[Navigator] Creating '{key}' window.")
+            module_name, class_name = WINDOW_CLASSES[key]
+            window_class = getattr(importlib.import_module(module_name), class_name)
+            window = window_class(self.dispatcher, self)
+            self.windows[key] = window
+        else:
+            print(f"[Navigator] Reusing '{key}' window.")
+            self.windows.move_to_end(key)
+
+        if self.current is not None and self.current is not window:
+            self.current.hide()
+        self.current = window
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        self._evict()
+        return window
+
+    def pool_size(self):
+        return sum(1 + _open_windows(window) for window in self.windows.values())
+
+    def _evict(self):
+        for key in list(self.windows):
+            if self.pool_size() <= self.max_windows:
+                break
+            window = self.windows[key]
+            if window is not self.current and not _open_windows(window):
+                self.discard(key)
+
+    def discard(self, key):
+        """Tear down and free a pooled window."""
+        window = self.windows.pop(key, None)
+        if window is None:
+            return
+        print(f"[Navigator] Discarding '{key}' window.")
+        teardown = getattr(window, "teardown", None)
+        if teardown:
+            teardown()
+        if window is self.current:
+            self.current = None
+        window.close()
+        window.deleteLater()
+
+    def close_all(self):
+        """Tear down every pooled window; called when the application quits."""
+        for key in list(self.windows):
+            self.discard(key)
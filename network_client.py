@@ -1,6 +1,6 @@
 import json
 
 
-async def send_configuration(dispatcher, configuration):
-    response = await dispatcher.send_and_wait(configuration)
+async def send_configuration(dispatcher, configuration, timeout=5):
+    response = await dispatcher.send_and_wait(configuration, timeout=timeout)
     return response
@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import time
+
+from network_client import send_configuration
+from topology_params import DEFAULTS, validate_parameters
+
+SWEEP_FIELDS = ("num_routers", "num_mls", "num_switches", "num_computers", "vlan_count", "mode")
+SHORT_NAMES = {"num_routers": "r", "num_mls": "m", "num_switches": "s", "num_computers": "c",
+               "vlan_count": "v", "mode": "mode"}
+MAX_SWEEP_COMBINATIONS = 200
+# Devices every topology has exactly as many of as its request asked for.
+EXACT_DEVICE_COUNTS = (("num_routers", "router_", "routers"), ("num_mls", "multilayerswitch", "multilayer switches"))
+# Requests are pipelined on one connection, so later ones wait behind earlier ones.
+SWEEP_REQUEST_TIMEOUT = 120
+
+
+def expand_sweep(ranges, base=None):
+    """
+    Expand {field: [values]} into every combination on top of `base`
+    (the form's single-valued fields). Each combination is checked with
+    validate_parameters(); returns (valid params, [(params, reason)]).
+    """
+    base = {**DEFAULTS, **(base or {})}
+    fields = [f for f in SWEEP_FIELDS if f in ranges]
+    valid, rejected = [], []
+    for values in itertools.product(*(ranges[f] for f in fields)):
+        params = {**base, **dict(zip(fields, values))}
+        label = " ".join(f"{SHORT_NAMES[f]}{params[f]}" for f in SWEEP_FIELDS)
+        params["topology_name"] = f"{base['topology_name']} [{label}]"
+        ok, result = validate_parameters(params)
+        if ok:
+            valid.append(result)
+        else:
+            rejected.append((params, result))
+    return valid, rejected
+
+
+def _links(data):
+    links = data.get("links")
+    return data.get("edges", []) if links is None else links
+
+
+def reply_mismatch(params, response):
+    """
+    Why a create_graph reply cannot be the answer to `params`, or None.
+    Checks the topology name when the reply carries one, otherwise the
+    router and multilayer switch counts. Requests share one connection, so
+    a server that neither echoes request ids nor keeps replies in order
+    would otherwise attach topologies to the wrong row.
+    """
+    name = response.get("topology_name")
+    if name is not None:
+        return None if name == params["topology_name"] else f"reply is for '{name}'"
+    names = [str(node["id"]).lower() for node in (response.get("top_graph") or {}).get("nodes", [])]
+    counts = {field: sum(n.startswith(prefix) for n in names) for field, prefix, _ in EXACT_DEVICE_COUNTS}
+    if not any(counts.values()):
+        # Unrecognised device names; nothing to compare.
+        return None
+    for field, _, label in EXACT_DEVICE_COUNTS:
+        if counts[field] != params[field]:
+            return f"reply has {counts[field]} {label}, expected {params[field]}"
+    return None
+
+
+class SweepResult:
+    """One row of the comparison table; `error` is set instead of the counts when generation failed."""
+
+    def __init__(self, params, elapsed, response=None, error=None):
+        self.params = params
+        self.elapsed = elapsed
+        self.error = error
+        self.redundancy = None
+        self.topology_id = None
+        self.access_nodes = self.access_links = self.top_nodes = self.top_links = self.vlans = None
+        if response is not None:
+            access, top = response.get("access_graph") or {}, response.get("top_graph") or {}
+            self.topology_id = response.get("id")
+            self.access_nodes = len(access.get("nodes", []))
+            self.access_links = len(_links(access))
+            self.top_nodes = len(top.get("nodes", []))
+            self.top_links = len(_links(top))
+            self.vlans = len({n.get("vlan") for n in access.get("nodes", []) if n.get("vlan") is not None})
+
+
+async def run_combination(dispatcher, params, semaphore, analyse=True):
+    start = time.perf_counter()
+    try:
+        async with semaphore:
+            response = await send_configuration(
+                dispatcher, {**params, "action": "create_graph"}, timeout=SWEEP_REQUEST_TIMEOUT
+            )
+        if "error" in response:
+            return SweepResult(params, time.perf_counter() - start, error=response["error"])
+        mismatch = reply_mismatch(params, response)
+        if mismatch:
+            print(f"[Sweep] Discarding reply for {params['topology_name']}: {mismatch}")
+            return SweepResult(params, time.perf_counter() - start, error=f"Mismatched reply ({mismatch})")
+        result = SweepResult(params, time.perf_counter() - start, response=response)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        return SweepResult(params, time.perf_counter() - start, error=str(e) or type(e).__name__)
+    if analyse:
+        # Outside the semaphore: the next request goes out while this one is analysed.
+        from compact_graph import load_graph
+        from redundancy import analyze
+        try:
+            result.redundancy = await analyze(load_graph(response["top_graph"]))
+        except Exception as e:
+            print("[Sweep] Redundancy analysis failed:", e)
+    return result
+
+
+async def run_sweep(dispatcher, combinations, concurrency=4, on_result=None, analyse=True):
+    """
+    Submit create_graph for every combination with at most `concurrency`
+    requests in flight, calling on_result(index, SweepResult) as each
+    finishes. Returns the results in combination order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index, params):
+        result = await run_combination(dispatcher, params, semaphore, analyse)
+        if on_result:
+            on_result(index, result)
+        return result
+
+    return await asyncio.gather(*(run(i, params) for i, params in enumerate(combinations)))
@@ -0,0 +1,40 @@
+import importlib
+import threading
+
+
+# Modules only needed after login, roughly in order of first use.
+DEFERRED_MODULES = (
+    "websockets",
+    "navigator",
+    "home_window",
+    "client_window",
+    "topology_history_window",
+    "thumbnails",
+    "networkx",
+    "networkx.readwrite.json_graph",
+    "compact_graph",
+    "graph_window",
+    "config_window",
+    "config_validation",
+    "redundancy",
+    "search_index",
+    "export_dialog",
+)
+
+
+def warm_imports(modules=DEFERRED_MODULES):
+    """
+    Import the given modules on a daemon thread so that the first real
+    use finds them already in sys.modules. Failures are only logged; the
+    lazy import at the call site will raise the real error if needed.
+    """
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"[preload] Failed to import {name}:", e)
+
+    thread = threading.Thread(target=run, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+from networkx.algorithms.connectivity import (
+    build_auxiliary_edge_connectivity, build_auxiliary_node_connectivity,
+    local_edge_connectivity, local_node_connectivity
+)
+from networkx.algorithms.flow import build_residual_network
+
+LAYER_ORDER = ("Access", "Distribution", "Core")
+# Single-homed end hosts always hang off one switch; they are counted, not reported as SPOFs.
+END_HOST_PREFIXES = ("computer_",)
+MAX_CACHED_REPORTS = 32
+
+_executor = None
+_results = OrderedDict()
+_pending = {}
+_keys = weakref.WeakKeyDictionary()
+
+
+class RedundancyReport:
+    """
+    Result of analyze_redundancy(). Plain data, so it can be returned
+    from a worker process. `layer_connectivity` maps (lower, upper) to
+    (node_connectivity, edge_connectivity): the fewest node- and
+    edge-disjoint paths any device of the lower layer has to the upper one.
+    """
+
+    def __init__(self, articulation_points, bridges, layer_connectivity, vlan_spofs, single_homed,
+                 node_count, edge_count, elapsed):
+        self.articulation_points = articulation_points
+        self.bridges = bridges
+        self.layer_connectivity = layer_connectivity
+        self.vlan_spofs = vlan_spofs
+        self.single_homed = single_homed
+        self.node_count = node_count
+        self.edge_count = edge_count
+        self.elapsed = elapsed
+
+    @property
+    def redundant(self):
+        return not self.articulation_points and not self.bridges
+
+    def summary(self):
+        parts = [
+            f"{len(self.articulation_points)} single points of failure",
+            f"{len(self.bridges)} bridge links",
+        ]
+        for (lower, upper), (node_k, edge_k) in self.layer_connectivity.items():
+            parts.append(f"{lower}->{upper}: {node_k} node / {edge_k} link disjoint paths")
+        if self.vlan_spofs:
+            parts.append(f"{len(self.vlan_spofs)} VLANs with SPOFs")
+        if self.single_homed:
+            parts.append(f"{self.single_homed} single-homed hosts")
+        return "Redundancy: " + ", ".join(parts) + f" ({self.elapsed:.2f}s)"
+
+
+def _is_end_host(node):
+    return str(node).lower().startswith(END_HOST_PREFIXES)
+
+
+def _layer_connectivity(graph):
+    layers = dict(graph.nodes(data="layer"))
+    present = [layer for layer in LAYER_ORDER if layer in layers.values()]
+    result = {}
+    for lower, upper in zip(present, present[1:]):
+        sink = ("layer", upper)
+        flow_graph = nx.Graph(graph)
+        flow_graph.add_edges_from((sink, n) for n, layer in layers.items() if layer == upper)
+        sources = [n for n, layer in layers.items() if layer == lower]
+        # A device cut off from the upper layer makes the minimum 0; otherwise
+        # it cannot drop below 1, so the search stops as soon as it gets there.
+        reachable = nx.node_connected_component(flow_graph, sink)
+        if any(n not in reachable for n in sources):
+            result[(lower, upper)] = (0, 0)
+            continue
+        # Build the flow networks once and reuse them for every source device.
+        node_aux = build_auxiliary_node_connectivity(flow_graph)
+        node_residual = build_residual_network(node_aux, "capacity")
+        edge_aux = build_auxiliary_edge_connectivity(flow_graph)
+        edge_residual = build_residual_network(edge_aux, "capacity")
+        node_k = edge_k = None
+        for n in sources:
+            # Nothing below the current minimum can change it, so stop each flow there.
+            if node_k is None or node_k > 1:
+                k = local_node_connectivity(flow_graph, n, sink, auxiliary=node_aux, residual=node_residual,
+                                            cutoff=node_k)
+                node_k = k if node_k is None else min(node_k, k)
+            if edge_k is None or edge_k > 1:
+                k = local_edge_connectivity(flow_graph, n, sink, auxiliary=edge_aux, residual=edge_residual,
+                                            cutoff=edge_k)
+                edge_k = k if edge_k is None else min(edge_k, k)
+            if node_k == 1 and edge_k == 1:
+                break
+        result[(lower, upper)] = (node_k, edge_k)
+    return result
+
+
+def analyze_redundancy(nodes, edges):
+    """
+    Find the articulation points, bridges, layer-to-layer connectivity and
+    per-VLAN single points of failure of a graph given as (name, layer, vlan)
+    node tuples and (u, v) edges. Runs in a worker process.
+    """
+    start = time.perf_counter()
+    graph = nx.Graph()
+    for name, layer, vlan in nodes:
+        graph.add_node(name, layer=layer, vlan=vlan)
+    graph.add_edges_from(edges)
+
+    hosts = {n for n in graph if _is_end_host(n) and graph.degree(n) <= 1}
+    infrastructure = graph.subgraph(n for n in graph if n not in hosts)
+
+    articulation_points = sorted(nx.articulation_points(infrastructure), key=str)
+    bridges = sorted((tuple(sorted(edge, key=str)) for edge in nx.bridges(infrastructure)), key=str)
+
+    vlan_members = {}
+    for n, vlan in infrastructure.nodes(data="vlan"):
+        if vlan is not None:
+            vlan_members.setdefault(vlan, []).append(n)
+    vlan_spofs = {}
+    for vlan, members in vlan_members.items():
+        spofs = sorted(nx.articulation_points(infrastructure.subgraph(members)), key=str)
+        if spofs:
+            vlan_spofs[vlan] = spofs
+
+    return RedundancyReport(
+        articulation_points, bridges, _layer_connectivity(infrastructure), vlan_spofs, len(hosts),
+        graph.number_of_nodes(), graph.number_of_edges(), time.perf_counter() - start
+    )
+
+
+def graph_payload(graph):
+    """The picklable (nodes, edges) form of a networkx graph or CompactGraph."""
+    layers = dict(graph.nodes(data="layer"))
+    vlans = dict(graph.nodes(data="vlan"))
+    nodes = [(n, layers.get(n), vlans.get(n)) for n in graph.nodes()]
+    return nodes, [tuple(edge) for edge in graph.edges()]
+
+
+def graph_hash(nodes, edges):
+    return hashlib.sha1(json.dumps([nodes, edges], default=str).encode()).hexdigest()
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that already runs a Qt application is unsafe.
+        _executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def analyze(graph):
+    """
+    Redundancy report for `graph`, computed in a worker process. Reports
+    are memoized by graph content, so reopening a topology (or opening the
+    same one from history) reuses the earlier result.
+    """
+    key = _keys.get(graph)
+    if key is None or key not in _results:
+        nodes, edges = graph_payload(graph)
+        loop = asyncio.get_event_loop()
+        key = await loop.run_in_executor(None, graph_hash, nodes, edges)
+        _keys[graph] = key
+        if key not in _results:
+            job = _pending.get(key)
+            if job is None:
+                job = _pending[key] = asyncio.ensure_future(
+                    loop.run_in_executor(_pool(), analyze_redundancy, nodes, edges))
+                job.add_done_callback(lambda job, key=key: _finished(key, job))
+            # Shielded: one window giving up must not cancel the analysis for
+            # the others, and the report is still cached if every caller left.
+            return await asyncio.shield(job)
+    _results.move_to_end(key)
+    return _results[key]
+
+
+def _finished(key, job):
+    _pending.pop(key, None)
+    if job.cancelled() or job.exception() is not None:
+        return
+    report = job.result()
+    _results[key] = report
+    while len(_results) > MAX_CACHED_REPORTS:
+        _results.popitem(last=False)
+    print(f"[Redundancy] Analysed {report.node_count} nodes in {report.elapsed:.2f}s")
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
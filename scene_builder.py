@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+
+class OffThread:
+    """
+    Yielded by a step generator to have func(*args) run in a worker
+    thread; the generator receives its result from the yield. For work
+    that touches no Qt objects, such as computing a layout.
+    """
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+
+class ProgressiveSceneBuilder:
+    """
+    Runs a generator that adds items to a QGraphicsScene in slices of at
+    most `budget_ms` milliseconds, yielding to the (qasync) event loop
+    between slices. The window can be shown straight away, items stream
+    in, and other coroutines such as the WebSocket receiver keep running.
+    A step that yields an OffThread waits for it without blocking the loop.
+    If a step raises, on_error(exception) is called instead of on_finished.
+    """
+
+    def __init__(self, steps, budget_ms=4, on_finished=None, on_error=None):
+        self.steps = steps
+        self.budget = budget_ms / 1000.0
+        self.on_finished = on_finished
+        self.on_error = on_error
+        self.finished = False
+        self.error = None
+        self._task = None
+
+    def start(self):
+        loop = asyncio.get_event_loop()
+        if loop.is_running():
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            # No loop to hand slices to (e.g. headless scripts); build in one go.
+            self.run_to_completion()
+        return self
+
+    def run_to_completion(self):
+        value = None
+        try:
+            while True:
+                try:
+                    step = self.steps.send(value)
+                except StopIteration:
+                    break
+                value = step.func(*step.args) if isinstance(step, OffThread) else None
+        except Exception as e:
+            self._fail(e)
+            return
+        self._finish()
+
+    def cancel(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self.steps.close()
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        value = None
+        try:
+            while True:
+                deadline = time.perf_counter() + self.budget
+                while time.perf_counter() < deadline:
+                    try:
+                        step = self.steps.send(value)
+                    except StopIteration:
+                        self._finish()
+                        return
+                    value = None
+                    if isinstance(step, OffThread):
+                        value = await loop.run_in_executor(None, step.func, *step.args)
+                        # The wait was not spent on this slice.
+                        deadline = time.perf_counter() + self.budget
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail(e)
+
+    def _finish(self):
+        self.finished = True
+        if self.on_finished:
+            self.on_finished()
+
+    def _fail(self, error):
+        self.finished = True
+        self.error = error
+        print("[SceneBuilder] Drawing failed:", repr(error))
+        if self.on_error:
+            self.on_error(error)
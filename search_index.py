@@ -0,0 +1,142 @@
+import bisect
+import heapq
+
+GRAPH_KEYS = ("top_graph", "access_graph")
+CONFIG_KEYS = ("access_configuration", "top_layer_configurations")
+MAX_PREFIX_TOKENS = 500
+# Up to this many new or removed tokens are patched into the sorted token
+# list one by one (bisect, O(n) each); more are merged in one linear pass.
+SORTED_PATCH_LIMIT = 32
+
+
+def _add(tokens, token, device):
+    tokens.setdefault(str(token).lower(), set()).add(device)
+
+
+def topology_tokens(topology):
+    """
+    Map every searchable token of one topology to the devices carrying it:
+    device names, graph node attributes and config field values. Values
+    are indexed both bare ("10.4.2.17") and qualified by their field
+    ("ip_address:10.4.2.17", "vlan:12"). Pure, so it can run in a thread.
+    """
+    tokens = {}
+    for key in GRAPH_KEYS:
+        for node in (topology.get(key) or {}).get("nodes", []):
+            device = node["id"]
+            _add(tokens, device, device)
+            for field, value in node.items():
+                if field != "id" and value is not None and not isinstance(value, (dict, list)):
+                    _add(tokens, f"{field}:{value}", device)
+    for key in CONFIG_KEYS:
+        for entry in topology.get(key) or []:
+            device = entry.get("name")
+            if device is None:
+                continue
+            _add(tokens, device, device)
+            for field, value in entry.items():
+                if field == "name" or value is None or isinstance(value, (dict, list)):
+                    continue
+                _add(tokens, value, device)
+                _add(tokens, f"{field}:{value}", device)
+    return tokens
+
+
+class TopologyIndex:
+    """
+    Inverted index over the topology history: token -> {topology id: devices}.
+    Topologies are added, replaced and removed one at a time, so it can be
+    kept in step with a TopologyStore instead of being rebuilt. Lookups use
+    a sorted token list, so every query term also matches as a prefix; it
+    is patched as tokens come and go rather than re-sorted.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self._topology_tokens = {}
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._topology_tokens)
+
+    def __contains__(self, topology_id):
+        return topology_id in self._topology_tokens
+
+    def add(self, topology_id, tokens):
+        """Index the result of topology_tokens(), replacing anything indexed for the id before."""
+        self.remove(topology_id)
+        new_tokens = []
+        for token, devices in tokens.items():
+            entries = self.postings.get(token)
+            if entries is None:
+                entries = self.postings[token] = {}
+                new_tokens.append(token)
+            entries[topology_id] = devices
+        self._topology_tokens[topology_id] = list(tokens)
+        if len(new_tokens) <= SORTED_PATCH_LIMIT:
+            for token in new_tokens:
+                bisect.insort(self._sorted, token)
+        else:
+            self._sorted = list(heapq.merge(self._sorted, sorted(new_tokens)))
+
+    def remove(self, topology_id):
+        gone = []
+        for token in self._topology_tokens.pop(topology_id, []):
+            entries = self.postings.get(token)
+            if entries is None:
+                continue
+            entries.pop(topology_id, None)
+            if not entries:
+                del self.postings[token]
+                gone.append(token)
+        if len(gone) <= SORTED_PATCH_LIMIT:
+            for token in gone:
+                del self._sorted[bisect.bisect_left(self._sorted, token)]
+        else:
+            gone = set(gone)
+            self._sorted = [token for token in self._sorted if token not in gone]
+
+    def clear(self):
+        self.postings = {}
+        self._topology_tokens = {}
+        self._sorted = []
+
+    def _matching_tokens(self, term):
+        start = bisect.bisect_left(self._sorted, term)
+        matches = []
+        for token in self._sorted[start:start + MAX_PREFIX_TOKENS]:
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def _term_hits(self, term):
+        """{(topology id, device): exact} for one query term."""
+        hits = {}
+        for token in self._matching_tokens(term):
+            exact = token == term or token.endswith(":" + term)
+            for topology_id, devices in self.postings[token].items():
+                for device in devices:
+                    key = (topology_id, device)
+                    hits[key] = hits.get(key, False) or exact
+        return hits
+
+    def search(self, query, limit=200):
+        """
+        Return (topology id, device) pairs matching every whitespace
+        separated term of `query`, exact token matches first.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return []
+        results = None
+        for term in terms:
+            hits = self._term_hits(term)
+            if results is None:
+                results = hits
+            else:
+                results = {key: exact and hits[key] for key, exact in results.items() if key in hits}
+            if not results:
+                return []
+        ranked = sorted(results.items(), key=lambda item: (not item[1], str(item[0][0]), str(item[0][1])))
+        return [key for key, _ in ranked[:limit]]
@@ -0,0 +1,166 @@
+import asyncio
+import atexit
+import gzip
+import json
+import time
+
+# Frame fields whose values never reach the recording file.
+REDACTED_FIELDS = ("password", "new_password", "old_password", "token", "secret")
+REDACTED = "***"
+
+
+def redact(frame):
+    """Return `frame` with the values of REDACTED_FIELDS masked, at any depth."""
+    if not any(f'"{field}"' in frame for field in REDACTED_FIELDS):
+        return frame
+    try:
+        data = json.loads(frame)
+    except ValueError:
+        return frame
+    return json.dumps(_redacted(data))
+
+
+def _redacted(value):
+    if isinstance(value, dict):
+        return {key: REDACTED if key in REDACTED_FIELDS else _redacted(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redacted(item) for item in value]
+    return value
+
+
+class SessionRecorder:
+    """
+    Records every frame a WebSocketDispatcher sends or receives, with its
+    offset in seconds from the start of the session, to a gzip-compressed
+    JSON-lines file that ReplayWebSocket can play back later. Passwords and
+    similar fields are masked before they are written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._start = time.monotonic()
+        # The app never closes its dispatcher explicitly, so make sure the file is finished.
+        atexit.register(self.close)
+
+    def record(self, direction, frame):
+        if self._file is None:
+            return
+        if isinstance(frame, bytes):
+            frame = frame.decode("utf-8", errors="replace")
+        entry = {"t": round(time.monotonic() - self._start, 6), "dir": direction, "frame": redact(frame)}
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            print(f"[SessionRecorder] Session written to {self.path}")
+
+
+def load_session(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _request_id(frame):
+    if '"request_id"' not in frame:
+        return None
+    try:
+        data = json.loads(frame)
+    except ValueError:
+        return None
+    return data.get("request_id") if isinstance(data, dict) else None
+
+
+class ReplayWebSocket:
+    """
+    A stand-in for a websockets connection that plays back the server side
+    of a recorded session. A recorded reply is only released once the
+    client has sent as many frames as had been sent before it in the
+    recording, and then after the delay it originally had from the last of
+    those sends, divided by `speed`. Use speed=None to skip all delays.
+    Once every reply is played the connection stays open until close().
+    Replies echoing a recorded "request_id" get the id the client used
+    for the corresponding send this time.
+    """
+
+    def __init__(self, path, speed=1.0):
+        records = load_session(path)
+        self.sent = [r for r in records if r["dir"] == "send"]
+        # Recorded request_id -> index of the send that carried it.
+        self._recorded_ids = {}
+        for index, record in enumerate(self.sent):
+            request_id = _request_id(record["frame"])
+            if request_id is not None:
+                self._recorded_ids[request_id] = index
+        self._live_ids = []
+        self.received = []
+        sends_before = 0
+        last_send_t = 0.0
+        for record in records:
+            if record["dir"] == "send":
+                sends_before += 1
+                last_send_t = record["t"]
+            else:
+                # (record, sends that must have happened first, recorded time of the last one)
+                self.received.append((record, sends_before, last_send_t))
+        self.speed = speed
+        self._recv_index = 0
+        self._opened_wall = time.monotonic()
+        self._send_walls = []
+        self._sent_event = asyncio.Event()
+        self._closed_event = asyncio.Event()
+        self.closed = False
+        print(f"[ReplayWebSocket] Loaded {len(self.sent)} requests and {len(self.received)} replies from {path}")
+
+    async def send(self, message):
+        if self.closed:
+            raise EOFError("Replay closed.")
+        self._send_walls.append(time.monotonic())
+        self._live_ids.append(_request_id(message))
+        self._sent_event.set()
+
+    async def _wait(self, event):
+        # Returns False if the connection was closed first.
+        closed = asyncio.ensure_future(self._closed_event.wait())
+        waiting = asyncio.ensure_future(event.wait())
+        try:
+            await asyncio.wait({closed, waiting}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closed.cancel()
+            waiting.cancel()
+        return not self.closed
+
+    async def recv(self):
+        if self._recv_index >= len(self.received):
+            # Like a live server that has nothing more to say: block until closed.
+            await self._closed_event.wait()
+        if self.closed:
+            raise EOFError("Replay finished.")
+        record, sends_before, anchor_t = self.received[self._recv_index]
+        while len(self._send_walls) < sends_before:
+            self._sent_event.clear()
+            if not await self._wait(self._sent_event):
+                raise EOFError("Replay finished.")
+        self._recv_index += 1
+        if self.speed:
+            anchor_wall = self._send_walls[sends_before - 1] if sends_before else self._opened_wall
+            delay = (record["t"] - anchor_t) / self.speed - (time.monotonic() - anchor_wall)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return self._with_live_id(record["frame"])
+
+    def _with_live_id(self, frame):
+        if '"request_id"' not in frame:
+            return frame
+        data = json.loads(frame)
+        index = self._recorded_ids.get(data.get("request_id"))
+        if index is None or index >= len(self._live_ids) or self._live_ids[index] is None:
+            return frame
+        data["request_id"] = self._live_ids[index]
+        return json.dumps(data)
+
+    async def close(self):
+        self.closed = True
+        self._closed_event.set()
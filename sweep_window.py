@@ -0,0 +1,171 @@
+import asyncio
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
+    QPushButton, QSpinBox, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtGui import QFont
+
+from parameter_sweep import MAX_SWEEP_COMBINATIONS, SWEEP_FIELDS, expand_sweep, run_sweep
+from topology_params import DEFAULTS, parse_range
+
+FIELD_LABELS = {
+    "num_routers": "Routers:",
+    "num_mls": "MultiLayer Switches:",
+    "num_switches": "Switches:",
+    "num_computers": "Computers:",
+    "vlan_count": "VLAN Count (-1 for auto):",
+    "mode": "Mode (0: Fault-tolerant, 1: Scalable):",
+}
+COLUMNS = (
+    "Routers", "MLS", "Switches", "Computers", "VLAN Count", "Mode",
+    "Access Nodes", "Access Links", "Top Nodes", "Top Links", "VLANs",
+    "SPOFs", "Bridges", "Min Uplinks", "Time (s)", "Result",
+)
+
+
+def _item(value):
+    item = QTableWidgetItem()
+    # Numbers go in as data so the columns sort numerically.
+    item.setData(Qt.DisplayRole, value if value is not None else "")
+    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+    return item
+
+
+class SweepWindow(QWidget):
+    """
+    Generates one topology per combination of the given parameter ranges
+    and collects the results into a single comparison table instead of
+    opening windows for each of them.
+    """
+
+    def __init__(self, dispatcher, base=None, parent=None):
+        super().__init__(parent)
+        self.dispatcher = dispatcher
+        # Single-valued form fields (topology name, IP base) shared by every combination.
+        self.base = base or {}
+        self.task = None
+        self.done = 0
+        self.total = 0
+        self.setWindowTitle("Parameter Sweep")
+        self.resize(1100, 700)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+
+        form = QGridLayout()
+        self.range_fields = {}
+        for row, field in enumerate(SWEEP_FIELDS):
+            label = QLabel(FIELD_LABELS[field])
+            label.setFont(QFont("Segoe UI", 12))
+            edit = QLineEdit()
+            edit.setFont(QFont("Segoe UI", 12))
+            edit.setPlaceholderText(f"e.g. 2-6, 2,4,8 or 10-50:10 (default: {DEFAULTS[field]})")
+            self.range_fields[field] = edit
+            form.addWidget(label, row, 0)
+            form.addWidget(edit, row, 1)
+        concurrency_label = QLabel("Concurrent requests:")
+        concurrency_label.setFont(QFont("Segoe UI", 12))
+        self.concurrency = QSpinBox()
+        self.concurrency.setRange(1, 16)
+        self.concurrency.setValue(4)
+        form.addWidget(concurrency_label, len(SWEEP_FIELDS), 0)
+        form.addWidget(self.concurrency, len(SWEEP_FIELDS), 1)
+        layout.addLayout(form)
+
+        buttons = QHBoxLayout()
+        self.run_button = QPushButton("Run Sweep")
+        self.run_button.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        self.run_button.clicked.connect(self.start_sweep)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFont(QFont("Segoe UI", 14))
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_sweep)
+        buttons.addWidget(self.run_button)
+        buttons.addWidget(self.cancel_button)
+        layout.addLayout(buttons)
+
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def start_sweep(self):
+        try:
+            ranges = {
+                field: parse_range(edit.text(), DEFAULTS[field])
+                for field, edit in self.range_fields.items()
+            }
+        except ValueError as e:
+            self.status_label.setText(f"Error: invalid range ({e}).")
+            return
+        combinations, rejected = expand_sweep(ranges, self.base)
+        if not combinations:
+            reason = rejected[0][1] if rejected else "nothing to run"
+            self.status_label.setText(f"Error: no valid combinations ({reason})")
+            return
+        if len(combinations) > MAX_SWEEP_COMBINATIONS:
+            self.status_label.setText(
+                f"Error: {len(combinations)} combinations; narrow the ranges to at most {MAX_SWEEP_COMBINATIONS}."
+            )
+            return
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(combinations))
+        for row, params in enumerate(combinations):
+            for column, field in enumerate(SWEEP_FIELDS):
+                self.table.setItem(row, column, _item(params[field]))
+            self.table.setItem(row, len(COLUMNS) - 1, _item("pending"))
+        self.done = 0
+        self.total = len(combinations)
+        self.status_label.setText(
+            f"Running {self.total} combinations ({len(rejected)} skipped by validation)..."
+        )
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.task = asyncio.ensure_future(
+            run_sweep(self.dispatcher, combinations, self.concurrency.value(), on_result=self.on_result)
+        )
+        self.task.add_done_callback(self.on_sweep_finished)
+
+    def on_result(self, row, result):
+        values = [result.access_nodes, result.access_links, result.top_nodes, result.top_links, result.vlans]
+        report = result.redundancy
+        if report is not None:
+            uplinks = [node_k for node_k, _ in report.layer_connectivity.values()]
+            values += [len(report.articulation_points), len(report.bridges), min(uplinks) if uplinks else None]
+        else:
+            values += [None, None, None]
+        values.append(round(result.elapsed, 2))
+        values.append(f"Error: {result.error}" if result.error else f"Topology ID: {result.topology_id}")
+        for offset, value in enumerate(values):
+            self.table.setItem(row, len(SWEEP_FIELDS) + offset, _item(value))
+        self.done += 1
+        self.status_label.setText(f"{self.done}/{self.total} combinations finished.")
+
+    def on_sweep_finished(self, task):
+        self.task = None
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.table.setSortingEnabled(True)
+        if task.cancelled():
+            self.status_label.setText(f"Sweep cancelled after {self.done}/{self.total} combinations.")
+        elif task.exception() is not None:
+            self.status_label.setText(f"Sweep failed: {task.exception()}")
+        else:
+            self.status_label.setText(f"Sweep finished: {self.total} combinations.")
+
+    def cancel_sweep(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    def closeEvent(self, event):
+        self.cancel_sweep()
+        super().closeEvent(event)
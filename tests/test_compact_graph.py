@@ -0,0 +1,91 @@
+import pytest
+
+pytest.importorskip("numpy")
+nx = pytest.importorskip("networkx")
+
+from networkx.readwrite import json_graph
+
+from compact_graph import NO_VLAN, CompactGraph, as_networkx, load_graph, split_by_vlan
+
+
+def payload():
+    graph = nx.Graph()
+    graph.add_node("Router_1", layer="Core")
+    graph.add_node("Switch_1", layer="Access", vlan=1)
+    graph.add_node("Switch_2", layer="Access", vlan=2)
+    graph.add_node("Computer_1", vlan=1)
+    graph.add_node("Computer_2", vlan=1)
+    graph.add_node("Computer_3", vlan=2)
+    graph.add_edges_from([
+        ("Router_1", "Switch_1"), ("Router_1", "Switch_2"),
+        ("Switch_1", "Computer_1"), ("Switch_1", "Computer_2"), ("Switch_2", "Computer_3"),
+    ])
+    return graph, json_graph.node_link_data(graph)
+
+
+def edge_set(edges):
+    return {frozenset(edge) for edge in edges}
+
+
+def test_matches_networkx_on_nodes_edges_and_attributes():
+    graph, data = payload()
+    compact = CompactGraph.from_node_link(data)
+    assert len(compact) == 6 and "Switch_2" in compact and "Switch_9" not in compact
+    assert compact.number_of_edges() == graph.number_of_edges()
+    assert edge_set(compact.edges()) == edge_set(graph.edges())
+    assert dict(compact.nodes(data="vlan", default="Default")) == dict(graph.nodes(data="vlan", default="Default"))
+    assert dict(compact.nodes(data=True)) == dict(graph.nodes(data=True))
+    assert sorted(compact.neighbors("Router_1")) == ["Switch_1", "Switch_2"]
+    assert compact.degree("Switch_1") == 3
+
+
+def test_subgraph_keeps_only_internal_edges():
+    _, data = payload()
+    sub = CompactGraph.from_node_link(data).subgraph(["Switch_1", "Computer_1", "Router_1", "Unknown"])
+    assert sorted(sub.nodes()) == ["Computer_1", "Router_1", "Switch_1"]
+    assert edge_set(sub.edges()) == edge_set([("Router_1", "Switch_1"), ("Switch_1", "Computer_1")])
+
+
+def test_split_by_vlan_matches_the_networkx_split():
+    graph, data = payload()
+    compact = CompactGraph.from_node_link(data)
+    compact_split = split_by_vlan(compact)
+    nx_split = split_by_vlan(graph)
+    assert set(compact_split) == set(nx_split) == {1, 2, NO_VLAN}
+    for vlan, subgraph in nx_split.items():
+        assert sorted(compact_split[vlan].nodes()) == sorted(subgraph.nodes())
+        assert edge_set(compact_split[vlan].edges()) == edge_set(subgraph.edges())
+    # The split is cached per graph.
+    assert split_by_vlan(compact) is compact_split
+
+
+def test_missing_vlan_does_not_merge_with_a_vlan_named_default():
+    graph, data = payload()
+    data["nodes"].append({"id": "Switch_9", "vlan": "Default"})
+    graph.add_node("Switch_9", vlan="Default")
+    for split in (split_by_vlan(CompactGraph.from_node_link(data)), split_by_vlan(graph)):
+        assert sorted(split["Default"].nodes()) == ["Switch_9"]
+        assert sorted(split[NO_VLAN].nodes()) == ["Router_1"]
+    assert str(NO_VLAN) == "Default"
+
+
+def test_self_loops_are_edges():
+    graph, data = payload()
+    data["edges"].append({"source": "Switch_1", "target": "Switch_1"})
+    graph.add_edge("Switch_1", "Switch_1")
+    compact = CompactGraph.from_node_link(data)
+    assert compact.number_of_edges() == graph.number_of_edges()
+    assert edge_set(compact.edges()) == edge_set(graph.edges())
+    assert ("Switch_1", "Switch_1") in compact.edges()
+    assert compact.degree("Switch_1") == graph.degree("Switch_1")
+    assert edge_set(split_by_vlan(compact)[1].edges()) == edge_set(split_by_vlan(graph)[1].edges())
+
+
+def test_load_graph_switches_representation_at_the_threshold():
+    graph, data = payload()
+    assert isinstance(load_graph(data, threshold=6), CompactGraph)
+    small = load_graph(data, threshold=7)
+    assert isinstance(small, nx.Graph)
+    converted = as_networkx(load_graph(data, threshold=6))
+    assert edge_set(converted.edges()) == edge_set(graph.edges())
+    assert dict(converted.nodes(data=True)) == dict(graph.nodes(data=True))
@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from config_validation import validate_configuration
+
+
+def device(name, ip, mask="255.255.255.0", vlan=None):
+    entry = {"name": name, "ip_address": ip, "subnet_mask": mask}
+    if vlan is not None:
+        entry["vlan"] = vlan
+    return entry
+
+
+def kinds(report):
+    return report.counts()
+
+
+def test_clean_configuration_has_no_issues():
+    access = [device("Switch_1", "192.168.1.2", vlan=1), device("Switch_2", "192.168.2.2", vlan=2)]
+    top = [device("Router_1", "192.168.255.1", mask="255.255.255.0")]
+    report = validate_configuration(access, top, ip_base="192.168.0.0")
+    assert report.ok
+    assert report.device_count == 3
+
+
+def test_subnet_shared_by_two_vlans_above_128():
+    access = [device("Switch_1", "192.168.1.2", vlan=1), device("Switch_2", "192.168.1.3", vlan=2)]
+    report = validate_configuration(access, [])
+    assert kinds(report) == {"vlan_subnet_mismatch": 1}
+    assert "192.168.1.0/24 is shared by VLANs 1, 2" in report.issues[0].message
+
+
+def test_vlan_spanning_two_subnets():
+    access = [device("Switch_1", "192.168.1.2", vlan=5), device("Switch_2", "192.168.2.2", vlan=5)]
+    report = validate_configuration(access, [])
+    assert kinds(report) == {"vlan_subnet_mismatch": 1}
+    assert sorted(report.issues[0].devices) == ["Switch_1", "Switch_2"]
+
+
+def test_duplicate_invalid_and_reserved_addresses():
+    access = [
+        device("Switch_1", "10.0.0.5"),
+        device("Switch_2", "10.0.0.5"),
+        device("Switch_3", "10.0.0.256"),
+        device("Switch_4", "10.0.0.0"),
+        device("Switch_5", "10.0.0.255"),
+        device("Switch_6", "10.0.0.7", mask="255.0.255.0"),
+    ]
+    counts = kinds(validate_configuration(access, []))
+    assert counts == {"duplicate_ip": 1, "invalid_address": 1, "reserved_address": 2, "invalid_mask": 1}
+
+
+def test_overlapping_subnets():
+    access = [device("Switch_1", "172.16.1.2", mask="255.255.0.0"), device("Switch_2", "172.16.1.3", mask="/24")]
+    report = validate_configuration(access, [])
+    assert kinds(report) == {"subnet_overlap": 1}
+
+
+def test_out_of_range_with_explicit_prefix():
+    access = [device("Switch_1", "192.168.9.2"), device("Switch_2", "10.1.1.2")]
+    report = validate_configuration(access, [], ip_base="192.168.0.0/16")
+    assert kinds(report) == {"out_of_range": 1}
+    assert report.issues[0].devices == ["Switch_2"]
+    assert kinds(validate_configuration(access, [], ip_base="192.168.0.0", base_prefix=16)) == {"out_of_range": 1}
+
+
+def test_out_of_range_with_bare_base_address():
+    # The app passes the form's bare ip_base; /24 subnets put the block at 192.168.0.0/16.
+    access = [device("Switch_1", "192.168.1.2", vlan=1), device("Switch_2", "192.168.2.2", vlan=2),
+              device("Switch_3", "10.1.1.2", vlan=3)]
+    top = [device("Router_1", "192.168.255.1")]
+    report = validate_configuration(access, top, ip_base="192.168.0.0")
+    assert kinds(report) == {"out_of_range": 1}
+    assert report.issues[0].devices == ["Switch_3"]
+    assert "outside 192.168.0.0/16" in report.issues[0].message
+    # /16 subnets (<base>.<vlan>.x.y) size the block as a /8.
+    wide = [device("Switch_1", "10.1.0.2", mask="255.255.0.0"), device("Switch_2", "10.200.0.2", mask="255.255.0.0")]
+    assert validate_configuration(wide, [], ip_base="10.0.0.0").ok
+
+
+def test_interface_addresses_are_checked():
+    router = {"name": "Router_1", "interfaces": [
+        {"name": "Gi0/0", "ip_address": "192.168.50.1", "subnet_mask": "255.255.255.0"},
+        {"name": "Gi0/1", "ip_address": "192.168.50.1", "subnet_mask": "255.255.255.0"},
+    ]}
+    report = validate_configuration([], [router])
+    assert kinds(report) == {"duplicate_ip": 1}
+    assert report.issues[0].devices == ["Router_1/Gi0/0", "Router_1/Gi0/1"]
@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+from dispatcher import WebSocketDispatcher
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def recv(self):
+        return await self.incoming.get()
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def reply(self, data):
+        self.incoming.put_nowait(json.dumps(data))
+
+
+def run(scenario):
+    async def main():
+        websocket = FakeWebSocket()
+        dispatcher = WebSocketDispatcher(websocket)
+        try:
+            return await scenario(dispatcher, websocket)
+        finally:
+            await dispatcher.close()
+    return asyncio.run(main())
+
+
+def test_replies_are_matched_by_echoed_request_id():
+    async def scenario(dispatcher, websocket):
+        first = asyncio.ensure_future(dispatcher.send_and_wait({"action": "a"}))
+        second = asyncio.ensure_future(dispatcher.send_and_wait({"action": "b"}))
+        await asyncio.sleep(0)
+        ids = [request["request_id"] for request in websocket.sent]
+        websocket.reply({"answer": "b", "request_id": ids[1]})
+        websocket.reply({"answer": "a", "request_id": ids[0]})
+        return await first, await second
+
+    first, second = run(scenario)
+    assert first["answer"] == "a"
+    assert second["answer"] == "b"
+
+
+def test_late_reply_without_id_is_not_given_to_the_next_request():
+    async def scenario(dispatcher, websocket):
+        # The server has shown it echoes ids, so an id-less reply is a late one.
+        first = asyncio.ensure_future(dispatcher.send_and_wait({"action": "first"}))
+        await asyncio.sleep(0)
+        websocket.reply({"answer": "first", "request_id": websocket.sent[0]["request_id"]})
+        await first
+        try:
+            await dispatcher.send_and_wait({"action": "slow"}, timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        pending = asyncio.ensure_future(dispatcher.send_and_wait({"action": "next"}))
+        await asyncio.sleep(0)
+        websocket.reply({"error": "slow failed"})
+        websocket.reply({"answer": "next", "request_id": websocket.sent[2]["request_id"]})
+        return await pending, dispatcher.counters()
+
+    reply, counters = run(scenario)
+    assert reply["answer"] == "next"
+    assert counters["stale"] == 1
+
+
+def test_server_without_ids_that_drops_a_reply_keeps_answering_later_requests():
+    async def scenario(dispatcher, websocket):
+        try:
+            await dispatcher.send_and_wait({"action": "login"}, timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        replies = []
+        for action in ("get_history", "get_topology", "save"):
+            pending = asyncio.ensure_future(dispatcher.send_and_wait({"action": action}, timeout=1))
+            await asyncio.sleep(0)
+            websocket.reply({"answer": action})
+            replies.append(await pending)
+        return replies, dispatcher.counters()
+
+    replies, counters = run(scenario)
+    assert [reply["answer"] for reply in replies] == ["get_history", "get_topology", "save"]
+    assert counters["stale"] == 0
+
+
+def test_late_reply_with_id_is_discarded():
+    async def scenario(dispatcher, websocket):
+        unsolicited = []
+        dispatcher.subscribe("unsolicited", lambda topic, data: unsolicited.append(data))
+        try:
+            await dispatcher.send_and_wait({"action": "slow"}, timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        websocket.reply({"answer": "slow", "request_id": websocket.sent[0]["request_id"]})
+        websocket.reply({"message": "stray"})
+        await asyncio.sleep(0.05)
+        return unsolicited, dispatcher.counters()
+
+    unsolicited, counters = run(scenario)
+    assert unsolicited == [{"message": "stray"}]
+    assert counters["stale"] == 1
+
+
+def test_subscribe_history_is_acknowledged_by_event():
+    async def scenario(dispatcher, websocket):
+        events = []
+        subscribing = asyncio.ensure_future(dispatcher.subscribe_history(lambda topic, data: events.append(topic)))
+        await asyncio.sleep(0)
+        websocket.reply({"event": "history_subscribed"})
+        subscribed = await subscribing
+        websocket.reply({"event": "topology_added", "topology": {"id": 1}})
+        await asyncio.sleep(0.05)
+        return subscribed, events, dispatcher.counters()
+
+    subscribed, events, counters = run(scenario)
+    assert subscribed
+    assert events == ["topology_added"]
+    assert counters["dropped"] == 0
+
+
+def test_refused_history_subscription_does_not_answer_other_requests():
+    async def scenario(dispatcher, websocket):
+        subscribing = asyncio.ensure_future(dispatcher.subscribe_history(lambda topic, data: None))
+        await asyncio.sleep(0)
+        history = asyncio.ensure_future(dispatcher.send_and_wait({"action": "get_history"}))
+        await asyncio.sleep(0)
+        websocket.reply({"error": "Unknown action: subscribe_history"})
+        websocket.reply({"graphs": []})
+        return await subscribing, await history, dispatcher._subscribers
+
+    subscribed, history, subscribers = run(scenario)
+    assert subscribed is False
+    assert history == {"graphs": []}
+    assert not subscribers
+
+
+def test_ignored_history_subscription_does_not_take_other_replies():
+    async def scenario(dispatcher, websocket):
+        # No request ids and no answer at all to subscribe_history.
+        subscribing = asyncio.ensure_future(dispatcher.subscribe_history(lambda topic, data: None, timeout=0.2))
+        await asyncio.sleep(0)
+        history = asyncio.ensure_future(dispatcher.send_and_wait({"action": "get_history"}, timeout=0.1))
+        await asyncio.sleep(0)
+        websocket.reply({"graphs": []})
+        reply = await history
+        return reply, subscribing.done(), await asyncio.gather(subscribing, return_exceptions=True)
+
+    reply, subscribed_early, (subscribed,) = run(scenario)
+    assert reply == {"graphs": []}
+    assert not subscribed_early
+    assert isinstance(subscribed, asyncio.TimeoutError)
+
+
+def test_cancelled_history_subscription_removes_its_handler():
+    async def scenario(dispatcher, websocket):
+        subscribing = asyncio.ensure_future(dispatcher.subscribe_history(lambda topic, data: None))
+        await asyncio.sleep(0)
+        subscribing.cancel()
+        await asyncio.gather(subscribing, return_exceptions=True)
+        return dict(dispatcher._subscribers)
+
+    assert run(scenario) == {}
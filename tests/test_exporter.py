@@ -0,0 +1,89 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from exporter import ExportCancelled, export_topologies, export_work, graphml_lines, node_link_chunks
+
+
+def topology(topology_id, names):
+    return {
+        "id": topology_id,
+        "access_configuration": [{"name": name, "ip_address": "10.0.0.1"} for name in names],
+        "top_layer_configurations": [],
+        "access_graph": {"nodes": [{"id": "Switch_1", "vlan": 1}], "links": []},
+        "top_graph": {"nodes": [{"id": "Router_1", "layer": "Core"}, {"id": "Switch_1"}],
+                      "links": [{"source": "Router_1", "target": "Switch_1"}]},
+    }
+
+
+def test_colliding_and_missing_names_get_a_counter(tmp_path):
+    topologies = [topology(1, ["Switch 1", "Switch/1", "switch_1", None, None])]
+    files = export_topologies(topologies, str(tmp_path / "out"), include_graphs=False)
+    assert files == 5
+    assert sorted(os.listdir(tmp_path / "out" / "topology_1" / "configs")) == [
+        "Switch_1.json", "Switch_1_2.json", "switch_1_3.json", "unnamed.json", "unnamed_2.json",
+    ]
+
+
+def test_zip_export_contains_configs_and_both_graph_formats(tmp_path):
+    destination = str(tmp_path / "history.zip")
+    topologies = [topology(1, ["Switch_1"]), topology(2, ["Switch_1"])]
+    files = export_topologies(topologies, destination)
+    assert files == export_work(topologies) == 10
+    with zipfile.ZipFile(destination) as archive:
+        names = archive.namelist()
+        graph = json.loads(archive.read("topology_2/graphs/top_graph.json"))
+    assert "topology_1/configs/Switch_1.json" in names
+    assert "topology_1/graphs/access_graph.graphml" in names
+    assert graph["links"] == [{"source": "Router_1", "target": "Switch_1"}]
+
+
+@pytest.mark.parametrize("name", ["out", "out.zip"])
+def test_cancelled_export_leaves_nothing_behind(tmp_path, name):
+    (tmp_path / "keep.txt").write_text("user file")
+    polls = []
+
+    def cancelled():
+        polls.append(1)
+        return len(polls) > 3
+
+    with pytest.raises(ExportCancelled):
+        export_topologies([topology(1, ["a", "b"]), topology(2, ["c"])], str(tmp_path / name),
+                          cancelled=cancelled)
+    assert os.listdir(tmp_path) == ["keep.txt"]
+
+
+def test_failed_export_into_existing_folder_keeps_its_files(tmp_path):
+    (tmp_path / "notes.txt").write_text("user file")
+    broken = topology(1, ["a"])
+    broken["top_graph"] = {"nodes": [{"id": "Router_1"}], "links": [{"source": "Router_1"}]}
+    with pytest.raises(KeyError):
+        export_topologies([broken], str(tmp_path))
+    assert os.listdir(tmp_path) == ["notes.txt"]
+
+
+def test_streamed_graph_formats_are_well_formed():
+    data = topology(1, [])["top_graph"]
+    assert json.loads("".join(node_link_chunks(data, batch=1))) == data
+    graphml = "\n".join(graphml_lines(data))
+    assert '<node id="Router_1">' in graphml
+    assert '<edge source="Router_1" target="Switch_1" />' in graphml
+
+
+def test_graphml_keeps_link_and_graph_attributes():
+    nx = pytest.importorskip("networkx")
+    data = {
+        "directed": False,
+        "graph": {"name": "Top Graph", "revision": 3},
+        "nodes": [{"id": "Router_1", "layer": "Core"}, {"id": "Switch_1", "vlan": None}],
+        "edges": [{"source": "Router_1", "target": "Switch_1", "bandwidth": 1000, "trunk": True, "cost": 1.5}],
+    }
+    graphml = "\n".join(graphml_lines(data))
+    assert '<key id="d0" for="graph" attr.name="name" attr.type="string" />' in graphml
+    assert 'for="edge" attr.name="trunk" attr.type="boolean"' in graphml
+    graph = nx.parse_graphml(graphml)
+    assert graph.graph["name"] == "Top Graph" and graph.graph["revision"] == 3
+    assert dict(graph.nodes(data=True)) == {"Router_1": {"layer": "Core"}, "Switch_1": {}}
+    assert graph.edges["Router_1", "Switch_1"] == {"bandwidth": 1000, "trunk": True, "cost": 1.5}
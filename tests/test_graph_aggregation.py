@@ -0,0 +1,78 @@
+import gc
+import weakref
+
+import pytest
+
+pytest.importorskip("networkx")
+
+import networkx as nx
+
+import graph_aggregation
+from graph_aggregation import NodeGroup, aggregate
+
+
+def access_graph():
+    graph = nx.Graph()
+    graph.add_node("Router_1", vlan=None)
+    for switch, vlan in (("Switch_1", 1), ("Switch_2", 1), ("Switch_3", 2)):
+        graph.add_node(switch, vlan=vlan)
+        graph.add_edge("Router_1", switch)
+    for i, switch in enumerate(("Switch_1", "Switch_1", "Switch_2", "Switch_3"), start=1):
+        graph.add_node(f"Computer_{i}", vlan=graph.nodes[switch]["vlan"])
+        graph.add_edge(switch, f"Computer_{i}")
+    # Multi-homed: stays on its own.
+    graph.add_node("Computer_5", vlan=1)
+    graph.add_edges_from([("Switch_1", "Computer_5"), ("Switch_2", "Computer_5")])
+    return graph
+
+
+def test_switches_absorb_their_single_homed_computers():
+    aggregation = aggregate(access_graph(), by="switches")
+    members = {key: sorted(group.members) for key, group in aggregation.groups.items()}
+    assert members == {
+        "Switch_1": ["Computer_1", "Computer_2", "Switch_1"],
+        "Switch_2": ["Computer_3", "Switch_2"],
+        "Switch_3": ["Computer_4", "Switch_3"],
+        "Router_1": ["Router_1"],
+        "Computer_5": ["Computer_5"],
+    }
+    assert aggregation.groups["Switch_1"].label == "Switch_1 +2"
+    assert ("Router_1", "Switch_1") in aggregation.edges
+    assert ("Computer_5", "Switch_2") in aggregation.edges
+    assert all(u != v for u, v in aggregation.edges)
+
+
+def test_vlans_expand_into_their_switch_groups():
+    aggregation = aggregate(access_graph(), by="vlans")
+    assert set(aggregation.groups) == {"VLAN 1", "VLAN 2", "VLAN None"}
+    vlan_1 = aggregation.groups["VLAN 1"]
+    assert vlan_1.size == 6
+    assert vlan_1.label == "VLAN 1\n6 devices"
+    assert sorted(child.key for child in vlan_1.children) == ["Computer_5", "Switch_1", "Switch_2"]
+    assert ("VLAN 1", "VLAN None") in aggregation.edges
+
+
+def test_positions_cover_every_group_and_are_computed_once():
+    aggregation = aggregate(access_graph(), by="vlans")
+    positions = aggregation.positions()
+    assert set(positions) == set(aggregation.groups)
+    assert aggregation.positions() is positions
+
+
+def test_group_without_children_expands_into_members():
+    group = NodeGroup("Switch_1", "Switch_1 +1", ["Switch_1", "Computer_1"])
+    assert group.children == []
+    assert group.size == 2
+
+
+def test_aggregations_are_cached_per_graph_until_it_is_freed():
+    graph = access_graph()
+    first = aggregate(graph, by="switches")
+    assert aggregate(graph, by="switches") is first
+    assert aggregate(graph, by="vlans") is not first
+    assert graph in graph_aggregation._cache
+    # The cache does not keep the graph alive.
+    graph_ref = weakref.ref(graph)
+    del graph, first
+    gc.collect()
+    assert graph_ref() is None
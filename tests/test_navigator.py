@@ -0,0 +1,103 @@
+import sys
+import types
+
+import pytest
+
+import navigator
+from navigator import WindowNavigator
+
+
+class FakeWindow:
+    def __init__(self, dispatcher, nav):
+        self.visible = False
+        self.torn_down = False
+        self.graphs = 0
+
+    def show(self):
+        self.visible = True
+
+    def hide(self):
+        self.visible = False
+
+    def raise_(self):
+        pass
+
+    def activateWindow(self):
+        pass
+
+    def close(self):
+        self.visible = False
+
+    def deleteLater(self):
+        pass
+
+    def teardown(self):
+        self.torn_down = True
+
+    def open_windows(self):
+        return self.graphs
+
+
+@pytest.fixture
+def nav(monkeypatch):
+    module = types.ModuleType("fake_windows")
+    module.FakeWindow = FakeWindow
+    monkeypatch.setitem(sys.modules, "fake_windows", module)
+    monkeypatch.setattr(navigator, "WINDOW_CLASSES", {key: ("fake_windows", "FakeWindow") for key in "abcd"})
+    return WindowNavigator(dispatcher=None)
+
+
+def test_windows_are_reused_while_the_pool_has_room(nav):
+    first = nav.open("a")
+    nav.open("b")
+    nav.open("c")
+    assert nav.open("a") is first
+    assert list(nav.windows) == ["b", "c", "a"]
+    assert not first.torn_down
+
+
+def test_least_recently_used_window_is_evicted(nav):
+    a = nav.open("a")
+    nav.open("b")
+    nav.open("c")
+    nav.open("d")
+    assert a.torn_down
+    assert list(nav.windows) == ["b", "c", "d"]
+
+
+def test_open_graph_windows_count_against_the_pool(nav):
+    a = nav.open("a")
+    b = nav.open("b")
+    b.graphs = 1
+    c = nav.open("c")
+    assert a.torn_down
+    assert not b.torn_down
+    assert nav.pool_size() == 3
+    # The current window is never evicted, even if it alone fills the pool.
+    c.graphs = 5
+    nav.open("c")
+    assert not c.torn_down
+
+
+def test_windows_with_open_graphs_are_not_evicted(nav):
+    a = nav.open("a")
+    a.graphs = 2
+    b = nav.open("b")
+    c = nav.open("c")
+    nav.open("d")
+    # Over the pool, but only windows without open graphs are given up.
+    assert not a.torn_down
+    assert b.torn_down and c.torn_down
+    assert list(nav.windows) == ["a", "d"]
+    a.graphs = 0
+    nav.open("b")
+    nav.open("c")
+    assert a.torn_down
+
+
+def test_close_all_tears_down_every_window(nav):
+    windows = [nav.open(key) for key in "abc"]
+    windows[0].graphs = 1
+    nav.close_all()
+    assert all(window.torn_down for window in windows)
+    assert not nav.windows and nav.current is None
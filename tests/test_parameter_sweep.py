@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("networkx")
+
+from benchmarks.synthetic import generate_topology
+from parameter_sweep import expand_sweep, reply_mismatch
+
+
+def combinations():
+    valid, _ = expand_sweep({"num_routers": [2, 3], "num_mls": [2]})
+    return valid
+
+
+def test_reply_matching_its_request_passes():
+    params = combinations()[1]
+    response = generate_topology(20, num_routers=params["num_routers"], num_mls=params["num_mls"])
+    assert reply_mismatch(params, response) is None
+
+
+def test_reply_for_another_combination_is_flagged():
+    first, second = combinations()
+    response = generate_topology(20, num_routers=first["num_routers"], num_mls=first["num_mls"])
+    assert reply_mismatch(second, response) == "reply has 2 routers, expected 3"
+
+
+def test_echoed_topology_name_is_compared_first():
+    first, second = combinations()
+    assert reply_mismatch(first, {"topology_name": first["topology_name"]}) is None
+    assert reply_mismatch(second, {"topology_name": first["topology_name"]}).startswith("reply is for")
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("networkx")
+
+import networkx as nx
+
+import redundancy
+from redundancy import analyze_redundancy
+
+
+def layered(edges, layers, vlans=None):
+    vlans = vlans or {}
+    return [(n, layer, vlans.get(n)) for n, layer in layers.items()], edges
+
+
+def test_ring_has_no_single_points_of_failure():
+    nodes, edges = layered([("A", "B"), ("B", "C"), ("C", "D"), ("D", "A")], {n: None for n in "ABCD"})
+    report = analyze_redundancy(nodes, edges)
+    assert report.redundant
+    assert report.articulation_points == [] and report.bridges == []
+
+
+def test_chain_reports_articulation_points_bridges_and_vlan_spofs():
+    nodes, edges = layered([("A", "B"), ("B", "C")], {n: None for n in "ABC"}, vlans={n: 1 for n in "ABC"})
+    report = analyze_redundancy(nodes, edges)
+    assert report.articulation_points == ["B"]
+    assert report.bridges == [("A", "B"), ("B", "C")]
+    assert report.vlan_spofs == {1: ["B"]}
+
+
+def test_single_homed_hosts_are_counted_not_reported():
+    nodes, edges = layered([("S1", "S2"), ("S2", "S3"), ("S3", "S1"), ("S1", "Computer_1"), ("S2", "Computer_2")],
+                           {"S1": None, "S2": None, "S3": None, "Computer_1": None, "Computer_2": None})
+    report = analyze_redundancy(nodes, edges)
+    assert report.redundant
+    assert report.single_homed == 2
+    assert report.node_count == 5
+
+
+def test_layer_connectivity_is_the_weakest_device():
+    layers = {"R1": "Core", "R2": "Core", "M1": "Distribution", "M2": "Distribution",
+              "S1": "Access", "S2": "Access"}
+    edges = [("R1", "M1"), ("R1", "M2"), ("R2", "M1"), ("R2", "M2"),
+             ("S1", "M1"), ("S1", "M2"), ("S2", "M1"), ("S2", "M2")]
+    report = analyze_redundancy(*layered(edges, layers))
+    assert report.layer_connectivity == {("Access", "Distribution"): (2, 2), ("Distribution", "Core"): (2, 2)}
+    # Single-homing one switch brings the Access layer down to one path.
+    report = analyze_redundancy(*layered(edges[:-1], layers))
+    assert report.layer_connectivity[("Access", "Distribution")] == (1, 1)
+
+
+def test_device_cut_off_from_the_upper_layer_has_no_paths():
+    layers = {"M1": "Distribution", "S1": "Access", "S2": "Access"}
+    report = analyze_redundancy(*layered([("S1", "M1")], layers))
+    assert report.layer_connectivity == {("Access", "Distribution"): (0, 0)}
+
+
+def test_report_is_cached_even_if_the_caller_gives_up(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+
+    def slow_analysis(nodes, edges):
+        release.wait(5)
+        return analyze_redundancy(nodes, edges)
+
+    monkeypatch.setattr(redundancy, "_pool", lambda: executor)
+    monkeypatch.setattr(redundancy, "_results", redundancy.OrderedDict())
+    monkeypatch.setattr(redundancy, "analyze_redundancy", slow_analysis)
+    graph = nx.cycle_graph(6)
+
+    async def main():
+        task = asyncio.ensure_future(redundancy.analyze(graph))
+        while not redundancy._pending:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        release.set()
+        while redundancy._pending:
+            await asyncio.sleep(0.01)
+        return task.cancelled(), await redundancy.analyze(graph)
+
+    cancelled, report = asyncio.run(main())
+    executor.shutdown()
+    assert cancelled
+    assert report.redundant
+    assert len(redundancy._results) == 1
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+
+from scene_builder import OffThread, ProgressiveSceneBuilder
+
+
+def steps(drawn, fail=False):
+    thread = yield OffThread(lambda: threading.current_thread().name)
+    drawn.append(thread)
+    for i in range(3):
+        drawn.append(i)
+        yield
+    if fail:
+        raise ValueError("bad layout")
+
+
+def test_off_thread_results_are_sent_back_into_the_steps():
+    drawn, finished = [], []
+
+    async def main():
+        builder = ProgressiveSceneBuilder(steps(drawn), on_finished=lambda: finished.append(True)).start()
+        await builder._task
+        return builder
+
+    builder = asyncio.run(main())
+    assert builder.finished and finished
+    assert drawn[0] != threading.current_thread().name
+    assert drawn[1:] == [0, 1, 2]
+
+
+@pytest.fixture
+def idle_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+def test_without_a_running_loop_everything_runs_in_place(idle_loop):
+    drawn = []
+    builder = ProgressiveSceneBuilder(steps(drawn)).start()
+    assert builder.finished
+    assert drawn == [threading.current_thread().name, 0, 1, 2]
+
+
+def test_errors_are_reported_instead_of_finishing():
+    errors, finished = [], []
+
+    async def main():
+        builder = ProgressiveSceneBuilder(steps([], fail=True), on_finished=lambda: finished.append(True),
+                                          on_error=errors.append).start()
+        await builder._task
+        return builder
+
+    builder = asyncio.run(main())
+    assert not finished
+    assert [str(e) for e in errors] == ["bad layout"]
+    assert isinstance(builder.error, ValueError)
+
+
+def test_errors_are_reported_without_a_running_loop(idle_loop):
+    errors = []
+    builder = ProgressiveSceneBuilder(steps([], fail=True), on_error=errors.append).start()
+    assert builder.finished
+    assert [str(e) for e in errors] == ["bad layout"]
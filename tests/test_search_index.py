@@ -0,0 +1,60 @@
+import random
+
+from search_index import SORTED_PATCH_LIMIT, TopologyIndex, topology_tokens
+
+
+def topology(topology_id, switches):
+    return {
+        "id": topology_id,
+        "top_graph": {"nodes": [{"id": "Router_1", "layer": "Core"}]},
+        "access_configuration": [
+            {"name": f"Switch_{n}", "ip_address": f"10.{topology_id}.0.{n}", "vlan": n % 3}
+            for n in switches
+        ],
+    }
+
+
+def indexed(*topologies):
+    index = TopologyIndex()
+    for topo in topologies:
+        index.add(topo["id"], topology_tokens(topo))
+    return index
+
+
+def test_tokens_are_indexed_bare_and_qualified():
+    tokens = topology_tokens(topology(4, [7]))
+    assert tokens["switch_7"] == {"Switch_7"}
+    assert tokens["10.4.0.7"] == {"Switch_7"}
+    assert tokens["ip_address:10.4.0.7"] == {"Switch_7"}
+    assert tokens["layer:core"] == {"Router_1"}
+
+
+def test_search_matches_prefixes_and_ranks_exact_hits_first():
+    index = indexed(topology(1, [1, 12]), topology(2, [1]))
+    assert index.search("switch_1") == [(1, "Switch_1"), (2, "Switch_1"), (1, "Switch_12")]
+    assert index.search("switch_1 10.2") == [(2, "Switch_1")]
+    assert index.search("nothing") == []
+
+
+def test_replacing_and_removing_topologies_updates_results():
+    index = indexed(topology(1, [1, 2]), topology(2, [2]))
+    index.add(1, topology_tokens(topology(1, [3])))
+    assert index.search("switch_2") == [(2, "Switch_2")]
+    index.remove(2)
+    assert index.search("switch_2") == []
+    assert index.search("switch_3") == [(1, "Switch_3")]
+    assert len(index) == 1 and 2 not in index
+
+
+def test_sorted_tokens_stay_in_step_with_postings():
+    rng = random.Random(0)
+    index = TopologyIndex()
+    for step in range(200):
+        topology_id = rng.randrange(20)
+        if rng.random() < 0.3:
+            index.remove(topology_id)
+        else:
+            # Small and large additions take the insort and the merge paths.
+            count = rng.choice([1, 5, SORTED_PATCH_LIMIT * 3])
+            index.add(topology_id, topology_tokens(topology(topology_id, rng.sample(range(500), count))))
+        assert index._sorted == sorted(index.postings)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+from dispatcher import WebSocketDispatcher
+from login_window import replay_speed
+from session_recorder import REDACTED, ReplayWebSocket, SessionRecorder, load_session
+
+
+def record_session(path, frames):
+    recorder = SessionRecorder(str(path))
+    for direction, data in frames:
+        recorder.record(direction, json.dumps(data))
+    recorder.close()
+
+
+def test_recorded_login_has_no_password(tmp_path):
+    path = tmp_path / "session.jsonl.gz"
+    record_session(path, [
+        ("send", {"action": "login", "username": "alice", "password": "hunter2", "request_id": 1}),
+        ("send", {"action": "change_password", "passwords": [{"old_password": "a", "new_password": "b"}]}),
+        ("recv", {"message": "Login successful.", "request_id": 1}),
+    ])
+    records = load_session(str(path))
+    login = json.loads(records[0]["frame"])
+    assert login == {"action": "login", "username": "alice", "password": REDACTED, "request_id": 1}
+    assert json.loads(records[1]["frame"])["passwords"] == [{"old_password": REDACTED, "new_password": REDACTED}]
+    assert "hunter2" not in "".join(record["frame"] for record in records)
+    assert json.loads(records[2]["frame"]) == {"message": "Login successful.", "request_id": 1}
+
+
+def test_replay_answers_each_request_with_its_recorded_reply(tmp_path):
+    path = tmp_path / "session.jsonl.gz"
+    record_session(path, [
+        ("send", {"action": "signup", "request_id": 7}),
+        ("recv", {"message": "Sign up successful.", "request_id": 7}),
+        ("send", {"action": "get_history", "request_id": 8}),
+        ("recv", {"event": "topology_added", "topology": {"id": 1}}),
+        ("recv", {"graphs": [], "request_id": 8}),
+    ])
+
+    async def main():
+        websocket = ReplayWebSocket(str(path), speed=None)
+        dispatcher = WebSocketDispatcher(websocket)
+        events = []
+        dispatcher.subscribe("topology_added", lambda topic, data: events.append(data))
+        try:
+            signup = await dispatcher.send_and_wait({"action": "signup"}, timeout=1)
+            history = await dispatcher.send_and_wait({"action": "get_history"}, timeout=1)
+            return signup, history, events, dispatcher.counters()
+        finally:
+            await dispatcher.close()
+            await websocket.close()
+
+    signup, history, events, counters = asyncio.run(main())
+    assert signup == {"message": "Sign up successful."}
+    assert history == {"graphs": []}
+    assert events == [{"event": "topology_added", "topology": {"id": 1}}]
+    assert counters["stale"] == 0
+
+
+def test_replay_holds_replies_until_their_request_is_sent(tmp_path):
+    path = tmp_path / "session.jsonl.gz"
+    record_session(path, [
+        ("send", {"action": "login"}),
+        ("recv", {"message": "Login successful."}),
+    ])
+
+    async def main():
+        websocket = ReplayWebSocket(str(path), speed=None)
+        receiving = asyncio.ensure_future(websocket.recv())
+        await asyncio.sleep(0.05)
+        held = not receiving.done()
+        await websocket.send(json.dumps({"action": "login"}))
+        reply = await asyncio.wait_for(receiving, 1)
+        await websocket.close()
+        return held, reply
+
+    held, reply = asyncio.run(main())
+    assert held
+    assert json.loads(reply) == {"message": "Login successful."}
+
+
+def test_replay_speed_falls_back_on_invalid_values():
+    assert replay_speed("2") == 2.0
+    assert replay_speed("0") is None
+    assert replay_speed("") is None
+    assert replay_speed("fast") == 1.0
@@ -0,0 +1,69 @@
+import asyncio
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtCore import QPointF, QRectF
+from PyQt5.QtGui import QPen
+from PyQt5.QtWidgets import QApplication
+
+import tile_cache
+from tile_cache import LiveScene, TileCache, TiledGraphicsView
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def sized_cache(width, height):
+    cache = TileCache()
+    cache.scene_rect = QRectF(0, 0, width, height)
+    return cache
+
+
+def test_level_size_follows_the_tile_grid():
+    cache = sized_cache(1000, 600)
+    assert cache.grid(1.0) == (4, 3)
+    assert cache.grid(0.125) == (1, 1)
+    assert cache.level_bytes(1.0) == 12 * 256 * 256 * 4
+
+
+def test_level_needed_is_the_coarsest_level_at_least_as_detailed():
+    cache = TileCache()
+    assert cache.level_needed(0.1) == 0.125
+    assert cache.level_needed(0.3) == 0.5
+    assert cache.level_needed(1.0) == 1.0
+    assert cache.level_needed(2.0) is None
+
+
+def test_levels_over_budget_are_not_rendered_even_when_required(app, monkeypatch):
+    scene = LiveScene()
+    scene.addLine(0, 0, 2000, 1000, QPen())
+    scene.setSceneRect(QRectF(0, 0, 2000, 1000))
+    cache = TileCache()
+    cache.scene_rect = scene.sceneRect()
+    # Room for the 0.5 level (4 x 2 tiles) but not the 1.0 level (8 x 4 tiles).
+    monkeypatch.setattr(tile_cache, "MAX_LEVEL_BYTES", cache.level_bytes(0.5))
+
+    asyncio.run(cache._build(scene, cache._generation, required_level=1.0))
+
+    assert sorted(cache.ready_levels) == [0.125, 0.25, 0.5]
+    assert not any(key[0] == 1.0 for key in cache.tiles)
+    assert cache.level_for(1.0) is None
+    assert cache.level_for(0.4) == 0.5
+
+
+def test_tiled_view_shows_live_tooltips(app):
+    scene = LiveScene()
+    ring = scene.addEllipse(0, 0, 40, 40, QPen())
+    ring.setToolTip("Single point of failure: Switch_1")
+    line = scene.addLine(100, 100, 200, 100, QPen())
+    line.setToolTip("Bridge: Switch_1 - Switch_2")
+    line.setZValue(2)
+    scene.addEllipse(140, 90, 20, 20, QPen())
+    view = TiledGraphicsView(scene)
+    assert view.live_tooltip(QPointF(20, 20)) == "Single point of failure: Switch_1"
+    assert view.live_tooltip(QPointF(150, 100)) == "Bridge: Switch_1 - Switch_2"
+    assert view.live_tooltip(QPointF(500, 500)) == ""
@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("networkx")
+
+from topology_diff import diff_configurations, diff_graphs, diff_topologies, merged_graph
+
+
+def graph(nodes, links):
+    return {"nodes": [{"id": n, **attrs} for n, attrs in nodes.items()],
+            "links": [{"source": u, "target": v} for u, v in links]}
+
+
+OLD = graph({"Router_1": {"layer": "Core"}, "Switch_1": {"layer": "Access"}, "Switch_2": {"layer": "Access"}},
+            [("Router_1", "Switch_1"), ("Router_1", "Switch_2")])
+NEW = graph({"Router_1": {"layer": "Core"}, "Switch_1": {"layer": "Distribution"}, "Switch_3": {"layer": "Access"}},
+            [("Switch_1", "Router_1"), ("Router_1", "Switch_3")])
+
+
+def test_graph_diff_reports_added_removed_and_changed():
+    diff = diff_graphs(OLD, NEW)
+    assert diff.added_nodes == ["Switch_3"]
+    assert diff.removed_nodes == ["Switch_2"]
+    assert diff.changed_nodes == {"Switch_1": {"layer": ("Access", "Distribution")}}
+    # Edges are undirected: Switch_1 - Router_1 is the same link reversed.
+    assert diff.added_edges == [("Router_1", "Switch_3")]
+    assert diff.removed_edges == [("Router_1", "Switch_2")]
+    assert diff.summary() == "+1 -1 ~1 nodes, +1 -1 links"
+
+
+def test_identical_graphs_have_an_empty_diff():
+    assert diff_graphs(OLD, OLD).empty
+    # Edge lists under the newer "edges" key compare equal to "links".
+    assert diff_graphs(OLD, {"nodes": OLD["nodes"], "edges": OLD["links"]}).empty
+
+
+def test_changes_between_values_with_equal_hashes_are_reported():
+    # hash(-1) == hash(-2), so a hash-based shortcut would miss these.
+    old = graph({"Switch_1": {"vlan": -1}}, [])
+    new = graph({"Switch_1": {"vlan": -2}}, [])
+    assert diff_graphs(old, new).changed_nodes == {"Switch_1": {"vlan": (-1, -2)}}
+    changes = diff_configurations([{"name": "Switch_1", "vlan": -1}], [{"name": "Switch_1", "vlan": -2}])
+    assert [change.describe() for change in changes] == ["Switch_1: vlan: -1 -> -2"]
+
+
+def test_config_diff_by_device_name():
+    old = [{"name": "Switch_1", "ip_address": "10.0.0.2"}, {"name": "Switch_2", "ip_address": "10.0.0.3"}]
+    new = [{"name": "Switch_1", "ip_address": "10.0.0.9"}, {"name": "Switch_3", "ip_address": "10.0.0.4"}]
+    changes = {change.device: change for change in diff_configurations(old, new)}
+    assert changes["Switch_1"].kind == "changed"
+    assert changes["Switch_1"].describe() == "Switch_1: ip_address: '10.0.0.2' -> '10.0.0.9'"
+    assert changes["Switch_2"].kind == "removed"
+    assert changes["Switch_3"].kind == "added"
+
+
+def test_topology_diff_covers_both_graphs_and_all_configs():
+    old = {"id": 1, "top_graph": OLD, "access_graph": OLD, "top_layer_configurations": [{"name": "Router_1", "x": 1}]}
+    new = {"id": 2, "top_graph": NEW, "access_graph": OLD, "top_layer_configurations": [{"name": "Router_1", "x": 2}]}
+    diff = diff_topologies(old, new)
+    assert (diff.old_id, diff.new_id) == (1, 2)
+    assert diff.graphs["access_graph"].empty
+    assert not diff.graphs["top_graph"].empty
+    assert [change.device for change in diff.config_changes] == ["Router_1"]
+
+
+def test_merged_graph_keeps_removed_devices_with_new_attributes():
+    merged = merged_graph(OLD, NEW)
+    assert set(merged.nodes) == {"Router_1", "Switch_1", "Switch_2", "Switch_3"}
+    assert merged.nodes["Switch_1"]["layer"] == "Distribution"
+    assert merged.has_edge("Router_1", "Switch_2")
@@ -0,0 +1,59 @@
+from topology_store import TopologyStore, topology_revision
+
+
+def topology(topology_id, **fields):
+    return {"id": topology_id, "access_graph": {"nodes": []}, **fields}
+
+
+def recording_store(*topologies):
+    store = TopologyStore()
+    store.replace_all(topologies)
+    changes = []
+    store.listeners.append(lambda kind, row, topo: changes.append((kind, row, topo["id"] if topo else None)))
+    return store, changes
+
+
+def test_replace_all_indexes_rows_and_notifies_reset():
+    store = TopologyStore()
+    changes = []
+    store.listeners.append(lambda kind, row, topo: changes.append(kind))
+    store.replace_all([topology(7), topology(9)])
+    assert len(store) == 2
+    assert store.row_of(9) == 1
+    assert store.get(7)["id"] == 7
+    assert changes == ["reset"]
+
+
+def test_added_event_appends_and_unknown_update_counts_as_added():
+    store, changes = recording_store(topology(1))
+    assert store.apply_event({"event": "topology_added", "topology": topology(2)}) == ("topology_added", 2)
+    assert store.apply_event({"event": "topology_updated", "topology": topology(3)}) == ("topology_added", 3)
+    assert [t["id"] for t in store] == [1, 2, 3]
+    assert changes == [("topology_added", 1, 2), ("topology_added", 2, 3)]
+
+
+def test_event_for_a_known_topology_replaces_it_in_place():
+    store, changes = recording_store(topology(1), topology(2))
+    updated = topology(1, revision=2)
+    # A queued "added" for a topology the snapshot already has is an update.
+    assert store.apply_event({"event": "topology_added", "topology": updated}) == ("topology_updated", 1)
+    assert store.get(1) is updated
+    assert changes == [("topology_updated", 0, 1)]
+
+
+def test_delete_reindexes_the_remaining_rows():
+    store, changes = recording_store(topology(1), topology(2), topology(3))
+    assert store.apply_event({"event": "topology_deleted", "id": 1}) == ("topology_deleted", 1)
+    assert store.row_of(3) == 1
+    assert store.get(1) is None
+    assert store.apply_event({"event": "topology_deleted", "id": 1}) is None
+    assert store.apply_event({"event": "history_subscribed"}) is None
+    assert changes == [("topology_deleted", 0, 1)]
+
+
+def test_revision_prefers_the_server_value_and_tracks_content():
+    assert topology_revision(topology(1, revision=5)) == "5"
+    first = topology_revision(topology(1, top_graph={"nodes": [{"id": "Router_1"}]}))
+    second = topology_revision(topology(1, top_graph={"nodes": [{"id": "Router_2"}]}))
+    assert first != second
+    assert first == topology_revision(topology(2, top_graph={"nodes": [{"id": "Router_1"}]}))
@@ -0,0 +1,189 @@
+import asyncio
+import glob
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from topology_store import topology_revision
+
+THUMBNAIL_WIDTH = 120
+THUMBNAIL_HEIGHT = 80
+# A thumbnail that failed this many times is not submitted again.
+MAX_RENDER_ATTEMPTS = 3
+CACHE_DIR = os.environ.get(
+    "NETDESIGNER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "networkdesigner")
+)
+LAYER_ROWS = {'Core': 0.2, 'Distribution': 0.5, 'Access': 0.8}
+DEVICE_COLORS = (
+    ('router_', "#e67e22"),
+    ('multilayerswitch', "#9b59b6"),
+    ('switch_', "#2e86de"),
+    ('computer_', "#27ae60"),
+)
+
+_app = None
+
+
+def _init_worker():
+    # Each worker paints with QPainter, which needs its own (headless) GUI application.
+    global _app
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QGuiApplication
+    _app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def thumbnail_path(topology, revision=None):
+    if revision is None:
+        revision = topology_revision(topology)
+    return os.path.join(CACHE_DIR, "thumbnails", f"{topology['id']}-{revision}.png")
+
+
+def remove_thumbnails(topology_id, keep=None, folder=None):
+    """Delete the cached thumbnails of a topology, except the file `keep`."""
+    folder = folder or os.path.join(CACHE_DIR, "thumbnails")
+    pattern = os.path.join(glob.escape(folder), f"{glob.escape(str(topology_id))}-*.png")
+    for path in glob.glob(pattern):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def render_thumbnail(top_graph, path, width=THUMBNAIL_WIDTH, height=THUMBNAIL_HEIGHT):
+    """Draw a layered sketch of a top graph node-link payload into a PNG at path. Runs in a worker."""
+    from PyQt5.QtCore import Qt, QPointF
+    from PyQt5.QtGui import QImage, QPainter, QPen, QColor
+
+    nodes = top_graph.get("nodes", [])
+    links = top_graph.get("links")
+    if links is None:
+        links = top_graph.get("edges", [])
+
+    rows = {}
+    for node in nodes:
+        rows.setdefault(node.get("layer", "Access"), []).append(node["id"])
+    pos = {}
+    margin = 6
+    for layer, members in rows.items():
+        y = LAYER_ROWS.get(layer, 0.8) * height
+        step = (width - 2 * margin) / max(1, len(members))
+        for i, name in enumerate(members):
+            pos[name] = QPointF(margin + step * (i + 0.5), y)
+
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor("#252526"))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(QPen(QColor(255, 255, 255, 60), 0.5))
+    for link in links:
+        u, v = pos.get(link["source"]), pos.get(link["target"])
+        if u is not None and v is not None:
+            painter.drawLine(u, v)
+    painter.setPen(Qt.NoPen)
+    radius = max(0.8, min(3.0, 200 / max(1, len(nodes))))
+    for name, point in pos.items():
+        ln = str(name).lower()
+        color = next((c for prefix, c in DEVICE_COLORS if ln.startswith(prefix)), "#d4d4d4")
+        painter.setBrush(QColor(color))
+        painter.drawEllipse(point, radius, radius)
+    painter.end()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so a half-written file is never picked up from the cache.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    image.save(tmp_path, "PNG")
+    os.replace(tmp_path, path)
+    # Thumbnails of the topology's older revisions will not be asked for again.
+    remove_thumbnails(os.path.basename(path).rsplit("-", 1)[0], keep=path, folder=os.path.dirname(path))
+    return path
+
+
+class ThumbnailLoader:
+    """
+    Produces topology thumbnails in a process pool and caches them on disk
+    by topology id and revision, so each one is rendered at most once.
+    Revisions are hashed on a thread, once per topology object. request()
+    calls back with the PNG path, or with None if rendering failed; a later
+    request() for it tries again, up to MAX_RENDER_ATTEMPTS times.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self._executor = None
+        self._pending = {}
+        # topology id -> (topology object, revision); a replaced object is hashed again.
+        self._revisions = {}
+        self._failures = {}
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: forking a process that already runs a Qt application is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    def request(self, topology, callback):
+        asyncio.ensure_future(self._request(topology, callback))
+
+    async def _revision(self, topology):
+        cached = self._revisions.get(topology["id"])
+        if cached is not None and cached[0] is topology:
+            return cached[1]
+        # Hashing serialises every payload; keep it off the UI thread.
+        revision = await asyncio.get_event_loop().run_in_executor(None, topology_revision, topology)
+        self._revisions[topology["id"]] = (topology, revision)
+        return revision
+
+    async def _request(self, topology, callback):
+        path = thumbnail_path(topology, await self._revision(topology))
+        if os.path.exists(path):
+            callback(topology["id"], path)
+            return
+        if self._failures.get(path, 0) >= MAX_RENDER_ATTEMPTS:
+            callback(topology["id"], None)
+            return
+        if path in self._pending:
+            self._pending[path].append(callback)
+            return
+        self._pending[path] = [callback]
+        await self._render(topology, path)
+
+    async def _render(self, topology, path):
+        loop = asyncio.get_event_loop()
+        pool = self._pool()
+        try:
+            await loop.run_in_executor(pool, render_thumbnail, topology.get("top_graph", {}), path)
+        except Exception as e:
+            print("[ThumbnailLoader] Failed to render thumbnail:", e)
+            if isinstance(e, BrokenProcessPool):
+                # A worker died and took the pool with it; start a new one on the next request.
+                if self._executor is pool:
+                    self._discard_pool()
+            else:
+                self._failures[path] = self._failures.get(path, 0) + 1
+            for callback in self._pending.pop(path, []):
+                callback(topology["id"], None)
+            return
+        for callback in self._pending.pop(path, []):
+            callback(topology["id"], path)
+
+    def forget(self, topology_id):
+        """Drop a deleted topology's cached thumbnails (off the UI thread)."""
+        self._revisions.pop(topology_id, None)
+        asyncio.get_event_loop().run_in_executor(None, remove_thumbnails, topology_id)
+
+    def _discard_pool(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        self._discard_pool()
+        self._pending = {}
+        self._revisions = {}
@@ -0,0 +1,340 @@
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtWidgets import (
+    QGraphicsView, QGraphicsScene, QGraphicsLineItem, QGraphicsPixmapItem,
+    QGraphicsEllipseItem, QGraphicsTextItem, QToolTip, QWidget
+)
+from PyQt5.QtCore import Qt, QEvent, QRectF, QPointF, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QPainter, QPen, QColor, QBrush
+
+TILE_SIZE = 256
+ZOOM_LEVELS = (0.125, 0.25, 0.5, 1.0)
+# Memory allowed per zoom level. An ARGB32 tile is 256 * 256 * 4 B = 256 KB,
+# so this is 1024 tiles. Larger levels are never rendered; a view zoomed in
+# past the most detailed level that fits draws the live scene instead.
+MAX_LEVEL_BYTES = 256 * 1024 * 1024
+BACKGROUND = QColor("#1e1e1e")
+
+_executor = None
+
+
+def _tile_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tiles")
+    return _executor
+
+
+def snapshot_scene(scene):
+    """
+    Copy the drawable content of a scene into plain draw operations so it
+    can be rasterised off the GUI thread (QPixmap and scene items may only
+    be touched from the GUI thread). Each op is (bounds, kind, args...).
+    """
+    ops = []
+    images = {}
+    for item in scene.items(Qt.AscendingOrder):
+        if not item.isVisible():
+            continue
+        bounds = item.sceneBoundingRect()
+        if isinstance(item, QGraphicsLineItem):
+            ops.append((bounds, "line", item.mapToScene(item.line().p1()), item.mapToScene(item.line().p2()), QPen(item.pen())))
+        elif isinstance(item, QGraphicsPixmapItem):
+            pixmap = item.pixmap()
+            image = images.get(pixmap.cacheKey())
+            if image is None:
+                image = images[pixmap.cacheKey()] = pixmap.toImage()
+            ops.append((bounds, "image", item.mapToScene(item.offset()), image))
+        elif isinstance(item, QGraphicsEllipseItem):
+            ops.append((bounds, "ellipse", item.mapRectToScene(item.rect()), QPen(item.pen()), QBrush(item.brush())))
+        elif isinstance(item, QGraphicsTextItem):
+            margin = item.document().documentMargin()
+            ops.append((bounds, "text", bounds.adjusted(margin, margin, 0, 0), item.toPlainText(),
+                        item.defaultTextColor(), item.font()))
+    ops.sort(key=lambda op: 0 if op[1] == "line" else 1)
+    return ops
+
+
+def render_tile(ops, origin, level, tx, ty, tile_size=TILE_SIZE):
+    """Rasterise the ops falling into one tile. Safe to call from a worker thread."""
+    span = tile_size / level
+    region = QRectF(origin.x() + tx * span, origin.y() + ty * span, span, span)
+    image = QImage(tile_size, tile_size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(BACKGROUND)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    painter.scale(level, level)
+    painter.translate(-region.left(), -region.top())
+    for op in ops:
+        if not op[0].intersects(region):
+            continue
+        kind = op[1]
+        if kind == "line":
+            painter.setPen(op[4])
+            painter.drawLine(op[2], op[3])
+        elif kind == "image":
+            painter.drawImage(op[2], op[3])
+        elif kind == "ellipse":
+            painter.setPen(op[3])
+            painter.setBrush(op[4])
+            painter.drawEllipse(op[2])
+        elif kind == "text":
+            painter.setPen(op[4])
+            painter.setFont(op[5])
+            painter.drawText(op[2], Qt.AlignLeft | Qt.AlignTop, op[3])
+    painter.end()
+    return image
+
+
+class TileCache:
+    """
+    Raster tiles of a static scene at a few zoom levels, rendered on a
+    thread pool. The level the view needs right now is built first, then
+    the others coarsest first so the minimap and zoomed-out views follow.
+    Levels larger than MAX_LEVEL_BYTES are skipped.
+    Tiles stay valid until invalidate() is called, which should only
+    happen when the drawn topology changes.
+    """
+
+    def __init__(self, levels=ZOOM_LEVELS, tile_size=TILE_SIZE):
+        self.levels = levels
+        self.tile_size = tile_size
+        self.tiles = {}
+        self.ready_levels = []
+        self.scene_rect = QRectF()
+        self.listeners = []
+        self._generation = 0
+        self._task = None
+
+    def invalidate(self):
+        self._generation += 1
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self.tiles = {}
+        self.ready_levels = []
+
+    def build(self, scene, required_level=None):
+        """Render the tiles of `scene`, starting with `required_level` if it fits MAX_LEVEL_BYTES."""
+        self.invalidate()
+        self._task = asyncio.ensure_future(self._build(scene, self._generation, required_level))
+        return self._task
+
+    def grid(self, level):
+        span = self.tile_size / level
+        return (max(1, math.ceil(self.scene_rect.width() / span)),
+                max(1, math.ceil(self.scene_rect.height() / span)))
+
+    def level_bytes(self, level):
+        columns, rows = self.grid(level)
+        return columns * rows * self.tile_size * self.tile_size * 4
+
+    def level_fits(self, level):
+        return self.level_bytes(level) <= MAX_LEVEL_BYTES
+
+    async def _build(self, scene, generation, required_level=None):
+        self.scene_rect = scene.sceneRect()
+        ops = snapshot_scene(scene)
+        origin = self.scene_rect.topLeft()
+        loop = asyncio.get_event_loop()
+        order = sorted(self.levels, key=lambda level: level != required_level)
+        for level in order:
+            columns, rows = self.grid(level)
+            if not self.level_fits(level):
+                print(f"[TileCache] Skipping level {level}: {columns * rows} tiles "
+                      f"({self.level_bytes(level) // (1024 * 1024)} MB)")
+                continue
+            jobs = {
+                (tx, ty): loop.run_in_executor(_tile_executor(), render_tile, ops, origin, level, tx, ty, self.tile_size)
+                for tx in range(columns) for ty in range(rows)
+            }
+            images = await asyncio.gather(*jobs.values())
+            if generation != self._generation:
+                return
+            for (tx, ty), image in zip(jobs, images):
+                self.tiles[(level, tx, ty)] = image
+            self.ready_levels.append(level)
+            print(f"[TileCache] Level {level} ready ({columns * rows} tiles)")
+            for listener in list(self.listeners):
+                listener(level)
+
+    def level_needed(self, scale):
+        """Coarsest level at least as detailed as `scale`, ready or not, or None."""
+        for level in sorted(self.levels):
+            if level >= scale:
+                return level
+        return None
+
+    def level_for(self, scale):
+        """Coarsest ready level that is at least as detailed as `scale`, or None."""
+        for level in sorted(self.ready_levels):
+            if level >= scale:
+                return level
+        return None
+
+    def paint(self, painter, level, exposed):
+        """Blit the tiles of `level` that intersect the exposed scene rect."""
+        span = self.tile_size / level
+        origin = self.scene_rect.topLeft()
+        columns, rows = self.grid(level)
+        first_x = max(0, int((exposed.left() - origin.x()) // span))
+        first_y = max(0, int((exposed.top() - origin.y()) // span))
+        last_x = min(columns - 1, int((exposed.right() - origin.x()) // span))
+        last_y = min(rows - 1, int((exposed.bottom() - origin.y()) // span))
+        for tx in range(first_x, last_x + 1):
+            for ty in range(first_y, last_y + 1):
+                image = self.tiles.get((level, tx, ty))
+                if image is not None:
+                    target = QRectF(origin.x() + tx * span, origin.y() + ty * span, span, span)
+                    painter.drawImage(target, image)
+
+
+class LiveScene(QGraphicsScene):
+    """A scene that announces edits made to it after it was drawn (e.g. a group being expanded)."""
+    edited = pyqtSignal()
+
+
+class TiledGraphicsView(QGraphicsView):
+    """
+    A QGraphicsView that, once tiles for the current zoom are ready, swaps
+    the live scene for an empty stand-in scene and blits cached tiles in
+    drawBackground, so panning and zooming no longer repaint every item.
+    Double-clicks go to the live scene (so groups can be expanded) and
+    tooltips are looked up on the live scene's items. Tiles
+    are only dropped when the scene really changes: on LiveScene.edited or
+    an explicit invalidate_tiles(), after which they are re-rendered
+    shortly afterwards.
+    """
+
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self.live_scene = scene
+        if isinstance(scene, LiveScene):
+            scene.edited.connect(self.invalidate_tiles)
+        self.tile_scene = QGraphicsScene(self)
+        self.tile_cache = TileCache()
+        self.tile_cache.listeners.append(lambda level: self.update_mode())
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self._rebuild_timer = QTimer(self)
+        self._rebuild_timer.setSingleShot(True)
+        self._rebuild_timer.setInterval(500)
+        self._rebuild_timer.timeout.connect(self.build_tiles)
+
+    def build_tiles(self):
+        if not asyncio.get_event_loop().is_running():
+            return
+        self.live_scene.setSceneRect(self.live_scene.itemsBoundingRect().adjusted(-50, -50, 50, 50))
+        self.tile_scene.setSceneRect(self.live_scene.sceneRect())
+        self.tile_cache.build(self.live_scene, self.tile_cache.level_needed(self.transform().m11()))
+
+    def invalidate_tiles(self):
+        self.tile_cache.invalidate()
+        self._show_scene(self.live_scene)
+        self._rebuild_timer.start()
+
+    def current_level(self):
+        return self.tile_cache.level_for(self.transform().m11())
+
+    def update_mode(self):
+        self._show_scene(self.tile_scene if self.current_level() is not None else self.live_scene)
+
+    def _show_scene(self, scene):
+        if self.scene() is scene:
+            return
+        # Keep the same part of the scene in view across the swap.
+        center = self.mapToScene(self.viewport().rect().center())
+        self.setScene(scene)
+        self.centerOn(center)
+        self.viewport().update()
+
+    def drawBackground(self, painter, rect):
+        level = self.current_level() if self.scene() is self.tile_scene else None
+        if level is None:
+            super().drawBackground(painter, rect)
+            return
+        painter.fillRect(rect, BACKGROUND)
+        self.tile_cache.paint(painter, level, rect)
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip and self.scene() is self.tile_scene:
+            tooltip = self.live_tooltip(self.mapToScene(event.pos()))
+            if tooltip:
+                QToolTip.showText(event.globalPos(), tooltip, self.viewport())
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().viewportEvent(event)
+
+    def live_tooltip(self, scene_pos):
+        """Tooltip of the topmost live item under `scene_pos`, as the live scene would show it."""
+        for item in self.live_scene.items(scene_pos):
+            if item.isVisible() and item.toolTip():
+                return item.toolTip()
+        return ""
+
+    def wheelEvent(self, event):
+        factor = 1.25 if event.angleDelta().y() > 0 else 0.8
+        self.scale(factor, factor)
+        self.update_mode()
+
+    def mouseDoubleClickEvent(self, event):
+        # The stand-in scene has no items; let the live one handle the click.
+        self._show_scene(self.live_scene)
+        super().mouseDoubleClickEvent(event)
+        # Back to the tiles unless the click changed the scene and invalidated them.
+        self.update_mode()
+
+
+class MinimapWidget(QWidget):
+    """Overview of the whole scene drawn from the coarsest cached tiles; click or drag to navigate."""
+
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.setFixedSize(220, 160)
+        view.tile_cache.listeners.append(lambda level: self.update())
+        view.horizontalScrollBar().valueChanged.connect(self.update)
+        view.verticalScrollBar().valueChanged.connect(self.update)
+
+    def _scene_transform(self):
+        rect = self.view.tile_cache.scene_rect
+        if rect.isEmpty():
+            return None
+        scale = min(self.width() / rect.width(), self.height() / rect.height())
+        return rect, scale
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), BACKGROUND)
+        cache = self.view.tile_cache
+        transform = self._scene_transform()
+        if transform is None or not cache.ready_levels:
+            painter.end()
+            return
+        rect, scale = transform
+        painter.scale(scale, scale)
+        painter.translate(-rect.left(), -rect.top())
+        cache.paint(painter, min(cache.ready_levels), rect)
+        visible = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        painter.setPen(QPen(QColor("#2e86de"), 2 / scale))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(visible)
+        painter.end()
+
+    def _navigate(self, pos):
+        transform = self._scene_transform()
+        if transform is None:
+            return
+        rect, scale = transform
+        self.view.centerOn(QPointF(rect.left() + pos.x() / scale, rect.top() + pos.y() / scale))
+
+    def mousePressEvent(self, event):
+        self._navigate(event.pos())
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self._navigate(event.pos())
@@ -0,0 +1,142 @@
+import time
+
+import networkx as nx
+
+GRAPH_KEYS = ("top_graph", "access_graph")
+CONFIG_KEYS = ("access_configuration", "top_layer_configurations")
+
+
+def _links(data):
+    links = data.get("links")
+    return data.get("edges", []) if links is None else links
+
+
+def _node_attrs(data):
+    return {node["id"]: {k: v for k, v in node.items() if k != "id"} for node in data.get("nodes", [])}
+
+
+def _edge_set(data):
+    # Undirected: store each edge with its endpoints in a fixed order.
+    edges = set()
+    for link in _links(data):
+        u, v = link["source"], link["target"]
+        edges.add((u, v) if str(u) <= str(v) else (v, u))
+    return edges
+
+
+def _field_changes(old, new):
+    return {
+        key: (old.get(key), new.get(key))
+        for key in old.keys() | new.keys()
+        if old.get(key) != new.get(key)
+    }
+
+
+class GraphDiff:
+    """
+    Node and edge differences between two node-link payloads. changed_nodes
+    maps a node id to {attribute: (old, new)}.
+    """
+
+    def __init__(self, added_nodes, removed_nodes, changed_nodes, added_edges, removed_edges):
+        self.added_nodes = added_nodes
+        self.removed_nodes = removed_nodes
+        self.changed_nodes = changed_nodes
+        self.added_edges = added_edges
+        self.removed_edges = removed_edges
+
+    @property
+    def empty(self):
+        return not (self.added_nodes or self.removed_nodes or self.changed_nodes
+                    or self.added_edges or self.removed_edges)
+
+    def summary(self):
+        return (f"+{len(self.added_nodes)} -{len(self.removed_nodes)} ~{len(self.changed_nodes)} nodes, "
+                f"+{len(self.added_edges)} -{len(self.removed_edges)} links")
+
+
+class ConfigChange:
+    """One device whose configuration was added, removed or changed; fields maps name -> (old, new)."""
+
+    def __init__(self, device, kind, fields):
+        self.device = device
+        self.kind = kind
+        self.fields = fields
+
+    def describe(self):
+        if self.kind != "changed":
+            return f"{self.device}: {self.kind}"
+        changes = ", ".join(f"{k}: {old!r} -> {new!r}" for k, (old, new) in sorted(self.fields.items()))
+        return f"{self.device}: {changes}"
+
+
+class TopologyDiff:
+    def __init__(self, old_id, new_id, graphs, config_changes, elapsed):
+        self.old_id = old_id
+        self.new_id = new_id
+        self.graphs = graphs
+        self.config_changes = config_changes
+        self.elapsed = elapsed
+
+    def summary(self):
+        parts = [f"{key}: {diff.summary()}" for key, diff in self.graphs.items()]
+        parts.append(f"{len(self.config_changes)} device configs changed")
+        return (f"Topology {self.old_id} -> {self.new_id}: " + "; ".join(parts)
+                + f" ({self.elapsed * 1000:.0f} ms)")
+
+
+def diff_graphs(old_data, new_data):
+    """
+    Diff two node-link payloads. Unchanged nodes cost one dict comparison;
+    only nodes whose attributes differ are compared attribute by attribute.
+    """
+    old_nodes, new_nodes = _node_attrs(old_data), _node_attrs(new_data)
+    added = [n for n in new_nodes if n not in old_nodes]
+    removed = [n for n in old_nodes if n not in new_nodes]
+    changed = {}
+    for n, attrs in new_nodes.items():
+        old = old_nodes.get(n)
+        if old is not None and old != attrs:
+            changed[n] = _field_changes(old, attrs)
+    old_edges, new_edges = _edge_set(old_data), _edge_set(new_data)
+    return GraphDiff(added, removed, changed, sorted(new_edges - old_edges, key=str),
+                     sorted(old_edges - new_edges, key=str))
+
+
+def diff_configurations(old_entries, new_entries):
+    """Diff two device config lists by device name, with the same equality shortcut as diff_graphs."""
+    old = {entry["name"]: entry for entry in old_entries}
+    new = {entry["name"]: entry for entry in new_entries}
+    changes = []
+    for name, entry in new.items():
+        previous = old.get(name)
+        if previous is None:
+            changes.append(ConfigChange(name, "added", {}))
+        elif previous != entry:
+            changes.append(ConfigChange(name, "changed", _field_changes(previous, entry)))
+    for name in old:
+        if name not in new:
+            changes.append(ConfigChange(name, "removed", {}))
+    return changes
+
+
+def diff_topologies(old, new):
+    """Diff two saved topologies (history entries): both graphs and every device config."""
+    start = time.perf_counter()
+    graphs = {key: diff_graphs(old.get(key) or {}, new.get(key) or {}) for key in GRAPH_KEYS}
+    config_changes = diff_configurations(
+        [entry for key in CONFIG_KEYS for entry in old.get(key) or []],
+        [entry for key in CONFIG_KEYS for entry in new.get(key) or []]
+    )
+    return TopologyDiff(old.get("id"), new.get("id"), graphs, config_changes, time.perf_counter() - start)
+
+
+def merged_graph(old_data, new_data):
+    """networkx graph holding the union of both payloads, so removed devices can be drawn too."""
+    graph = nx.Graph()
+    for data in (old_data, new_data):
+        # New attributes win for nodes present in both.
+        graph.add_nodes_from((node["id"], {k: v for k, v in node.items() if k != "id"})
+                             for node in data.get("nodes", []))
+    graph.add_edges_from(_edge_set(old_data) | _edge_set(new_data))
+    return graph
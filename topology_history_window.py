@@ -2,23 +2,39 @@ import asyncio
 import json
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton,
-    QMessageBox, QFrame
+    QMessageBox, QFrame, QAbstractItemView, QLabel, QLineEdit, QListWidgetItem
 )
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont, QIcon
+from PyQt5.QtCore import Qt, QTimer, QSize
 from qasync import asyncSlot
-from networkx.readwrite import json_graph
-from graph_window import GraphWindow, VLANTabWindow
-from home_window import HomeWindow
-from config_window import ConfigWindow
+
+from thumbnails import ThumbnailLoader, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT
+from search_index import TopologyIndex, topology_tokens
+from topology_store import TopologyStore
 
 
 class TopologyHistoryWindow(QWidget):
-    def __init__(self, dispatcher, parent=None):
+    def __init__(self, dispatcher, navigator, parent=None):
         super().__init__(parent)
         self.dispatcher = dispatcher
+        self.navigator = navigator
+        self.config_window = None
+        # Graph widgets shown in the graph frame, which count against the navigator's pool.
+        self.graph_views = []
         self.selected_topology = None
-        self.topologies = []
+        self.store = TopologyStore()
+        self.store.listeners.append(self.on_store_changed)
+        self.search_index = TopologyIndex()
+        self.store.listeners.append(self.on_store_indexed)
+        self.subscribed = False
+        # Task of a subscription request still waiting for its acknowledgement.
+        self.subscribing = None
+        # Set when the server has no history push; the list is then refetched whenever shown.
+        self.subscription_refused = False
+        self.loading = False
+        # History events received while a get_history snapshot is in flight.
+        self.pending_events = None
+        self.thumbnails = ThumbnailLoader()
         self.initUI()
         print("[HistoryWindow] Initialized.")
         # Schedule start_loading after a short delay to ensure the widget is fully set up.
@@ -53,10 +69,32 @@ class TopologyHistoryWindow(QWidget):
         self.topology_list = QListWidget()
         self.topology_list.setFont(QFont("Segoe UI", 12))
         self.topology_list.itemSelectionChanged.connect(self.on_topology_selected)
+        # Ctrl/Shift-click a second entry to compare two topologies.
+        self.topology_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.topology_list.setIconSize(QSize(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+        # Thumbnails are only produced for rows that scroll into view.
+        self.topology_list.verticalScrollBar().valueChanged.connect(self.load_visible_thumbnails)
+
+        # Search across every saved topology; results jump to the device.
+        self.search_box = QLineEdit()
+        self.search_box.setFont(QFont("Segoe UI", 12))
+        self.search_box.setPlaceholderText("Search devices, IP addresses, VLANs (e.g. Switch_37, 10.4.2.17, vlan:12)")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_box.textChanged.connect(lambda _: self.search_timer.start())
+        self.search_results = QListWidget()
+        self.search_results.setFont(QFont("Segoe UI", 11))
+        self.search_results.setMaximumHeight(160)
+        self.search_results.itemClicked.connect(self.on_search_result_activated)
+        self.search_results.hide()
 
         # Layout for top section (buttons + list)
         top_section_layout = QVBoxLayout()
         top_section_layout.addLayout(top_layout)
+        top_section_layout.addWidget(self.search_box)
+        top_section_layout.addWidget(self.search_results)
         top_section_layout.addWidget(self.topology_list)
 
         # Middle section: A frame that will hold the graph view
@@ -76,9 +114,17 @@ class TopologyHistoryWindow(QWidget):
         self.view_access_button.clicked.connect(self.view_access_graph)
         self.view_top_button.clicked.connect(self.view_top_graph)
         self.view_config_button.clicked.connect(self.view_configuration)
+        self.compare_button = QPushButton("Compare Selected")
+        self.compare_button.setFont(QFont("Segoe UI", 14))
+        self.compare_button.clicked.connect(self.compare_selected)
         bottom_layout.addWidget(self.view_access_button)
         bottom_layout.addWidget(self.view_top_button)
         bottom_layout.addWidget(self.view_config_button)
+        bottom_layout.addWidget(self.compare_button)
+        self.export_button = QPushButton("Export...")
+        self.export_button.setFont(QFont("Segoe UI", 14))
+        self.export_button.clicked.connect(self.export_topologies)
+        bottom_layout.addWidget(self.export_button)
 
         main_layout.addLayout(top_section_layout)
         # Let the graph_frame expand
@@ -88,42 +134,191 @@ class TopologyHistoryWindow(QWidget):
         self.setLayout(main_layout)
         print("[HistoryWindow] UI set up.")
 
+    @property
+    def topologies(self):
+        return self.store.topologies
+
     @asyncSlot()
     async def load_topologies(self):
         print("[HistoryWindow] load_topologies() called.")
-        # Clear any currently displayed graph view
-        self.clear_graph_view()
+        selected_id = self.selected_topology.get("id") if self.selected_topology else None
+        self.loading = True
+        self.pending_events = []
         try:
+            # Ask for pushes before the snapshot, so changes made in between
+            # are queued and applied on top of it instead of being lost. The
+            # snapshot does not wait for the acknowledgement: the subscription
+            # task sends its request first and then waits on its own.
+            if not self.subscribed and not self.subscription_refused and self.subscribing is None:
+                self.subscribing = asyncio.ensure_future(self.subscribe_to_history())
             request_data = {"action": "get_history"}
             print("[HistoryWindow] Sending request:", request_data)
-            response_data = await self.dispatcher.send_and_wait(request_data)
-            print("[HistoryWindow] Received response:", response_data)
+            response_data = await asyncio.ensure_future(self.dispatcher.send_and_wait(request_data))
             if "error" in response_data:
                 QMessageBox.critical(self, "Error", response_data["error"])
                 return
-            self.topologies = response_data.get("graphs", [])
-            print("[HistoryWindow] Loaded topologies:", self.topologies)
-            self.populate_list()
-            # Now that topologies are loaded, you can access the configurations
-            for topo in self.topologies:
-                access_config = topo.get("access_configuration")
-                top_config = topo.get("top_layer_configurations")
-                print(f"[HistoryWindow] Topology ID: {topo['id']}")
-                print(f"[HistoryWindow]   Access Configuration: {access_config}")
-                print(f"[HistoryWindow]   Top Configuration: {top_config}")
-                # In a future step, you might want to store these configurations
-                # in self.topologies or a separate data structure for later use.
+            self.store.replace_all(response_data.get("graphs", []))
+            events, self.pending_events = self.pending_events, None
+            for event in events:
+                self.store.apply_event(event)
+            print("[HistoryWindow] Loaded", len(self.store), "topologies,", len(events), "queued events applied.")
+            self.restore_selection(selected_id)
         except Exception as e:
             print("[HistoryWindow] Exception in load_topologies:", e)
             QMessageBox.critical(self, "Error", f"Failed to load topologies: {e}")
+        finally:
+            self.pending_events = None
+            self.loading = False
+
+    def restore_selection(self, topology_id):
+        # A reload keeps the open graphs as long as their topology still exists.
+        row = self.store.row_of(topology_id) if topology_id is not None else None
+        if row is not None:
+            self.topology_list.setCurrentRow(row)
+        elif topology_id is not None:
+            self.clear_graph_view()
+
+    async def subscribe_to_history(self):
+        try:
+            self.subscribed = await self.dispatcher.subscribe_history(self.on_history_event)
+        except Exception as e:
+            print("[HistoryWindow] History subscription failed:", e)
+            self.subscribed = False
+        finally:
+            self.subscribing = None
+        self.subscription_refused = not self.subscribed
+        if self.subscription_refused:
+            print("[HistoryWindow] No history push from the server; reloading whenever shown.")
 
     def populate_list(self):
         print("[HistoryWindow] Populating topology list.")
         self.topology_list.clear()
         for topo in self.topologies:
-            item_text = f"Topology ID: {topo['id']}"
-            self.topology_list.addItem(item_text)
+            self.topology_list.addItem(self.item_text(topo))
         print("[HistoryWindow] List populated with", len(self.topologies), "items.")
+        QTimer.singleShot(0, self.load_visible_thumbnails)
+
+    def item_text(self, topo):
+        return f"Topology ID: {topo['id']}"
+
+    def on_history_event(self, topic, event):
+        if self.pending_events is not None:
+            self.pending_events.append(event)
+            return
+        result = self.store.apply_event(event)
+        print("[HistoryWindow] History event:", topic, "->", result)
+
+    def on_store_changed(self, kind, row, topo):
+        # Patch the list in place; rows stay aligned with self.topologies.
+        if kind == "reset":
+            self.populate_list()
+        elif kind == "topology_added":
+            self.topology_list.addItem(self.item_text(topo))
+            QTimer.singleShot(0, self.load_visible_thumbnails)
+        elif kind == "topology_updated":
+            item = self.topology_list.item(row)
+            item.setText(self.item_text(topo))
+            # A new revision gets a new thumbnail.
+            item.setData(Qt.UserRole, None)
+            QTimer.singleShot(0, self.load_visible_thumbnails)
+            if self.selected_topology is not None and self.selected_topology.get("id") == topo["id"]:
+                self.selected_topology = topo
+        elif kind == "topology_deleted":
+            self.topology_list.takeItem(row)
+            self.thumbnails.forget(topo["id"])
+            if self.selected_topology is not None and self.selected_topology.get("id") == topo["id"]:
+                self.selected_topology = None
+                self.clear_graph_view()
+
+    def on_store_indexed(self, kind, row, topo):
+        # Keep the search index in step with the store, one topology at a time.
+        if kind == "reset":
+            self.search_index.clear()
+            for topology in self.topologies:
+                asyncio.ensure_future(self.index_topology(topology))
+        elif kind == "topology_deleted":
+            self.search_index.remove(topo["id"])
+        else:
+            asyncio.ensure_future(self.index_topology(topo))
+
+    async def index_topology(self, topology):
+        loop = asyncio.get_event_loop()
+        tokens = await loop.run_in_executor(None, topology_tokens, topology)
+        # Skip results for entries that were replaced or deleted meanwhile.
+        if self.store.get(topology["id"]) is topology:
+            self.search_index.add(topology["id"], tokens)
+            if self.search_box.text().strip():
+                self.search_timer.start()
+
+    def run_search(self):
+        query = self.search_box.text().strip()
+        self.search_results.clear()
+        if not query:
+            self.search_results.hide()
+            return
+        matches = self.search_index.search(query)
+        for topology_id, device in matches:
+            item = QListWidgetItem(f"Topology ID: {topology_id} - {device}")
+            item.setData(Qt.UserRole, (topology_id, device))
+            self.search_results.addItem(item)
+        if not matches:
+            self.search_results.addItem("No matches")
+        self.search_results.show()
+
+    def on_search_result_activated(self, item):
+        match = item.data(Qt.UserRole)
+        if not match:
+            return
+        topology_id, device = match
+        row = self.store.row_of(topology_id)
+        if row is None:
+            return
+        self.topology_list.clearSelection()
+        self.topology_list.setCurrentRow(row)
+        self.topology_list.scrollToItem(self.topology_list.item(row))
+        topology = self.topologies[row]
+        top_nodes = {node["id"] for node in (topology.get("top_graph") or {}).get("nodes", [])}
+        if device in top_nodes:
+            graph_widget = self.view_top_graph()
+            if graph_widget is not None:
+                graph_widget.focus_node(device)
+        else:
+            self.view_configuration()
+            if self.config_window is not None:
+                self.config_window.select_device(device)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.subscription_refused and not self.loading:
+            # Without push events the kept list may be out of date.
+            self.start_loading()
+        QTimer.singleShot(0, self.load_visible_thumbnails)
+
+    def load_visible_thumbnails(self):
+        count = self.topology_list.count()
+        if count == 0:
+            return
+        viewport = self.topology_list.viewport().rect()
+        first = self.topology_list.indexAt(viewport.topLeft()).row()
+        last = self.topology_list.indexAt(viewport.bottomLeft()).row()
+        first = 0 if first < 0 else first
+        last = count - 1 if last < 0 else last
+        for row in range(first, last + 1):
+            item = self.topology_list.item(row)
+            if item.data(Qt.UserRole):
+                continue
+            item.setData(Qt.UserRole, True)
+            self.thumbnails.request(self.topologies[row], self.on_thumbnail_ready)
+
+    def on_thumbnail_ready(self, topology_id, path):
+        row = self.store.row_of(topology_id)
+        if row is None:
+            return
+        if path is None:
+            # Rendering failed; ask again the next time the row comes into view.
+            self.topology_list.item(row).setData(Qt.UserRole, None)
+            return
+        self.topology_list.item(row).setIcon(QIcon(path))
 
     def on_topology_selected(self):
         selected_items = self.topology_list.selectedItems()
@@ -136,42 +331,48 @@ class TopologyHistoryWindow(QWidget):
 
     def clear_graph_view(self):
         print("[HistoryWindow] Clearing graph view.")
+        # Stop any scene population still in progress before freeing the views.
+        for view in self.graph_views:
+            view.cancel_drawing()
+        self.graph_views = []
         # Remove and delete all widgets from the graph frame layout.
         while self.graph_frame_layout.count():
             child = self.graph_frame_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+            widget = child.widget()
+            if widget:
+                widget.deleteLater()
+
+    def add_graph_view(self, view):
+        self.graph_frame_layout.addWidget(view)
+        self.graph_views.append(view)
 
     def view_access_graph(self):
         if not self.selected_topology:
             QMessageBox.warning(self, "Selection Error", "Please select a topology from the list.")
             return
         self.clear_graph_view()
+        from compact_graph import load_graph, split_by_vlan
+        from graph_window import VLANTabWindow
+
         try:
             print("[HistoryWindow] Parsing access graph data...")
-            access_graph = json_graph.node_link_graph(self.selected_topology["access_graph"])
+            access_graph = load_graph(self.selected_topology["access_graph"])
             print("[HistoryWindow] Access graph parsed successfully.")
         except Exception as e:
             print("[HistoryWindow] Error parsing access graph:", e)
             QMessageBox.critical(self, "Error", f"Failed to parse access graph: {e}")
             return
 
-        # Group nodes by VLAN (defaulting to 'Default' if not set)
-        vlan_to_nodes = {}
-        for node, data in access_graph.nodes(data=True):
-            vlan = data.get('vlan', 'Default')
-            vlan_to_nodes.setdefault(vlan, []).append(node)
+        # Group nodes by VLAN (nodes without one go under a 'Default' tab)
+        vlan_subgraphs = split_by_vlan(access_graph)
 
-        if not vlan_to_nodes:
+        if not vlan_subgraphs:
             QMessageBox.information(self, "No VLAN Data", "No VLAN data found in the Access Graph.")
             return
 
-        # Create subgraphs for each VLAN
-        vlan_subgraphs = {vlan: access_graph.subgraph(nodes).copy() for vlan, nodes in vlan_to_nodes.items()}
-
         # Create the VLANTabWindow widget and add it to the graph frame layout
-        vlan_tabs_widget = VLANTabWindow(vlan_subgraphs)
-        self.graph_frame_layout.addWidget(vlan_tabs_widget)
+        vlan_tabs_widget = VLANTabWindow(vlan_subgraphs, access_graph=access_graph)
+        self.add_graph_view(vlan_tabs_widget)
         print("[HistoryWindow] Access graph with VLAN tabs displayed.")
 
     def view_top_graph(self):
@@ -179,32 +380,112 @@ class TopologyHistoryWindow(QWidget):
             QMessageBox.warning(self, "Selection Error", "Please select a topology from the list.")
             return
         self.clear_graph_view()
+        from compact_graph import load_graph
+        from graph_window import GraphWindow
+
         try:
             print("[HistoryWindow] Parsing top graph data...")
-            top_graph = json_graph.node_link_graph(self.selected_topology["top_graph"])
+            top_graph = load_graph(self.selected_topology["top_graph"])
             print("[HistoryWindow] Top graph parsed successfully.")
         except Exception as e:
             print("[HistoryWindow] Error parsing top graph:", e)
             QMessageBox.critical(self, "Error", f"Failed to parse top graph: {e}")
             return
         graph_widget = GraphWindow(top_graph, title="Top Graph", graph_type="top")
-        self.graph_frame_layout.addWidget(graph_widget)
+        self.add_graph_view(graph_widget)
         print("[HistoryWindow] Top graph displayed.")
+        return graph_widget
 
     def view_configuration(self):
         if not self.selected_topology:
             QMessageBox.warning(self, "Selection Error", "Please select a topology from the list.")
             return
 
+        from config_window import ConfigWindow
+
         access_config = self.selected_topology.get("access_configuration", [])
         top_config = self.selected_topology.get("top_layer_configurations", [])
 
-        self.config_window = ConfigWindow(access_config, top_config)
+        self.config_window = ConfigWindow(access_config, top_config, ip_base=self.selected_topology.get("ip_base"))
         self.config_window.show()
         print("[HistoryWindow] Configuration window opened.")
 
+    @asyncSlot()
+    async def compare_selected(self):
+        rows = sorted(self.topology_list.row(item) for item in self.topology_list.selectedItems())
+        if len(rows) != 2:
+            QMessageBox.warning(self, "Selection Error", "Select exactly two topologies to compare.")
+            return
+        # The list is in server order, so the lower row is the older topology.
+        old, new = self.topologies[rows[0]], self.topologies[rows[1]]
+        from topology_diff import diff_topologies, merged_graph
+        from graph_window import GraphDiffTabs
+        from config_window import ConfigWindow
+
+        try:
+            loop = asyncio.get_event_loop()
+            diff = await loop.run_in_executor(None, diff_topologies, old, new)
+        except Exception as e:
+            print("[HistoryWindow] Error comparing topologies:", e)
+            QMessageBox.critical(self, "Error", f"Failed to compare topologies: {e}")
+            return
+        print("[HistoryWindow]", diff.summary())
+
+        self.clear_graph_view()
+        summary_label = QLabel(diff.summary())
+        summary_label.setWordWrap(True)
+        self.graph_frame_layout.addWidget(summary_label)
+        # Both graphs get their changes highlighted; the access graph is drawn once its tab is opened.
+        diff_tabs = GraphDiffTabs([
+            (f"Top Graph: {old['id']} -> {new['id']}",
+             lambda: merged_graph(old.get("top_graph") or {}, new.get("top_graph") or {}),
+             "top", diff.graphs["top_graph"]),
+            (f"Access Graph: {old['id']} -> {new['id']}",
+             lambda: merged_graph(old.get("access_graph") or {}, new.get("access_graph") or {}),
+             "access", diff.graphs["access_graph"]),
+        ])
+        self.add_graph_view(diff_tabs)
+
+        if self.config_window is not None:
+            self.config_window.close()
+        self.config_window = ConfigWindow(
+            new.get("access_configuration", []),
+            new.get("top_layer_configurations", []),
+            ip_base=new.get("ip_base")
+        )
+        self.config_window.show_changes(diff.config_changes, title=f"Changed since topology {old['id']}")
+        self.config_window.show()
+
+    @asyncSlot()
+    async def export_topologies(self):
+        # Selected entries, or the whole history when nothing is selected.
+        rows = sorted(self.topology_list.row(item) for item in self.topology_list.selectedItems())
+        topologies = [self.topologies[row] for row in rows] or list(self.topologies)
+        if not topologies:
+            QMessageBox.warning(self, "Export", "There are no topologies to export.")
+            return
+        from export_dialog import run_export
+
+        await run_export(self, topologies, include_graphs=True)
+
     def return_to_home(self):
-        # Instantiate and show the HomeWindow, then close this window.
-        self.home_window = HomeWindow(self.dispatcher)
-        self.home_window.show()
-        self.close()
\ No newline at end of file
+        # The navigator hides this window and keeps its state for next time.
+        self.navigator.open("home")
+
+    def open_windows(self):
+        # Graph views in the frame plus the config window count against the navigator's pool.
+        return len(self.graph_views) + (self.config_window is not None)
+
+    def teardown(self):
+        # Called by the navigator before this window is freed.
+        self.thumbnails.shutdown()
+        if self.subscribing is not None:
+            self.subscribing.cancel()
+        if self.subscribed:
+            asyncio.ensure_future(self.dispatcher.unsubscribe_history(self.on_history_event))
+            self.subscribed = False
+        self.clear_graph_view()
+        if self.config_window is not None:
+            self.config_window.close()
+            self.config_window.deleteLater()
+            self.config_window = None
\ No newline at end of file
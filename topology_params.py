@@ -0,0 +1,82 @@
+import ipaddress
+
+# create_graph parameters and the values the form uses for empty fields.
+DEFAULTS = {
+    "topology_name": "Untitled Topology",
+    "num_routers": 2,
+    "num_mls": 2,
+    "num_switches": 4,
+    "num_computers": 15,
+    "vlan_count": -1,
+    "mode": 1,
+    "ip_base": "192.168.0.0",
+}
+COUNT_FIELDS = ("num_routers", "num_mls", "num_switches", "num_computers")
+# Need at least 1 switch per this many computers.
+COMPUTERS_PER_SWITCH = 7
+
+
+def validate_parameters(params):
+    """
+    Check one set of create_graph parameters. Missing keys take their
+    DEFAULTS. Returns (True, complete params) or (False, error message).
+    """
+    params = {**DEFAULTS, **params}
+
+    for field in COUNT_FIELDS:
+        if params[field] < 1:
+            return False, "Device counts must be ≥ 1."
+
+    num_switches, num_computers = params["num_switches"], params["num_computers"]
+    if num_computers > num_switches * COMPUTERS_PER_SWITCH:
+        return False, (
+            f"With {num_computers} computers, you need at least "
+            f"{(num_computers + COMPUTERS_PER_SWITCH - 1) // COMPUTERS_PER_SWITCH} switches "
+            f"(1 per {COMPUTERS_PER_SWITCH} computers)."
+        )
+
+    vlan_count = params["vlan_count"]
+    if vlan_count == 0 or vlan_count < -1:
+        return False, "VLAN Count must be > 0 or -1."
+    # If VLAN count is not auto (-1), max VLANs == num_switches.
+    if vlan_count != -1 and vlan_count > num_switches:
+        return False, f"With {num_switches} switches, maximum VLANs is {num_switches}."
+
+    if params["mode"] not in (0, 1):
+        return False, "Mode must be 0 or 1."
+
+    try:
+        ipaddress.IPv4Address(params["ip_base"])
+    except ValueError:
+        return False, "Invalid IP Base format."
+
+    return True, params
+
+
+def parse_range(text, default):
+    """
+    Parse a sweep field into a list of ints: "4", "2,4,8", "2-6" or
+    "10-50:10" (start-stop:step, inclusive). Empty text gives [default].
+    Raises ValueError for anything else.
+    """
+    text = text.strip()
+    if not text:
+        return [default]
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        step = 1
+        if ":" in part:
+            part, step_text = part.split(":", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Step must be ≥ 1 in '{part}:{step_text}'.")
+        # A leading '-' is a sign (e.g. -1 for auto VLANs), not a range.
+        bounds = part[1:].split("-", 1) if part.startswith("-") else part.split("-", 1)
+        if len(bounds) == 2:
+            start = int(("-" if part.startswith("-") else "") + bounds[0])
+            stop = int(bounds[1])
+            values.extend(range(start, stop + 1, step))
+        else:
+            values.append(int(part))
+    return sorted(set(values))
@@ -0,0 +1,79 @@
+import hashlib
+import json
+
+from dispatcher import HISTORY_EVENTS
+
+
+def topology_revision(topology):
+    """Server-provided revision if present, otherwise a hash of the graph and config payloads."""
+    if topology.get("revision") is not None:
+        return str(topology["revision"])
+    digest = hashlib.sha1()
+    for key in ("access_graph", "top_graph", "access_configuration", "top_layer_configurations"):
+        digest.update(json.dumps(topology.get(key), sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class TopologyStore:
+    """
+    Client-side copy of the user's topology history, keyed by id and kept in
+    server order. It is filled once from get_history and then patched from
+    topology_added/updated/deleted push events. Listeners are called as
+    listener(kind, row, topology) after each change, where kind is "reset"
+    or the event name and, for deletions, topology is the removed entry.
+    """
+
+    def __init__(self):
+        self.topologies = []
+        self._rows = {}
+        self.listeners = []
+
+    def __len__(self):
+        return len(self.topologies)
+
+    def __iter__(self):
+        return iter(self.topologies)
+
+    def get(self, topology_id):
+        row = self._rows.get(topology_id)
+        return None if row is None else self.topologies[row]
+
+    def row_of(self, topology_id):
+        return self._rows.get(topology_id)
+
+    def replace_all(self, topologies):
+        self.topologies = list(topologies)
+        self._reindex()
+        self._notify("reset", None, None)
+
+    def apply_event(self, event):
+        """Apply one push event; returns (kind, id) or None if it was not a history event."""
+        kind = event.get("event")
+        if kind not in HISTORY_EVENTS:
+            return None
+        topology = event.get("topology")
+        topology_id = topology["id"] if topology else event.get("id")
+        row = self._rows.get(topology_id)
+
+        if kind == "topology_deleted":
+            if row is None:
+                return None
+            topology = self.topologies.pop(row)
+            self._reindex()
+        elif row is None:
+            # An update for a topology we have not seen is treated as an addition.
+            kind = "topology_added"
+            row = self._rows[topology_id] = len(self.topologies)
+            self.topologies.append(topology)
+        else:
+            kind = "topology_updated"
+            self.topologies[row] = topology
+        self._notify(kind, row, topology)
+        return kind, topology_id
+
+    def _reindex(self):
+        self._rows = {topo["id"]: row for row, topo in enumerate(self.topologies)}
+
+    def _notify(self, kind, row, topology):
+        for listener in list(self.listeners):
+            listener(kind, row, topology)